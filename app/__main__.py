@@ -1,9 +1,19 @@
+import cProfile
+import pstats
 from argparse import ArgumentParser
 
 import numpy as np
 
 from app.src.bot import Bot
 from app.src.environment import Environment
+from app.src.evaluation import Evaluation
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.compiled_policy import CompiledPolicy, PolicyTree
+from app.src.finding_algorithm.registry import AlgorithmRegistry
+from app.src.observers import TerminalObserver, TraceObserver
+from app.src.policy_compiler import PolicyCompiler
+from app.src.renderer import MapRenderer
+from app.src.session import SessionRecord, SessionRecorder, SessionReplay
 from app.src.utils import Utils
 
 
@@ -15,12 +25,120 @@ def main():
     parser.add_argument("--sight_range", help="Sight range of the bot", default=1, type=int)
     parser.add_argument("--wait", help="Wait time between printing steps", default=0.5, type=float)
     parser.add_argument("--print_map", help="If True map will be printed. Not recommended for large maps.", type=bool)
+    parser.add_argument("--redraw", help="Keep map at the top of the terminal and print only its changed tiles every step", action="store_true")
+    parser.add_argument("--viewport", help="Print only window of given rows and columns around the bot. Without values the window fills the terminal.", default=None, type=int, nargs="*")
+    parser.add_argument("--minimap", help="Print downsampled whole map with at most this many rows and columns under the map", default=None, type=int)
+    parser.add_argument("--headless", help="Print only result of the search, without any output or waiting during the search", action="store_true")
+    parser.add_argument("--evaluate", help="Find bot from every start position and direction and print statistics", action="store_true")
+    parser.add_argument("--workers", help="Number of worker processes used by --evaluate and --compile", default=None, type=int)
+    parser.add_argument("--sample", help="Evaluate only this many random start poses", default=None, type=int)
+    parser.add_argument("--seed", help="Seed of random sample of start poses", default=0, type=int)
+    parser.add_argument("--algorithm", help="Finding algorithm. With more algorithms each of them is run from the same start position and direction.",
+                        default=[AlgorithmRegistry.default], nargs="+", choices=AlgorithmRegistry.names())
+    parser.add_argument("--stats", help="Print counters and time of every phase of the search after the search", action="store_true")
+    parser.add_argument("--trace", help="Write every step with counters and times to this file as JSON Lines", default=None)
+    parser.add_argument("--profile", help="Profile the run with cProfile. Without file the slowest functions are printed, with file the profile is dumped to it. With --evaluate only the main process is profiled.",
+                        default=None, nargs="?", const="")
+    parser.add_argument("--record", help="Save start pose, actions and observations of the search to this JSON file", default=None)
+    parser.add_argument("--replay", help="Replay search recorded by --record without planning and check it behaves the same", default=None)
+    parser.add_argument("--compile", help="Run the algorithm from every start position and direction and save its decision tree to this JSON file", default=None)
+    parser.add_argument("--policy", help="Find bot by decision tree saved by --compile instead of the algorithm", default=None)
 
     args = parser.parse_args()
 
-    env_ = Environment(Utils.load(args.file), np.array(args.pos) if args.pos is not None else None, np.array(args.dir) if args.dir is not None else None)
-    bot_ = Bot(env_, args.sight_range)
-    bot_.find_itself(args.print_map, args.wait)
+    if args.viewport is not None and len(args.viewport) not in (0, 2):
+        parser.error('--viewport takes no values or two values: rows and columns')
+    if (args.record is not None or args.compile is not None) and len(args.algorithm) > 1:
+        parser.error('--record and --compile take only one algorithm')
+
+    if args.profile is None:
+        run(args, parser)
+        return
+
+    profiler = cProfile.Profile()
+    profiler.runcall(run, args, parser)
+    if args.profile:
+        profiler.dump_stats(args.profile)
+    else:
+        pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(30)
+
+
+def run(args, parser):
+    if args.replay is not None:
+        replay(args)
+        return
+
+    if args.compile is not None:
+        policy = PolicyCompiler(args.file, args.sight_range, args.workers, args.algorithm[0]).compile()
+        policy.save(args.compile)
+        print(f'Compiled {len(policy.poses)} start poses to decision tree with {len(policy.actions)} nodes')
+        return
+
+    if args.evaluate:
+        for algorithm in args.algorithm:
+            if len(args.algorithm) > 1:
+                print(f'Algorithm: {algorithm}')
+            evaluation = Evaluation(args.file, args.sight_range, args.workers, algorithm)
+            print(Evaluation.report(Evaluation.summary(evaluation.run(args.sample, args.seed))))
+        return
+
+    environment_map = Utils.load(args.file)
+    pos = np.array(args.pos) if args.pos is not None else None
+    direction = np.array(args.dir) if args.dir is not None else None
+    algorithms = args.algorithm
+    if args.policy is not None:
+        try:
+            algorithms = [CompiledPolicy(environment_map, PolicyTree.load(args.policy), args.sight_range)]
+        except ValueError as error:
+            # policy compiled for another map or sight range
+            parser.error(str(error))
+    trace = open(args.trace, 'w', encoding='utf-8') if args.trace is not None else None
+    try:
+        for algorithm in algorithms:
+            if len(algorithms) > 1:
+                print(f'Algorithm: {algorithm}')
+            env_ = find(args, Environment(environment_map, pos, direction), algorithm, trace)
+            # random start position and direction is chosen only once, so all algorithms start from the same one
+            pos, direction = env_.initial_bot_pos, env_.initial_bot_dir
+    finally:
+        if trace is not None:
+            trace.close()
+
+
+def find(args, env_, algorithm, trace=None):
+    if args.viewport is not None or args.minimap is not None:
+        viewport = tuple(args.viewport) if args.viewport else None
+        if args.viewport == []:
+            viewport = MapRenderer.terminal_viewport(14 + (args.minimap + 1 if args.minimap is not None else 0))
+        env_.set_view(viewport, args.minimap)
+
+    if not isinstance(algorithm, FindingAlgorithm):
+        algorithm = AlgorithmRegistry.create(env_.map, algorithm)
+    bot_ = Bot(env_, args.sight_range, algorithm)
+    observers = [TraceObserver(trace)] if trace is not None else []
+    recorder = SessionRecorder()
+    if args.record is not None:
+        observers.append(recorder)
+    if args.redraw and not args.headless:
+        bot_.find_itself(headless=True, observers=[TerminalObserver(args.print_map, args.wait, True)] + observers)
+    else:
+        bot_.find_itself(args.print_map, args.wait, args.headless, observers)
+    if args.headless:
+        bot_.print_search_result(False)
+    if args.stats:
+        print(bot_.stats.report())
+    if args.record is not None:
+        recorder.record.save(args.record)
+
+    return env_
+
+
+def replay(args):
+    record = SessionRecord.load(args.replay)
+    possible_starting_poss, steps = SessionReplay.replay(record, Utils.load(args.file))
+
+    print(f'Replayed steps: {steps}', f'Possible starting positions: {possible_starting_poss.to_str()}',
+          f'Same as recorded: {SessionReplay.matches(record, possible_starting_poss)}', sep='\n')
 
 
 if __name__ == "__main__":
@@ -0,0 +1,182 @@
+"""
+Module with Benchmark class
+"""
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from app.src.bot import Bot
+from app.src.bot_map import BotMap
+from app.src.environment import Environment
+from app.src.finding_algorithm.distributed_greedy_bfs import DistributedGreedyBFS
+from app.src.finding_algorithm.placement import MatrixPlacement, PlacementIndex
+from app.src.utils import Utils
+
+
+class Benchmark:
+    """
+    Measures time and peak memory of hot paths on every given map. Start poses are chosen by seeded random generator, so
+    every run measures the same work. Results are compared with baseline stored in JSON file.
+    """
+    seed = 0
+    # start poses of end-to-end runs on every map
+    poses_per_map = 3
+    # engines compared on the same pattern and the same placement index
+    placement_engines = ('strided', 'pyramid')
+    # pattern of compared engines is part of the map of at most this size with this ratio of unknown tiles
+    pattern_shape = (64, 64)
+    unknown_ratio = 0.3
+    # changes smaller than this are noise and never regressions
+    noise_floor = {'time': 1e-3, 'memory': 64 * 1024}
+
+    def __init__(self, file_names: List[str], repeat: int = 5):
+        """
+        :param file_names: files with environment maps
+        :param repeat: number of timed runs of every case, the fastest one is reported
+        """
+        self.file_names = file_names
+        self.repeat = repeat
+
+    def cases(self, file_name: str) -> Iterator[Tuple[str, Callable[[], object]]]:
+        """
+        Prepares cases of one map. Preparation is not measured.
+        :param file_name: file with environment map
+        :return: generator of (name of the case, function to measure)
+        """
+        map_name = os.path.splitext(os.path.basename(file_name))[0]
+        yield f'load/{map_name}', lambda: Utils.load(file_name)
+
+        environment_map = Utils.load(file_name)
+        finding_algorithm = DistributedGreedyBFS(environment_map)
+
+        rng = np.random.default_rng(self.seed)
+        free = np.argwhere(environment_map > 0)
+        poses = [(free[index], Utils.number_to_dir(direction)) for index, direction in
+                 zip(rng.integers(0, len(free), self.poses_per_map), rng.integers(0, 4, self.poses_per_map))]
+
+        # 5x5 view around the first pose is big enough to be searched by placement instead of signature index
+        bot_map = BotMap(5)
+        bot_map.sense(np.array([0, 0]), 2, Environment(environment_map, *poses[0]).get_nearby_environment)
+        yield f'find_all_possible_positions/{map_name}', \
+            lambda: finding_algorithm.find_all_possible_positions(environment_map, bot_map)
+        yield f'find_matrix_placements/{map_name}', \
+            lambda: finding_algorithm.find_matrix_placements(environment_map, bot_map.discovered()[0])
+
+        yield from self.placement_cases(map_name, environment_map)
+
+        # candidates of the 3x3 view bot sees at the beginning, so that they differ somewhere
+        bot_map = BotMap(3)
+        bot_map.sense(np.array([0, 0]), 1, Environment(environment_map, *poses[0]).get_nearby_environment)
+        finding_algorithm.possible_starting_poss = finding_algorithm.find_all_possible_positions(environment_map, bot_map)
+        current_poss = finding_algorithm.possible_current_poss(np.array([0, 0]), Utils.initial_dir)
+        pos_deltas = rng.integers(-8, 9, (64, 2))
+        yield f'get_path/{map_name}', lambda: finding_algorithm.get_path(np.array([0, 0]), Utils.initial_dir)
+        yield f'process_node/{map_name}', lambda: [
+            finding_algorithm.process_node(np.array([0, 0]), Utils.initial_dir, pos_delta, current_poss)
+            for pos_delta in pos_deltas]
+
+        yield f'find_itself/{map_name}', lambda: [
+            Bot(Environment(environment_map, *pose), 1, finding_algorithm).find_itself(headless=True) for pose in poses]
+
+    def placement_cases(self, map_name: str, environment_map: np.ndarray) -> Iterator[Tuple[str, Callable[[], object]]]:
+        """
+        Prepares cases which compare placement engines on the same pattern.
+        :param map_name: name of the map used in names of the cases
+        :param environment_map: map of the environment
+        :return: generator of (name of the case, function to measure)
+        """
+        rng = np.random.default_rng(self.seed)
+        shape = np.minimum(self.pattern_shape, environment_map.shape)
+        row, col = rng.integers(0, np.asarray(environment_map.shape) - shape + 1)
+        pattern = environment_map[row:row + shape[0], col:col + shape[1]].astype(int)
+        pattern[rng.random(pattern.shape) < self.unknown_ratio] = -1
+
+        # structures of the index are built by the first run, which is never the fastest one
+        placement_index = PlacementIndex(environment_map)
+        for engine in self.placement_engines:
+            yield f'find_matrix_placements/{engine}/{map_name}', \
+                lambda engine=engine: MatrixPlacement.find(environment_map, pattern, engine, placement_index)
+
+    def measure(self, func: Callable[[], object]) -> Dict[str, float]:
+        """
+        :param func: function to measure
+        :return: fastest time of repeated runs in seconds and peak of memory allocated during one run in bytes
+        """
+        times = []
+        # same as timeit, garbage collection would make times depend on what ran before
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(self.repeat):
+                start = time.perf_counter()
+                func()
+                times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {'time': min(times), 'memory': peak}
+
+    def run(self, verbose: bool = False) -> Dict[str, Dict[str, float]]:
+        """
+        :param verbose: If True every result is printed when it is measured
+        :return: results of all cases by their names
+        """
+        results = {}
+        for file_name in self.file_names:
+            for name, func in self.cases(file_name):
+                results[name] = self.measure(func)
+                if verbose:
+                    print(f'{name}: {results[name]["time"] * 1000:.3f} ms, {results[name]["memory"] / 1024:.1f} KiB')
+
+        return results
+
+    @staticmethod
+    def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                margin: float) -> List[str]:
+        """
+        :param results: results returned by run
+        :param baseline: results of baseline run
+        :param margin: allowed relative increase of time and memory, 0.5 allows 50 % increase
+        :return: descriptions of regressions, cases missing in baseline are skipped
+        """
+        regressions = []
+        for name, result in results.items():
+            for metric, value in result.items():
+                base = baseline.get(name, {}).get(metric)
+                if base is not None and value > base * (1 + margin) + Benchmark.noise_floor[metric]:
+                    regressions.append(f'{name} {metric}: {value:.6g} > {base:.6g} (+{value / max(base, 1e-12) - 1:.0%})')
+
+        return regressions
+
+    @staticmethod
+    def save(file_name: str, results: Dict[str, Dict[str, float]]) -> None:
+        """
+        :param file_name: JSON file for the baseline
+        :param results: results returned by run
+        """
+        with open(file_name, 'w', encoding='utf-8') as file:
+            json.dump({'python': platform.python_version(), 'numpy': np.__version__, 'results': results}, file,
+                      indent=2, sort_keys=True)
+            file.write('\n')
+
+    @staticmethod
+    def load(file_name: str) -> Dict[str, Dict[str, float]]:
+        """
+        :param file_name: JSON file with baseline saved by save
+        :return: results of the baseline
+        """
+        with open(file_name, encoding='utf-8') as file:
+            return json.load(file)['results']
@@ -1,13 +1,18 @@
 """
 Module with Bot class
 """
-import time
 from typing import List
 
 import numpy as np
 
+from app.src.bot_map import BotMap
+from app.src.direction_codec import DirectionCodec
 from app.src.environment import Environment
-from app.src.finding_algorithm.distributed_greedy_bfs import DistributedGreedyBFS
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.finding_algorithm.registry import AlgorithmRegistry
+from app.src.observers import BotObserver, StepEvent, TerminalObserver
+from app.src.stats import SearchStats
 from app.src.utils import Utils
 
 
@@ -16,8 +21,20 @@ class Bot:
     Represents bot at an unknown position in given environment. Bot can find itself. All coordinates are [row, column].
     """
 
-    def __init__(self, environment: Environment, sight_range: int = 1):
-        self.finding_algorithm = DistributedGreedyBFS(environment.map)
+    def __init__(self, environment: Environment, sight_range: int = 1, finding_algorithm: FindingAlgorithm = None,
+                 algorithm: str = None):
+        """
+        :param environment: environment in which the bot is
+        :param sight_range: sight range of the bot
+        :param finding_algorithm: finding algorithm for the environment map. It is reset before use, so one instance can
+        be shared by bots finding themselves one after another. If None algorithm is created.
+        :param algorithm: name of registered finding algorithm created when finding_algorithm is None. If None
+        DistributedGreedyBFS is used.
+        """
+        if finding_algorithm is None:
+            finding_algorithm = AlgorithmRegistry.create(environment.map, algorithm)
+        finding_algorithm.reset()
+        self.finding_algorithm = finding_algorithm
         self.environment = environment
 
         self.relative_dir = Utils.initial_dir
@@ -25,8 +42,14 @@ class Bot:
 
         self.sight_range = sight_range
 
-        bot_map_size = (max(self.environment.map.shape) + self.sight_range) * 2 + 1
-        self.bot_map = np.ones((bot_map_size, bot_map_size)) * -1
+        self.bot_map = BotMap(2 * self.sight_range + 1)
+        # tiles discovered since last path calculation as rows [row, column, value] relative to starting position
+        self.new_tiles = []
+
+    @property
+    def stats(self) -> SearchStats:
+        """Counters and timers of the search collected by the bot and its finding algorithm"""
+        return self.finding_algorithm.stats
 
     def rotate(self, direction: str) -> None:
         """
@@ -35,7 +58,7 @@ class Bot:
         """
         self.environment.rotate(direction)
 
-        self.relative_dir = Utils.rotate_coords(self.relative_dir, direction)
+        self.relative_dir = DirectionCodec.rotate_dir(self.relative_dir, direction)
 
     def move(self) -> None:
         """If possible moves bot one tile forward in the direction of the bot."""
@@ -43,32 +66,30 @@ class Bot:
             self.relative_pos = self.relative_pos + self.relative_dir
             self.add_environment_to_map()
 
-    def find_itself(self, print_map: bool = True, wait_time: int = 0) -> tuple[List[tuple[np.ndarray, int]], int]:
+    def find_itself(self, print_map: bool = True, wait_time: int = 0, headless: bool = False,
+                    observers: List[BotObserver] = None) -> tuple[Candidates, int]:
         """
         Finds bot starting position using finding algorithm.
         :param print_map: If True prints map. For large maps recommended using False.
         :param wait_time: Time to wait between individual steps. Used for better readability. Good value is around 0.5 second.
+        :param headless: If True nothing is printed and there is no waiting. print_map and wait_time are ignored.
+        :param observers: observers notified about every step and about the end of the search
         :return: (positions, steps) Bot starting position or possible starting positions and number of steps needed.
         """
-        self.add_environment_to_map()
-        path = self.finding_algorithm.get_path_controller(self.environment.map, self.bot_map, self.relative_pos,
-                                                          self.relative_dir)
+        observers = list(observers or [])
+        if not headless:
+            observers.insert(0, TerminalObserver(print_map, wait_time))
 
-        if print_map:
-            self.environment.print_map(self.finding_algorithm.possible_current_poss(self.relative_pos, self.relative_dir))
-        self.environment.print_bot_stats(path, self.finding_algorithm.steps,
-                                         self.finding_algorithm.possible_current_poss_to_str(self.relative_pos,
-                                                                                             self.relative_dir),
-                                         self.get_discovered_tiles_count())
-        time.sleep(wait_time)
+        self.add_environment_to_map()
+        path = self.get_path()
+        self.notify(observers, StepEvent(self, None, path))
 
         while True:
             if len(path) == 0:
-                path = self.finding_algorithm.get_path_controller(self.environment.map, self.bot_map, self.relative_pos,
-                                                                  self.relative_dir)
+                path = self.get_path()
 
                 if len(path) == 0:
-                    self.print_search_result(print_map)
+                    self.notify(observers, StepEvent(self, None, path), True)
                     return self.finding_algorithm.possible_starting_poss, self.finding_algorithm.steps
 
             action = path.pop(0)
@@ -79,19 +100,41 @@ class Bot:
             else:
                 self.rotate(action)
 
-            if print_map:
-                self.environment.print_map(
-                    self.finding_algorithm.possible_current_poss(self.relative_pos, self.relative_dir))
-            self.environment.print_bot_stats(path, self.finding_algorithm.steps,
-                                             self.finding_algorithm.possible_current_poss_to_str(self.relative_pos,
-                                                                                                 self.relative_dir),
-                                             self.get_discovered_tiles_count())
-            time.sleep(wait_time)
+            self.notify(observers, StepEvent(self, action, path))
+
+    def get_path(self) -> List[str]:
+        """
+        :return: next part of path calculated by finding algorithm from what the bot discovered so far
+        """
+        return self.finding_algorithm.get_path_controller(self.environment.map, self.bot_map, self.relative_pos,
+                                                          self.relative_dir, self.pop_new_tiles())
+
+    def notify(self, observers: List[BotObserver], event: StepEvent, finished: bool = False) -> None:
+        """
+        :param observers: observers to notify
+        :param event: state of the search
+        :param finished: If True observers are notified about the end of the search, otherwise about a step
+        """
+        with self.stats.timer('observers'):
+            for observer in observers:
+                if finished:
+                    observer.on_finish(event)
+                else:
+                    observer.on_step(event)
 
     def add_environment_to_map(self) -> None:
         """Adds environment in bots sight range to bots map."""
-        bot_map_coords = self.relative_pos + np.asarray(self.bot_map.shape) // 2
-        self.environment.get_nearby_environment(self.bot_map, bot_map_coords, self.sight_range)
+        with self.stats.timer('sensing'):
+            self.new_tiles.append(
+                self.bot_map.sense(self.relative_pos, self.sight_range, self.environment.get_nearby_environment))
+
+    def pop_new_tiles(self) -> np.ndarray:
+        """
+        :return: (N, 3) array of tiles [row, column, value] discovered since last call. Coordinates are relative to starting position.
+        """
+        new_tiles = np.concatenate(self.new_tiles) if self.new_tiles else np.empty((0, 3), dtype=int)
+        self.new_tiles = []
+        return new_tiles
 
     def print_search_result(self, print_map: bool = True) -> None:
         """Prints result of the search after search is done."""
@@ -105,6 +148,8 @@ class Bot:
                 f'Is found position correct: {self.environment.check_position(self.finding_algorithm.possible_starting_poss[0])}',
                 sep='\n')
         else:
+            if self.finding_algorithm.is_ambiguous:
+                print('Possible starting positions are indistinguishable, no sequence of actions can tell them apart')
             print(
                 f'Starting position cannot be definitely found. Possible starting positions are: {self.finding_algorithm.possible_starting_poss_to_str()}',
                 f'Is one of those positions starting position: {any(self.environment.check_position(pos) for pos in self.finding_algorithm.possible_starting_poss)} ({self.environment.initial_bot_pos} {Utils.dir_to_unicode_arrow(self.environment.initial_bot_dir)})',
@@ -116,4 +161,4 @@ class Bot:
         """
         :return: Number of discovered tiles in bot map
         """
-        return np.count_nonzero(self.bot_map + 1)
+        return self.bot_map.discovered_count
@@ -0,0 +1,125 @@
+"""
+Module with BotMap class
+"""
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+
+class BotMap:
+    """
+    Map discovered by the bot stored as int8 array with -1 for unknown, 0 for wall and 1 for free tile. Coordinates are
+    relative to starting position of the bot. Array grows on demand and bounding box of discovered tiles and number of
+    discovered tiles are updated with every write.
+    """
+    unknown = -1
+    # characters of unknown tile, wall and free tile in observations, same as in map files
+    observation_tiles = ('?', 'X', ' ')
+
+    def __init__(self, size: int = 16):
+        """
+        :param size: initial size of the array
+        """
+        self.array = np.full((size, size), self.unknown, dtype=np.int8)
+        # index of relative position [0, 0] in the array
+        self.origin = np.array([size // 2, size // 2])
+        # [min row, min column, max row, max column] of discovered tiles, relative and inclusive
+        self.bounds = None
+        self.discovered_count = 0
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Shape of the underlying array"""
+        return self.array.shape
+
+    def reserve(self, top_left: np.ndarray, bottom_right: np.ndarray) -> None:
+        """
+        Grows the array until relative rectangle fits into it.
+        :param top_left: relative top-left corner of the rectangle
+        :param bottom_right: relative bottom-right corner of the rectangle, inclusive
+        """
+        while np.any(self.origin + top_left < 0) or np.any(self.origin + bottom_right >= self.array.shape):
+            size = self.array.shape[0]
+            array = np.full((2 * size, 2 * size), self.unknown, dtype=np.int8)
+            array[size // 2:size // 2 + size, size // 2:size // 2 + size] = self.array
+
+            self.array = array
+            self.origin = self.origin + size // 2
+
+    def sense(self, center: np.ndarray, radius: int,
+              fill: Callable[[np.ndarray, np.ndarray, int], None]) -> np.ndarray:
+        """
+        Lets fill write square around center into the array and records newly discovered tiles.
+        :param center: relative position of center of the square
+        :param radius: radius of the square
+        :param fill: called with (array, array coords of center, radius), writes values into the square
+        :return: (N, 3) newly discovered tiles [row, column, value], coordinates are relative
+        """
+        self.reserve(center - radius, center + radius)
+
+        coords = self.origin + center
+        block = (slice(coords[0] - radius, coords[0] + radius + 1), slice(coords[1] - radius, coords[1] + radius + 1))
+        unknown = self.array[block] == self.unknown
+
+        fill(self.array, coords, radius)
+
+        rows, cols = np.nonzero(unknown & (self.array[block] != self.unknown))
+        new_tiles = np.column_stack((rows + center[0] - radius, cols + center[1] - radius,
+                                     self.array[block][rows, cols])).astype(int)
+        self.add_discovered(new_tiles[:, :2])
+
+        return new_tiles
+
+    def add_discovered(self, tiles: np.ndarray) -> None:
+        """
+        Updates discovered count and bounds.
+        :param tiles: (N, 2) relative coordinates of newly discovered tiles
+        """
+        if len(tiles) == 0:
+            return
+
+        self.discovered_count += len(tiles)
+        bounds = np.concatenate((tiles.min(axis=0), tiles.max(axis=0)))
+        if self.bounds is not None:
+            bounds = np.concatenate((np.minimum(self.bounds[:2], bounds[:2]), np.maximum(self.bounds[2:], bounds[2:])))
+        self.bounds = bounds
+
+    def discovered(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: (view of the array in bounding box of discovered tiles, relative top-left corner of the box)
+        """
+        if self.bounds is None:
+            return np.empty((0, 0), dtype=np.int8), np.zeros(2, dtype=int)
+
+        top_left = self.origin + self.bounds[:2]
+        bottom_right = self.origin + self.bounds[2:] + 1
+        return self.array[top_left[0]:bottom_right[0], top_left[1]:bottom_right[1]], self.bounds[:2].copy()
+
+    def window(self, center: np.ndarray, radius: int) -> np.ndarray:
+        """
+        :param center: relative position of center of the square
+        :param radius: radius of the square
+        :return: copy of the square around center, unknown tiles are -1
+        """
+        self.reserve(center - radius, center + radius)
+        coords = self.origin + center
+        return self.array[coords[0] - radius:coords[0] + radius + 1, coords[1] - radius:coords[1] + radius + 1].copy()
+
+    def observation(self, center: np.ndarray, radius: int) -> List[str]:
+        """
+        :param center: relative position of center of the square
+        :param radius: radius of the square
+        :return: rows of the square around center as strings of observation_tiles
+        """
+        return [''.join(self.observation_tiles[value + 1] for value in row) for row in self.window(center, radius)]
+
+    def get(self, pos: np.ndarray) -> int:
+        """
+        :param pos: relative position
+        :return: value of the tile, unknown outside of the array
+        """
+        coords = self.origin + pos
+        if np.any(coords < 0) or np.any(coords >= self.array.shape):
+            return self.unknown
+
+        return int(self.array[coords[0], coords[1]])
@@ -0,0 +1,89 @@
+"""
+Module with DirectionCodec class
+"""
+from typing import Union
+
+import numpy as np
+
+
+class DirectionCodec:
+    """
+    Conversions between directions as numbers (0 - down, 1 - right, 2 - up, 3 - left) and as coordinates and rotations
+    of coordinates. Everything is looked up in small precomputed tables, there is no validation in single-value
+    variants, so they are meant for hot paths where directions are known to be valid.
+    """
+    # offsets[d] is direction d as coordinates
+    offsets = np.array([[1, 0], [0, 1], [-1, 0], [0, -1]])
+    # returned directions are views of the table, so it must not be modified through them
+    offsets.setflags(write=False)
+    # left_rotations[k] rotates row vector k times to the left
+    left_rotations = np.array([np.linalg.matrix_power(np.array([[0, 1], [-1, 0]]), k) for k in range(4)])
+    # numbers[3 * (sign of row + 1) + sign of column + 1] is direction number of coordinates, -1 if not a direction
+    numbers = np.array([-1, 2, -1, 3, -1, 1, -1, 0, -1])
+    # change of direction number after one rotation
+    turns = {'left': 1, 'right': -1}
+
+    @staticmethod
+    def to_number(dir_coords: np.ndarray) -> int:
+        """
+        :param dir_coords: coordinates of direction, any positive multiple of direction is accepted
+        :return: number of direction, -1 if coordinates are not a direction
+        """
+        return int(DirectionCodec.numbers[3 * int(np.sign(dir_coords[0])) + int(np.sign(dir_coords[1])) + 4])
+
+    @staticmethod
+    def to_numbers(dir_coords: np.ndarray) -> np.ndarray:
+        """
+        :param dir_coords: (..., 2) coordinates of directions
+        :return: (..., ) numbers of directions, -1 where coordinates are not a direction
+        """
+        signs = np.sign(np.asarray(dir_coords)).astype(int)
+        return DirectionCodec.numbers[3 * signs[..., 0] + signs[..., 1] + 4]
+
+    @staticmethod
+    def to_dir(dir_number: Union[int, np.ndarray]) -> np.ndarray:
+        """
+        :param dir_number: number of direction or array of numbers, taken modulo 4
+        :return: (2, ) or (..., 2) coordinates of directions
+        """
+        return DirectionCodec.offsets[np.asarray(dir_number) % 4]
+
+    @staticmethod
+    def rotate_number(dir_number: int, direction: str, count: int = 1) -> int:
+        """
+        :param dir_number: number of direction
+        :param direction: left or right
+        :param count: count of rotations
+        :return: number of rotated direction
+        """
+        return (dir_number + DirectionCodec.turns[direction] * count) % 4
+
+    @staticmethod
+    def rotate_dir(dir_coords: np.ndarray, direction: str, count: int = 1) -> np.ndarray:
+        """
+        :param dir_coords: coordinates of direction
+        :param direction: left or right
+        :param count: count of rotations
+        :return: coordinates of rotated direction
+        """
+        return DirectionCodec.to_dir(DirectionCodec.rotate_number(DirectionCodec.to_number(dir_coords), direction, count))
+
+    @staticmethod
+    def rotate(coords: np.ndarray, counts: Union[int, np.ndarray]) -> np.ndarray:
+        """
+        Rotates all coords to the left by every count.
+        :param coords: (2, ) or (T, 2) coords to rotate
+        :param counts: count of rotations or (N, ) counts of rotations, negative counts rotate to the right
+        :return: (2, ), (T, 2), (N, 2) or (N, T, 2) rotated coords
+        """
+        return np.matmul(coords, DirectionCodec.left_rotations[np.asarray(counts) % 4])
+
+    @staticmethod
+    def rotate_rows(coords: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Rotates every row of coords to the left by its own count.
+        :param coords: (N, 2) coords to rotate
+        :param counts: (N, ) counts of rotations, negative counts rotate to the right
+        :return: (N, 2) rotated coords
+        """
+        return np.einsum('ni,nij->nj', coords, DirectionCodec.left_rotations[np.asarray(counts) % 4])
@@ -2,10 +2,12 @@
 Module with Environment class
 """
 import random
-from typing import List
+from typing import List, Optional, Tuple
 
 import numpy as np
 
+from app.src.direction_codec import DirectionCodec
+from app.src.renderer import MapRenderer
 from app.src.utils import Utils
 
 
@@ -14,7 +16,8 @@ class Environment:
     Represents environment in which the bot is. All coordinates are [row, column].
     """
     def __init__(self, environment_map: np.ndarray, bot_pos: np.ndarray = None, bot_dir: np.ndarray = None):
-        self.map = environment_map.astype(int)
+        # map is shared, not copied, so many environments of one map (e.g. in evaluation) cost no memory
+        self.map = np.asarray(environment_map)
         self.size = np.asarray(self.map.shape)
 
         self.bot_pos = bot_pos
@@ -34,13 +37,16 @@ class Environment:
         self.initial_bot_pos = self.bot_pos
         self.initial_bot_dir = self.bot_dir
 
+        # created on first print of the map
+        self.renderer = None
+
     def rotate(self, direction: str) -> None:
         """
         Rotates bot in specified direction.
         :param direction: left/right. direction to rotate bot in
         """
 
-        self.bot_dir = Utils.rotate_coords(self.bot_dir, direction)
+        self.bot_dir = DirectionCodec.rotate_dir(self.bot_dir, direction)
 
     def move(self) -> bool:
         """
@@ -56,64 +62,45 @@ class Environment:
 
     def get_nearby_environment(self, bot_map: np.ndarray, bot_map_coords: np.ndarray, sight_range: int):
         """
-        Adds bots surroundings to bot's map
-        :param bot_map:
-        :param bot_map_coords:
-        :param sight_range:
-        :return:
+        Adds bots surroundings to bot's map. Part of the square around the bot that lies inside the map is taken as one
+        slice, rotated to bot's initial direction and written to bot's map as one block.
+        :param bot_map: bot's map to write into
+        :param bot_map_coords: coords of the bot in bot's map
+        :param sight_range: radius of the square around the bot
         """
-        rotation_diff = (Utils.dir_to_number(self.initial_bot_dir) - Utils.dir_to_number(Utils.initial_dir)) % 4
+        rotation_diff = (DirectionCodec.to_number(self.initial_bot_dir) - DirectionCodec.to_number(Utils.initial_dir)) % 4
 
-        for dx in range(-sight_range, sight_range + 1):
-            for dy in range(-sight_range, sight_range + 1):
-                delta = np.array([dx, dy])
-                coords = bot_map_coords + Utils.rotate_coords(delta, 'right', rotation_diff)
-                env_coords = self.bot_pos + delta
+        top_left = np.maximum(self.bot_pos - sight_range, 0)
+        bottom_right = np.minimum(self.bot_pos + sight_range, self.size - 1)
+        if np.any(top_left > bottom_right):
+            return
 
-                if not 0 <= env_coords[0] < self.map.shape[0] or not 0 <= env_coords[1] < self.map.shape[1]:
-                    continue
+        window = np.rot90(self.map[top_left[0]:bottom_right[0] + 1, top_left[1]:bottom_right[1] + 1], k=-rotation_diff)
 
-                bot_map[coords[0], coords[1]] = self.map[env_coords[0], env_coords[1]]
+        corners = DirectionCodec.rotate(np.array([top_left, bottom_right]) - self.bot_pos, -rotation_diff)
+        start = bot_map_coords + corners.min(axis=0)
+        bot_map[start[0]:start[0] + window.shape[0], start[1]:start[1] + window.shape[1]] = window
 
-    def print_map(self, possible_current_poss: List[tuple]) -> None:
+    def set_view(self, viewport: Optional[Tuple[int, int]] = None, minimap: Optional[int] = None) -> None:
+        """
+        Sets what part of the map is printed.
+        :param viewport: (rows, columns) of window around the bot to print. If None whole map is printed.
+        :param minimap: maximal number of rows and columns of downsampled whole map printed under the map. If None
+        minimap is not printed.
+        """
+        self.renderer = MapRenderer(self.map, viewport, minimap)
+
+    def print_map(self, possible_current_poss: List[tuple], redraw: bool = False) -> None:
         """
         Prints map. Bot is arrow and possible positions of the bot are yellow.
         :param possible_current_poss: These positions are printed with yellow background
+        :param redraw: If True map is drawn at the top of the screen and only tiles changed since previous redraw are
+        printed
         """
-        possible_current_poss = [(list(pos), d) for pos, d in possible_current_poss]
-
-        for row in range(self.map.shape[0]):
-            for col in range(self.map.shape[1]):
-                fg_color = None
-                bg_color = None
-                tile = ' '
-                if self.map[row, col] == 0:
-                    neighbours = 0
-                    if row > 0 and self.map[row - 1, col] == 0:
-                        neighbours += 1
-                    if row < self.map.shape[0] - 1 and self.map[row + 1, col] == 0:
-                        neighbours += 2
-                    if col > 0 and self.map[row, col - 1] == 0:
-                        neighbours += 4
-                    if col < self.map.shape[1] - 1 and self.map[row, col + 1] == 0:
-                        neighbours += 8
-
-                    tile = Utils.num_to_unicode_wall(neighbours)
-                elif np.array_equal(self.bot_pos, [row, col]):
-                    tile = Utils.dir_to_unicode_arrow(self.bot_dir)
-                    fg_color = 'black'
-
-                if any(([row, col], d) in possible_current_poss for d in range(4)):
-                    bg_color = 'yellow'
-
-                Utils.print_colored(tile, fg_color=fg_color, bg_color=bg_color, end='')
-            print()
-
-        print('Legend:')
-        Utils.print_colored(Utils.dir_to_unicode_arrow(self.bot_dir), fg_color='black', bg_color='yellow', end='')
-        print(' - bot')
-        Utils.print_colored(' ', fg_color='black', bg_color='yellow', end='')
-        print(' - possible bot position')
+        if self.renderer is None:
+            self.renderer = MapRenderer(self.map)
+
+        print(self.renderer.render(self.bot_pos, self.bot_dir, possible_current_poss, redraw), end='', flush=True)
 
     def print_bot_stats(self, path: List[str], steps: int, possible_current_positions_string: str, discovered_tiles: int) -> None:
         """
@@ -136,4 +123,4 @@ class Environment:
         :param expected_position: (pos, dir as number)
         :return: True if expected position and direction match starting position and direction
         """
-        return np.array_equal(self.initial_bot_pos, expected_position[0]) and np.array_equal(self.initial_bot_dir, Utils.number_to_dir(expected_position[1]))
+        return np.array_equal(self.initial_bot_pos, expected_position[0]) and np.array_equal(self.initial_bot_dir, DirectionCodec.to_dir(expected_position[1]))
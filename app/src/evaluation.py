@@ -0,0 +1,163 @@
+"""
+Module with Evaluation class
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+import numpy as np
+
+from app.src.bot import Bot
+from app.src.environment import Environment
+from app.src.map_store import MapStore
+from app.src.utils import Utils
+
+# state of a worker process, filled by Evaluation.init_worker
+worker_context = {}
+
+
+class Evaluation:
+    """
+    Runs Bot.find_itself headless from every start position and direction of a map. Runs are spread across worker
+    processes. The map and its precomputed structures are built once and shared with the workers by MapStore, every
+    worker creates the finding algorithm only once.
+    """
+    # columns of the results array
+    fields = ('row', 'col', 'dir', 'steps', 'time', 'candidates', 'found', 'correct')
+    # number of start poses evaluated by worker in one task
+    chunk_size = 16
+
+    def __init__(self, file_name: str, sight_range: int = 1, workers: int = None, algorithm: str = None):
+        """
+        :param file_name: file with environment map
+        :param sight_range: sight range of the bot
+        :param workers: number of worker processes. If None number of CPUs is used.
+        :param algorithm: name of registered finding algorithm. If None default algorithm is used.
+        """
+        self.file_name = file_name
+        self.sight_range = sight_range
+        self.workers = workers or os.cpu_count()
+        self.algorithm = algorithm
+
+    def poses(self, sample: int = None, seed: int = 0) -> np.ndarray:
+        """
+        :param sample: if given only this many randomly chosen poses are returned
+        :param seed: seed of random sample
+        :return: (N, 3) start poses [row, column, direction as number] sorted by row, column and direction
+        """
+        free = np.argwhere(Utils.load(self.file_name) > 0)
+        poses = np.column_stack((np.repeat(free, 4, axis=0), np.tile(np.arange(4), len(free))))
+
+        if sample is not None and sample < len(poses):
+            rng = np.random.default_rng(seed)
+            poses = poses[np.sort(rng.choice(len(poses), sample, replace=False))]
+
+        return poses
+
+    def run(self, sample: int = None, seed: int = 0) -> np.ndarray:
+        """
+        :param sample: if given only this many randomly chosen poses are evaluated
+        :param seed: seed of random sample
+        :return: (N, len(fields)) array with result of every evaluated start pose
+        """
+        results = self.map_chunks(self.evaluate_chunk, self.poses(sample, seed))
+
+        return np.concatenate(results) if results else np.empty((0, len(self.fields)))
+
+    def map_chunks(self, function: Callable[[np.ndarray], object], poses: np.ndarray) -> list:
+        """
+        :param function: function called in worker process with chunk of start poses
+        :param poses: (N, 3) start poses [row, column, direction as number]
+        :return: results of function for chunks of chunk_size poses in order of poses
+        """
+        chunks = [poses[start:start + self.chunk_size] for start in range(0, len(poses), self.chunk_size)]
+
+        # executor is shut down before the store is removed
+        with MapStore.publish(Utils.load(self.file_name)) as store, \
+                ProcessPoolExecutor(self.workers, initializer=self.init_worker,
+                                    initargs=(store.directory, self.sight_range, self.algorithm)) as executor:
+            return list(executor.map(function, chunks))
+
+    @staticmethod
+    def init_worker(directory: str, sight_range: int, algorithm: str = None) -> None:
+        """
+        Attaches map store and creates finding algorithm in worker process.
+        :param directory: directory of MapStore with the environment map
+        :param sight_range: sight range of the bot
+        :param algorithm: name of registered finding algorithm
+        """
+        worker_context['store'] = MapStore(directory)
+        worker_context['map'] = worker_context['store'].map
+        worker_context['sight_range'] = sight_range
+        worker_context['finding_algorithm'] = worker_context['store'].create_algorithm(algorithm)
+
+    @staticmethod
+    def evaluate_chunk(poses: np.ndarray) -> np.ndarray:
+        """
+        :param poses: (N, 3) start poses [row, column, direction as number]
+        :return: (N, len(fields)) array with results
+        """
+        return np.array([Evaluation.evaluate_pose(pose) for pose in poses]).reshape(-1, len(Evaluation.fields))
+
+    @staticmethod
+    def evaluate_pose(pose: np.ndarray) -> list:
+        """
+        Runs Bot.find_itself from one start pose in worker process.
+        :param pose: start pose [row, column, direction as number]
+        :return: values of fields
+        """
+        environment = Environment(worker_context['map'], pose[:2], Utils.number_to_dir(pose[2]))
+        bot = Bot(environment, worker_context['sight_range'], worker_context['finding_algorithm'])
+
+        start = time.perf_counter()
+        candidates, steps = bot.find_itself(headless=True)
+        elapsed = time.perf_counter() - start
+
+        correct = any(environment.check_position(candidate) for candidate in candidates)
+        return [*pose, steps, elapsed, len(candidates), bot.finding_algorithm.is_bot_found, correct]
+
+    @staticmethod
+    def summary(results: np.ndarray) -> dict:
+        """
+        :param results: results returned by run
+        :return: distribution of steps, time and final candidates counts and counts of correct runs
+        """
+        summary = {'runs': len(results)}
+
+        for field in ('steps', 'time', 'candidates'):
+            values = results[:, Evaluation.fields.index(field)]
+            if len(values) == 0:
+                continue
+            summary[field] = {'min': float(np.min(values)), 'mean': float(np.mean(values)),
+                              'p50': float(np.percentile(values, 50)), 'p90': float(np.percentile(values, 90)),
+                              'p99': float(np.percentile(values, 99)), 'max': float(np.max(values)),
+                              'total': float(np.sum(values))}
+
+        found = results[:, Evaluation.fields.index('found')] == 1
+        correct = results[:, Evaluation.fields.index('correct')] == 1
+        summary['found'] = int(np.count_nonzero(found))
+        summary['found_correct'] = int(np.count_nonzero(found & correct))
+        summary['ambiguous_with_start'] = int(np.count_nonzero(~found & correct))
+        summary['wrong'] = int(np.count_nonzero(~correct))
+
+        return summary
+
+    @staticmethod
+    def report(summary: dict) -> str:
+        """
+        :param summary: summary returned by summary
+        :return: summary in readable format
+        """
+        lines = [f'Runs: {summary["runs"]}']
+
+        for field in ('steps', 'time', 'candidates'):
+            if field in summary:
+                lines.append(f'{field.capitalize()}: ' + ', '.join(
+                    f'{name} {value:.4g}' for name, value in summary[field].items()))
+
+        lines += [f'Found: {summary["found"]} (correct {summary["found_correct"]})',
+                  f'Not found, start among candidates: {summary["ambiguous_with_start"]}',
+                  f'Wrong: {summary["wrong"]}']
+
+        return '\n'.join(lines)
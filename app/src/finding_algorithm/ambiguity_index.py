@@ -0,0 +1,95 @@
+"""
+Module with AmbiguityIndex class
+"""
+import numpy as np
+
+from app.src.direction_codec import DirectionCodec
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.finding_algorithm.signature_index import SignatureIndex
+
+
+class AmbiguityIndex:
+    """
+    Partition of poses (tile, direction) of the environment map into classes of indistinguishable poses. Two poses are
+    in one class if they have the same 3x3 view and every action (move, left, right) leads to poses in one class again,
+    so no sequence of actions can ever tell them apart. Classes are computed by partition refinement starting from
+    signatures of views, poses which are alone in their class are not refined any more.
+    """
+
+    def __init__(self, environment_map: np.ndarray, signature_index: SignatureIndex, classes: np.ndarray = None):
+        """
+        :param environment_map: map of the environment, its edge must consist of walls
+        :param signature_index: signature index of the same map
+        :param classes: classes computed earlier by compute_classes, e.g. attached from MapStore
+        """
+        self.classes = self.compute_classes(environment_map, signature_index) if classes is None else classes
+
+    @staticmethod
+    def compute_classes(environment_map: np.ndarray, signature_index: SignatureIndex) -> np.ndarray:
+        """
+        :param environment_map: map of the environment, its edge must consist of walls
+        :param signature_index: signature index of the same map
+        :return: (4, rows, columns) class of every pose, -1 for walls
+        """
+        rows, cols = np.nonzero(environment_map > 0)
+        cells = len(rows)
+
+        # pose (tile i, direction d) has index d * cells + i
+        index = np.full(environment_map.shape, -1, dtype=np.int64)
+        index[rows, cols] = np.arange(cells)
+        moves = np.empty(4 * cells, dtype=np.int64)
+        for direction, offset in enumerate(DirectionCodec.offsets):
+            targets = index[rows + offset[0], cols + offset[1]]
+            # move into wall keeps the bot at the same tile
+            moves[direction * cells:(direction + 1) * cells] = np.where(targets >= 0, targets, np.arange(cells)) + \
+                direction * cells
+
+        classes = np.full((4,) + environment_map.shape, -1, dtype=np.int64)
+        classes[np.repeat(np.arange(4), cells), np.tile(rows, 4), np.tile(cols, 4)] = AmbiguityIndex.refine(
+            signature_index.signatures[:, rows, cols].ravel(), moves, cells)
+        return classes
+
+    @staticmethod
+    def refine(keys: np.ndarray, moves: np.ndarray, cells: int) -> np.ndarray:
+        """
+        Splits classes by classes of poses after move and after left rotation until no class is split. Right rotation
+        is three left rotations, so it does not split classes any further.
+        :param keys: (P, ) initial keys of poses, poses with different keys are distinguishable
+        :param moves: (P, ) index of pose after move of every pose
+        :param cells: number of free tiles, left rotation of pose p is pose (p + cells) % P
+        :return: (P, ) class of every pose
+        """
+        classes = np.unique(keys, return_inverse=True)[1].ravel().astype(np.int64)
+        next_class = int(classes.max()) + 1 if len(classes) else 0
+        active = np.nonzero(np.bincount(classes)[classes] > 1)[0]
+
+        while len(active) > 0:
+            current = classes[active]
+            split = np.unique(current * next_class + classes[(active + cells) % len(classes)], return_inverse=True)[1]
+            split = np.unique(split.ravel() * next_class + classes[moves[active]], return_inverse=True)[1].ravel()
+
+            sizes = np.bincount(split)
+            if len(sizes) == len(np.unique(current)):
+                break
+
+            # new classes get new numbers, so they differ from classes of inactive poses
+            classes[active] = next_class + split
+            next_class += len(sizes)
+            active = active[sizes[split] > 1]
+
+        return classes
+
+    def get_many(self, candidates: Candidates) -> np.ndarray:
+        """
+        :param candidates: poses on free tiles of the map
+        :return: (N, ) classes of the poses
+        """
+        return self.classes[candidates.dirs % 4, candidates.positions[:, 0], candidates.positions[:, 1]]
+
+    def are_equivalent(self, candidates: Candidates) -> bool:
+        """
+        :param candidates: poses on free tiles of the map
+        :return: True if there are at least two poses and all of them are in one class
+        """
+        classes = self.get_many(candidates)
+        return len(classes) > 1 and bool(np.all(classes == classes[0]))
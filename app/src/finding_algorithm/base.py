@@ -1,94 +1,271 @@
 """
 Module with FindingAlgorithm abstract class
 """
+import copy
 from abc import abstractmethod, ABC
-from typing import List
+from typing import Callable, List, Optional, Tuple
 
 import numpy as np
 
+from app.src.bot_map import BotMap
+from app.src.direction_codec import DirectionCodec
+from app.src.finding_algorithm.ambiguity_index import AmbiguityIndex
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.finding_algorithm.placement import MatrixPlacement, PlacementIndex
+from app.src.finding_algorithm.search_space import SearchSpace
+from app.src.finding_algorithm.signature_index import SignatureIndex
+from app.src.stats import SearchStats
 from app.src.utils import Utils
 
 
-class FindingAlgorithm(ABC):
+class FindingAlgorithm(ABC):  # pylint: disable=too-many-instance-attributes
     """
     Base class for finding algorithms. Helps bot find path to find itself.
     """
+    # number of possible positions checked first by passability
+    passability_prefix = 32
+    # radius of the first box of deltas searched by search_path
+    initial_search_radius = 16
+    # ambiguity index is not built by the search for maps with more poses (free tiles * 4), refinement of millions of
+    # poses takes 10-20 s. MapStore builds it for every map. If None it is built for every map.
+    ambiguity_max_poses = 1 << 20
 
-    def __init__(self, environment_map, name):
+    def __init__(self, environment_map, name, placement_engine: str = None, incremental: bool = True):
         self.environment_map = environment_map
         self.name = name
+        self.placement_engine = placement_engine or MatrixPlacement.default_engine
+        self.incremental = incremental
+        # built on first use, or installed from MapStore
+        self._signature_index = None
+        self._placement_index = None
         self.possible_starting_poss = None
         self.is_bot_found = False
+        # True if the search stopped because possible positions cannot be told apart
+        self.is_ambiguous = False
         self.steps = 0
+        # counters and timers of the current search
+        self.stats = SearchStats()
+        # built on first use by get_ambiguity_index
+        self.ambiguity_index = None
 
-    def get_path_controller(self, environment_map: np.ndarray, bot_map: np.ndarray, bot_rel_pos: np.ndarray,
-                            bot_rel_dir: np.ndarray) -> List[str]:
+    @property
+    def signature_index(self) -> SignatureIndex:
+        """
+        :return: signature index of the environment map
+        """
+        if self._signature_index is None:
+            self._signature_index = SignatureIndex(self.environment_map)
+        return self._signature_index
+
+    @signature_index.setter
+    def signature_index(self, signature_index: SignatureIndex) -> None:
+        self._signature_index = signature_index
+
+    @property
+    def placement_index(self) -> PlacementIndex:
+        """
+        :return: placement index of the environment map used by indexed placement engines
+        """
+        if self._placement_index is None:
+            self._placement_index = PlacementIndex(self.environment_map)
+        return self._placement_index
+
+    @placement_index.setter
+    def placement_index(self, placement_index: PlacementIndex) -> None:
+        self._placement_index = placement_index
+
+    def reset(self) -> None:
+        """Forgets state of previous search. Precomputed structures of the environment map are kept."""
+        self.possible_starting_poss = None
+        self.is_bot_found = False
+        self.is_ambiguous = False
+        self.steps = 0
+        self.stats.reset()
+
+    def fork(self) -> 'FindingAlgorithm':
+        """
+        :return: new algorithm with its own state of search which shares precomputed structures of the environment map
+        with this one, so many searches can run on one map at the same time
+        """
+        algorithm = copy.copy(self)
+        algorithm.stats = SearchStats()
+        algorithm.reset()
+        return algorithm
+
+    def get_path_controller(self, environment_map: np.ndarray, bot_map: BotMap, bot_rel_pos: np.ndarray,
+                            bot_rel_dir: np.ndarray, new_tiles: np.ndarray = None) -> List[str]:
         """
         :param environment_map: map of the environment
         :param bot_map: environment discovered by the bot
         :param bot_rel_pos: relative position of the bot
         :param bot_rel_dir: relative direction of the bot
+        :param new_tiles: tiles [row, column, value] added to bot map since last call. If given in incremental mode only
+        current possible positions are checked against them instead of searching whole environment map again.
         :return: List of next moves
         """
-        self.possible_starting_poss = self.find_all_possible_positions(environment_map, bot_map)
+        self.stats.count('replans')
+        if self.incremental and new_tiles is not None and self.possible_starting_poss is not None:
+            with self.stats.timer('pruning'):
+                self.possible_starting_poss = self.prune_possible_positions(environment_map, new_tiles)
+        else:
+            with self.stats.timer('placement'):
+                self.possible_starting_poss = self.find_all_possible_positions(environment_map, bot_map)
+        self.stats.candidates.append(len(self.possible_starting_poss))
 
         if len(self.possible_starting_poss) == 1:
             self.is_bot_found = True
             return []
 
-        return self.get_path(bot_rel_pos, bot_rel_dir)
+        # index built beforehand (MapStore, get_ambiguity_index) saves planner searching everything reachable
+        if self.ambiguity_index is not None and \
+                self.ambiguity_index.are_equivalent(self.possible_current_poss(bot_rel_pos, bot_rel_dir)):
+            self.is_ambiguous = True
+            return []
+
+        with self.stats.timer('planning'):
+            path = self.get_path(bot_rel_pos, bot_rel_dir)
+
+        # building the index costs more than planning on most maps, so the search builds it only when planner gave up
+        if not path:
+            ambiguity_index = self.get_ambiguity_index()
+            self.is_ambiguous = ambiguity_index is not None and \
+                ambiguity_index.are_equivalent(self.possible_current_poss(bot_rel_pos, bot_rel_dir))
 
-    def find_all_possible_positions(self, environment_map: np.ndarray, bot_map: np.ndarray) -> List[tuple]:
+        return path
+
+    def get_ambiguity_index(self) -> Optional[AmbiguityIndex]:
+        """
+        :return: ambiguity index of the environment map, None if the map has more poses than ambiguity_max_poses
+        """
+        if self.ambiguity_index is None and (self.ambiguity_max_poses is None or
+                                             len(self.signature_index.entries) <= self.ambiguity_max_poses):
+            with self.stats.timer('ambiguity'):
+                self.ambiguity_index = AmbiguityIndex(self.environment_map, self.signature_index)
+
+        return self.ambiguity_index
+
+    def find_all_possible_positions(self, environment_map: np.ndarray, bot_map: BotMap) -> Candidates:
         """
         Finds all possible starting positions of bot on environment map using discovered area in bot's map
         :param environment_map: map of the environment
         :param bot_map: environment discovered by the bot
-        :return: list tuples in format (possible starting position, possible starting direction as int)
+        :return: possible starting positions and directions
         """
+        possible_starting_poss = self.find_initial_positions(bot_map)
+        if possible_starting_poss is not None:
+            self.stats.count('signature_lookups')
+            return possible_starting_poss
+
+        discovered_map, top_left = bot_map.discovered()
+        bottom_right = top_left + discovered_map.shape - 1
+        # every rotation is tested at every offset where it fits, rotation by 90 degrees swaps rows and columns
+        for rows, cols in (discovered_map.shape, discovered_map.shape[::-1]):
+            self.stats.count('placements_tested', 2 * max(0, environment_map.shape[0] - rows + 1) *
+                             max(0, environment_map.shape[1] - cols + 1))
+
         possible_starting_poss = []
         for rotation in range(4):
-            bot_map_rotated = np.rot90(bot_map, k=rotation)
-            not_null = np.where(bot_map_rotated >= 0)
-            start_row = np.min(not_null[0])
-            end_row = np.max(not_null[0]) + 1
+            # np.rot90 rotates coordinates relative to starting position to the left
+            corners = Candidates.rotate(np.array([top_left, bottom_right]), [rotation])[0]
+            start = corners.min(axis=0)
 
-            start_column = np.min(not_null[1])
-            end_column = np.max(not_null[1]) + 1
+            possible_starting_poss.append(Candidates.from_positions(
+                MatrixPlacement.find(environment_map, np.rot90(discovered_map, k=rotation), self.placement_engine,
+                                     self.placement_index) - start,
+                DirectionCodec.to_number(Utils.initial_dir) + rotation))
 
-            start = np.array([start_row, start_column])
+        return Candidates.concatenate(possible_starting_poss)
 
-            discovered_map = bot_map_rotated[start_row:end_row, start_column:end_column]
+    def find_initial_positions(self, bot_map: BotMap) -> Optional[Candidates]:
+        """
+        Finds possible starting positions using signature index when only 3x3 view around starting position is discovered.
+        :param bot_map: environment discovered by the bot
+        :return: same candidates as find_all_possible_positions or None if more than the 3x3 view is discovered
+        """
+        if bot_map.discovered_count != SignatureIndex.view_size or not np.array_equal(bot_map.bounds, [-1, -1, 1, 1]):
+            return None
 
-            delta = bot_map.shape[0] // 2 - start
-            possible_starting_poss += [(location + delta, (Utils.dir_to_number(Utils.initial_dir) + rotation) % 4) for
-                                       location in self.find_matrix_placements(environment_map, discovered_map)]
+        return Candidates(self.signature_index.lookup(SignatureIndex.encode(bot_map.discovered()[0])))
 
-        return possible_starting_poss
+    def prune_possible_positions(self, environment_map: np.ndarray, new_tiles: np.ndarray) -> Candidates:
+        """
+        Keeps only possible starting positions which agree with newly discovered tiles. Since possible positions can
+        only shrink this gives same result as find_all_possible_positions.
+        :param environment_map: map of the environment
+        :param new_tiles: (N, 3) tiles [row, column, value] relative to starting position
+        :return: possible starting positions and directions
+        """
+        if len(new_tiles) == 0 or len(self.possible_starting_poss) == 0:
+            return self.possible_starting_poss
+        self.stats.count('candidates_checked', len(self.possible_starting_poss))
+
+        # absolute coordinates of every new tile for every possible position, shape (positions, tiles, 2)
+        coords = self.possible_starting_poss.relative(new_tiles[:, :2])
+
+        return self.possible_starting_poss.filter(
+            np.all(Candidates.values(environment_map, coords) == new_tiles[:, 2], axis=1))
 
     def possible_starting_poss_to_str(self) -> str:
         """
         :return: string of possible starting position in readable format
         """
-        return '; '.join([f'({pos_and_dir[0]} {Utils.dir_to_unicode_arrow(pos_and_dir[1])})' for pos_and_dir in
-                          self.possible_starting_poss])
+        return self.possible_starting_poss.to_str()
 
-    def possible_current_poss(self, bot_rel_pos: np.ndarray, bot_rel_dir: np.ndarray) -> List[tuple]:
+    def possible_current_poss(self, bot_rel_pos: np.ndarray, bot_rel_dir: np.ndarray) -> Candidates:
         """
         :param bot_rel_pos:
         :param bot_rel_dir:
-        :return: List of possible current positions of the bot (possible starting position, possible starting direction as int)
+        :return: possible current positions and directions of the bot
         """
-        return [(pos_and_dir[0] + Utils.rotate_coords(bot_rel_pos, "left", pos_and_dir[1]),
-                 (pos_and_dir[1] + Utils.dir_to_number(bot_rel_dir)) % 4)
-                for pos_and_dir in self.possible_starting_poss]
+        return self.possible_starting_poss.current(bot_rel_pos, DirectionCodec.to_number(bot_rel_dir))
+
+    def passability(self, current_poss: Candidates) -> Callable[[int, int], bool]:
+        """
+        :param current_poss: possible current positions
+        :return: function which returns True if tile at (row delta, column delta) is free for any possible position.
+        First few possible positions are checked before all of them, so free tiles are cheap even with many positions.
+        """
+        prefix = current_poss[:self.passability_prefix]
+
+        def is_passable(row: int, col: int) -> bool:
+            # passable if any possible current pos + delta rotated to its direction is free
+            return bool(np.any(Candidates.values(self.environment_map, prefix.relative((row, col)), 0) != 0) or
+                        np.any(Candidates.values(self.environment_map, current_poss.relative((row, col)), 0) != 0))
+
+        return is_passable
 
     def possible_current_poss_to_str(self, bot_rel_pos: np.ndarray, bot_rel_dir: np.ndarray) -> str:
         """
         :return: string of possible starting position in readable format
         """
 
-        return '; '.join([f'({pos_and_dir[0]} {Utils.dir_to_unicode_arrow(pos_and_dir[1])})' for pos_and_dir in
-                          self.possible_current_poss(bot_rel_pos, bot_rel_dir)])
+        return self.possible_current_poss(bot_rel_pos, bot_rel_dir).to_str()
+
+    def search_path(self, bot_rel_pos: np.ndarray, bot_rel_dir: np.ndarray,
+                    find_target: Callable[[SearchSpace, Candidates], Optional[Tuple[int, int, int]]]) -> List[str]:
+        """
+        Searches states (delta, direction) in box around the bot for target of the next part of path. When the search
+        reaches edge of the box it is repeated with twice as big box.
+        :param bot_rel_pos: relative position of the bot
+        :param bot_rel_dir: relative direction of the bot
+        :param find_target: expands search space for possible current positions and returns target state (row delta,
+        column delta, direction as number), None if there is no target
+        :return: path to the target, empty if there is no target
+        """
+        current_poss = self.possible_current_poss(bot_rel_pos, bot_rel_dir)
+        is_passable = self.passability(current_poss)
+
+        radius = self.initial_search_radius
+        while True:
+            # no possible position can see deltas further than size of the map
+            bounded = radius >= max(self.environment_map.shape)
+            search_space = SearchSpace(radius, is_passable, bounded)
+
+            target = find_target(search_space, current_poss)
+            if not search_space.overflow:
+                return [] if target is None else self.get_path_commands_from_moves(search_space.moves(*target))
+
+            radius *= 2
 
     @staticmethod
     def get_visible_environment(environment_map: np.ndarray, bot_pos: np.ndarray, bot_dir: np.ndarray,
@@ -106,28 +283,27 @@ class FindingAlgorithm(ABC):
                         max(bot_pos[1] - sight_range, 0): min(bot_pos[1] + sight_range + 1, environment_map.shape[1])],
                         k=-bot_dir).ravel()
 
+    def get_visible_signature(self, bot_pos: np.ndarray, bot_dir: int) -> int:
+        """
+        Integer counterpart of get_visible_environment with sight range 1. Two views are same if their signatures are same.
+        :param bot_pos: position inside environment map
+        :param bot_dir: direction of the bot as number
+        :return: signature of environment visible to bot
+        """
+        return self.signature_index.get(bot_pos, bot_dir)
+
     @staticmethod
-    def find_matrix_placements(matrix: np.ndarray, matrix_to_find: np.ndarray) -> List[np.ndarray]:
+    def find_matrix_placements(matrix: np.ndarray, matrix_to_find: np.ndarray, engine: str = None) -> List[np.ndarray]:
         """
         :param matrix: must be bigger than matrix_to_find
         :param matrix_to_find: matrix to find locations of
+        :param engine: placement engine from MatrixPlacement.engines. Engines return same placements and can be cross-checked.
+        Indexed engines (MatrixPlacement.indexed_engines, e.g. default bitpacked) need matrix of 0 and 1 values and
+        matrix_to_find of -1, 0 and 1 values.
         :return: list of top-left positions from which values of matrix and matrix_to_find are same
+        :raises ValueError: if values are not valid for indexed engine
         """
-        rows_cnt, cols_cnt = matrix.shape
-        inner_rows_cnt, inner_cols_cnt = matrix_to_find.shape
-
-        matches = []
-
-        for i in range(rows_cnt - inner_rows_cnt + 1):
-            for j in range(cols_cnt - inner_cols_cnt + 1):
-                # positions where numbers differ
-                not_equal_positions = np.where(matrix_to_find != matrix[i:i + inner_rows_cnt, j:j + inner_cols_cnt])
-
-                # check if all numbers that differ are -1
-                if np.all(matrix_to_find[not_equal_positions] == -1):
-                    matches.append(np.array([i, j]))
-
-        return matches
+        return list(MatrixPlacement.find(matrix, matrix_to_find, engine))
 
     @abstractmethod
     def get_path(self, bot_rel_pos, bot_rel_dir) -> List[str]:
@@ -148,7 +324,7 @@ class FindingAlgorithm(ABC):
         commands = []
 
         for curr_dir in moves:
-            rotation_diff = (Utils.dir_to_number(curr_dir) - Utils.dir_to_number(prev_dir)) % 4
+            rotation_diff = (DirectionCodec.to_number(curr_dir) - DirectionCodec.to_number(prev_dir)) % 4
             if rotation_diff == 0:
                 commands.append("move")
             elif rotation_diff == 1:
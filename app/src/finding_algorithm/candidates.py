@@ -0,0 +1,129 @@
+"""
+Module with Candidates class
+"""
+from typing import Iterator, Tuple, Union
+
+import numpy as np
+
+from app.src.direction_codec import DirectionCodec
+from app.src.utils import Utils
+
+
+class Candidates:
+    """
+    Possible positions and directions of the bot stored as (N, 3) int32 array of rows [row, column, direction as number].
+    Iterating yields tuples (position, direction as int) same as the list of possible positions used to.
+    """
+    def __init__(self, array: np.ndarray = None):
+        if array is None:
+            array = np.empty((0, 3))
+        self.array = np.asarray(array, dtype=np.int32).reshape(-1, 3)
+
+    @staticmethod
+    def from_positions(positions: np.ndarray, dirs: Union[np.ndarray, int]) -> 'Candidates':
+        """
+        :param positions: (N, 2) positions
+        :param dirs: (N, ) directions as numbers or one direction for all positions
+        :return: candidates with given positions and directions
+        """
+        positions = np.asarray(positions).reshape(-1, 2)
+        dirs = np.broadcast_to(np.asarray(dirs) % 4, len(positions))
+        return Candidates(np.column_stack((positions, dirs)))
+
+    @staticmethod
+    def concatenate(candidates: list) -> 'Candidates':
+        """
+        :param candidates: list of Candidates
+        :return: all candidates in one Candidates in given order
+        """
+        return Candidates(np.concatenate([c.array for c in candidates]) if candidates else None)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """(N, 2) positions"""
+        return self.array[:, :2]
+
+    @property
+    def dirs(self) -> np.ndarray:
+        """(N, ) directions as numbers"""
+        return self.array[:, 2]
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, int]]:
+        for row in self.array:
+            yield row[:2].astype(int), int(row[2])
+
+    def __getitem__(self, item) -> Union[Tuple[np.ndarray, int], 'Candidates']:
+        if isinstance(item, (int, np.integer)):
+            return self.array[item, :2].astype(int), int(self.array[item, 2])
+
+        return Candidates(self.array[item])
+
+    @staticmethod
+    def rotate(coords: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Rotates coords to the left by different count for every candidate.
+        :param coords: (2, ) or (T, 2) coords to rotate
+        :param counts: (N, ) counts of rotations
+        :return: (N, 2) or (N, T, 2) rotated coords
+        """
+        return DirectionCodec.rotate(coords, np.asarray(counts).reshape(-1))
+
+    def relative(self, coords: np.ndarray) -> np.ndarray:
+        """
+        :param coords: (2, ) or (T, 2) coords relative to position and direction of candidate
+        :return: (N, 2) or (N, T, 2) absolute coords for every candidate
+        """
+        coords = np.asarray(coords)
+        positions = self.positions if coords.ndim == 1 else self.positions[:, None, :]
+        return positions + self.rotate(coords, self.dirs)
+
+    def current(self, bot_rel_pos: np.ndarray, bot_rel_dir: int) -> 'Candidates':
+        """
+        :param bot_rel_pos: relative position of the bot
+        :param bot_rel_dir: relative direction of the bot as number
+        :return: current positions and directions of the bot if candidates are starting positions
+        """
+        return Candidates(np.column_stack((self.relative(bot_rel_pos), (self.dirs + bot_rel_dir) % 4)))
+
+    @staticmethod
+    def inside(positions: np.ndarray, shape: tuple) -> np.ndarray:
+        """
+        :param positions: (..., 2) positions
+        :param shape: shape of the map
+        :return: (..., ) bool mask of positions inside map
+        """
+        return np.all((positions >= 0) & (positions < np.asarray(shape[:2])), axis=-1)
+
+    @staticmethod
+    def values(environment_map: np.ndarray, positions: np.ndarray, outside: int = -1) -> np.ndarray:
+        """
+        :param environment_map: map to read from
+        :param positions: (..., 2) positions
+        :param outside: value for positions outside the map
+        :return: (..., ) values of the map on positions
+        """
+        inside = Candidates.inside(positions, environment_map.shape)
+        clipped = np.clip(positions, 0, np.asarray(environment_map.shape) - 1)
+        # outside as array so that it is not cast to unsigned type of the map
+        return np.where(inside, environment_map[clipped[..., 0], clipped[..., 1]], np.array(outside))
+
+    def filter(self, mask: np.ndarray) -> 'Candidates':
+        """
+        :param mask: (N, ) bool mask
+        :return: candidates where mask is True
+        """
+        return Candidates(self.array[mask])
+
+    def to_str(self, limit: int = None) -> str:
+        """
+        :param limit: maximal number of formatted candidates, the rest is only counted. If None all are formatted.
+        :return: string of candidates in readable format
+        """
+        if limit is None or len(self) <= limit:
+            return '; '.join([f'({pos} {Utils.dir_to_unicode_arrow(d)})' for pos, d in self])
+
+        shown = [Candidates(self.array[:limit]).to_str()] if limit > 0 else []
+        return '; '.join(shown + [f'... ({len(self)} in total)'])
@@ -0,0 +1,199 @@
+"""
+Module with PolicyTree class and CompiledPolicy class implementation of FindingAlgorithm abstract class
+"""
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.src.bot_map import BotMap
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.utils import Utils
+
+
+@dataclass
+class PolicyTree:
+    """
+    Decision tree of finding algorithm compiled from its searches from every start pose. Node is history of observations,
+    its children are keyed by the next observation and its action is what the finding algorithm did after the history.
+    Start poses are ordered so that poses which went through a node are one contiguous range, so possible starting
+    positions of every node are a slice of poses.
+    """
+    map_hash: str
+    sight_range: int
+    # name of the compiled finding algorithm
+    algorithm: str
+    # (N, 3) start poses [row, column, direction as number]
+    poses: np.ndarray
+    # action code of every node, stop code if the search ended there, node 0 is the root before first observation
+    actions: str
+    # (M, 2) range of poses of every node
+    ranges: np.ndarray
+    # children of every node by observation
+    children: List[Dict[str, int]]
+
+    action_codes = {'move': 'm', 'left': 'l', 'right': 'r'}
+    stop = '-'
+
+    @staticmethod
+    def build(records: list) -> 'PolicyTree':
+        """
+        :param records: SessionRecord of search from every start pose of one map
+        :return: decision tree of the searches
+        :raises ValueError: if the finding algorithm did different things after same observations
+        """
+        actions, children, leaves = [PolicyTree.stop], [{}], {}
+
+        for record in records:
+            node = 0
+            for step, observation in enumerate(record.observations):
+                key = ''.join(observation)
+                if key not in children[node]:
+                    children[node][key] = len(actions)
+                    actions.append(None)
+                    children.append({})
+                node = children[node][key]
+
+                action = record.actions[step] if step < len(record.actions) else PolicyTree.stop
+                if actions[node] is not None and actions[node] != action:
+                    raise ValueError(f'Start pose {record.start} has same observations as another start pose but '
+                                     f'different action after step {step}')
+                actions[node] = action
+
+            leaves.setdefault(node, []).append(record)
+
+        for leaf in leaves.values():
+            if sorted(tuple(record.start) for record in leaf) != sorted(map(tuple, leaf[0].result)):
+                raise ValueError(f'Start poses with observations of start pose {leaf[0].start} are not its result')
+
+        # depth-first order of leaves, so every node has a range of poses
+        poses, ranges = [], np.zeros((len(actions), 2), dtype=np.int64)
+        stack = [(0, False)]
+        while stack:
+            node, finished = stack.pop()
+            ranges[node, int(finished)] = len(poses)
+            if not finished:
+                poses += [record.start for record in leaves.get(node, [])]
+                stack.append((node, True))
+                stack += [(child, False) for _, child in sorted(children[node].items(), reverse=True)]
+
+        return PolicyTree(records[0].map_hash, records[0].sight_range, records[0].algorithm,
+                          np.array(poses, dtype=np.int32).reshape(-1, 3), ''.join(actions), ranges, children)
+
+    def next_node(self, node: int, observation: str) -> int:
+        """
+        :param node: current node
+        :param observation: rows of observation joined to one string
+        :return: child of the node with the observation
+        :raises ValueError: if the observation never followed the node during compilation
+        """
+        child = self.children[node].get(observation)
+        if child is None:
+            raise ValueError(f'Observation {observation!r} was not seen during compilation of the policy')
+        return child
+
+    def candidates(self, node: int) -> Candidates:
+        """
+        :param node: node of the tree
+        :return: start poses which went through the node
+        """
+        return Candidates(self.poses[self.ranges[node, 0]:self.ranges[node, 1]])
+
+    def action(self, node: int) -> Optional[str]:
+        """
+        :param node: node of the tree
+        :return: action done after the node, None if the search ended in the node
+        """
+        names = {code: name for name, code in self.action_codes.items()}
+        return names.get(self.actions[node])
+
+    def save(self, file_name: str) -> None:
+        """
+        :param file_name: JSON file to save the tree to
+        """
+        with open(file_name, 'w', encoding='utf-8') as file:
+            json.dump({'map_hash': self.map_hash, 'sight_range': self.sight_range, 'algorithm': self.algorithm,
+                       'poses': self.poses.tolist(), 'actions': self.actions, 'ranges': self.ranges.tolist(),
+                       'children': self.children}, file, separators=(',', ':'))
+            file.write('\n')
+
+    @staticmethod
+    def load(file_name: str) -> 'PolicyTree':
+        """
+        :param file_name: JSON file saved by save
+        :return: loaded tree
+        """
+        with open(file_name, encoding='utf-8') as file:
+            data = json.load(file)
+
+        return PolicyTree(data['map_hash'], data['sight_range'], data['algorithm'],
+                          np.array(data['poses'], dtype=np.int32).reshape(-1, 3), data['actions'],
+                          np.array(data['ranges'], dtype=np.int64).reshape(-1, 2), data['children'])
+
+
+class CompiledPolicy(FindingAlgorithm):
+    """
+    Implementation of abstract class FindingAlgorithm. Drives the bot by compiled decision tree, so every step is one
+    lookup of the last observation and neither placement of bot map nor search of path is done. The bot must have same
+    sight range as the compiled finding algorithm.
+    """
+
+    def __init__(self, environment_map, policy: PolicyTree, sight_range: int = None):
+        """
+        :param environment_map: map of the environment
+        :param policy: decision tree compiled for the map
+        :param sight_range: sight range of the bot. If None it is not checked and the bot must have sight range of the
+        policy.
+        :raises ValueError: if the policy was compiled for different map or different sight range
+        """
+        if policy.map_hash != Utils.map_hash(environment_map):
+            raise ValueError('Policy was compiled for different map')
+        if sight_range is not None and sight_range != policy.sight_range:
+            raise ValueError(f'Policy was compiled for sight range {policy.sight_range}, not {sight_range}')
+
+        super().__init__(environment_map, 'CompiledPolicy')
+        self.policy = policy
+        # node of the policy matching observations so far
+        self.node = 0
+
+    def reset(self) -> None:
+        super().reset()
+        self.node = 0
+
+    def get_path_controller(self, environment_map: np.ndarray, bot_map: BotMap, bot_rel_pos: np.ndarray,
+                            bot_rel_dir: np.ndarray, new_tiles: np.ndarray = None) -> List[str]:
+        """
+        Moves to the child of current node by observation after the last step. Node where the search ended is kept.
+        :param environment_map: map of the environment
+        :param bot_map: environment discovered by the bot
+        :param bot_rel_pos: relative position of the bot
+        :param bot_rel_dir: relative direction of the bot
+        :param new_tiles: not used, observation is read from the bot map
+        :return: next action or empty list if the search ended
+        """
+        # bot asks again after the search ended without doing any step
+        if self.node != 0 and self.policy.action(self.node) is None:
+            return []
+
+        self.stats.count('replans')
+        with self.stats.timer('lookup'):
+            self.node = self.policy.next_node(self.node,
+                                              ''.join(bot_map.observation(bot_rel_pos, self.policy.sight_range)))
+            self.possible_starting_poss = self.policy.candidates(self.node)
+        self.stats.candidates.append(len(self.possible_starting_poss))
+
+        path = self.get_path(bot_rel_pos, bot_rel_dir)
+        if not path:
+            self.is_bot_found = len(self.possible_starting_poss) == 1
+        return path
+
+    def get_path(self, bot_rel_pos: np.ndarray, bot_rel_dir: np.ndarray) -> List[str]:
+        """
+        :param bot_rel_pos: not used, current node determines the action
+        :param bot_rel_dir: not used, current node determines the action
+        :return: action of current node
+        """
+        action = self.policy.action(self.node)
+        return [] if action is None else [action]
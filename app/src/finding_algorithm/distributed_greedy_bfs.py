@@ -2,13 +2,13 @@
 Module with DistributedGreedyBFS class implementation of FindingAlgorithm abstract class
 """
 
-from queue import PriorityQueue
-from typing import List
+from typing import List, Optional, Tuple
 
 import numpy as np
 
 from app.src.finding_algorithm.base import FindingAlgorithm
-from app.src.utils import Utils
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.finding_algorithm.search_space import SearchSpace
 
 
 class DistributedGreedyBFS(FindingAlgorithm):
@@ -17,85 +17,42 @@ class DistributedGreedyBFS(FindingAlgorithm):
     there at least one of possible starting positions is eliminated.
     """
 
-    def __init__(self, environment_map):
-        super().__init__(environment_map, 'DistributedGreedyBFS')
+    def __init__(self, environment_map, placement_engine: str = None, incremental: bool = True):
+        super().__init__(environment_map, 'DistributedGreedyBFS', placement_engine, incremental)
 
     def get_path(self, bot_rel_pos: np.ndarray, bot_rel_dir: np.ndarray) -> List[str]:
         """
-        Calculates next part of path
+        Calculates next part of path to the nearest state from which views of possible positions differ.
         :param bot_rel_pos:
         :param bot_rel_dir:
         :return: next part of path
         """
-        prev = {(0, 0): None}
-        pos = np.array([0, 0])
-        queue = PriorityQueue()
-        queue.put((0, pos))
+        def nearest_target(search_space: SearchSpace, current_poss: Candidates) -> Optional[Tuple[int, int, int]]:
+            for _, row, col, direction in search_space.expand():
+                self.stats.count('nodes_expanded')
+                if self.process_node(bot_rel_pos, bot_rel_dir, np.array([row, col]), current_poss):
+                    return row, col, direction
+            return None
 
-        end_pos = None
+        return self.search_path(bot_rel_pos, bot_rel_dir, nearest_target)
 
-        while not queue.empty():
-            priority, pos_delta = queue.get()
-            pos_delta = np.array(pos_delta)
-
-            if self.process_node(bot_rel_pos, bot_rel_dir, pos_delta):
-                end_pos = pos_delta
-                break
-
-            for neighbour in Utils.neighbours:
-                neighbour_delta = pos_delta + neighbour
-
-                if tuple(neighbour_delta) not in prev:
-                    prev[tuple(neighbour_delta)] = pos_delta
-
-                    # add neighbour_delta to queue if any possible start + neighbour_delta is inside map
-                    for pos_and_dir in self.possible_starting_poss:
-                        # starting pos + relative delta rotated to expected direction + neighbour delta rotated to bot current abs bot dir
-                        pos = pos_and_dir[0] + Utils.rotate_coords(bot_rel_pos, 'left',
-                                                                   pos_and_dir[1]) + Utils.rotate_coords(
-                            neighbour_delta, 'left', pos_and_dir[1] + Utils.dir_to_number(bot_rel_dir))
-
-                        if 0 <= pos[0] < self.environment_map.shape[0] and 0 <= pos[1] < self.environment_map.shape[
-                            1] and \
-                                self.environment_map[tuple(pos)] != 0:
-                            curr_bot_dir = prev.get(tuple(pos_delta)) - pos_delta if prev.get(
-                                tuple(pos_delta)) is not None else Utils.initial_dir
-                            rotations = min(abs(Utils.dir_to_number(neighbour) - Utils.dir_to_number(curr_bot_dir)),
-                                            4 - abs(Utils.dir_to_number(neighbour) - Utils.dir_to_number(curr_bot_dir)))
-                            queue.put((priority + rotations + 1, tuple(neighbour_delta)))
-                            break
-
-        if end_pos is None:
-            return []
-
-        moves = []
-
-        while prev.get(tuple(end_pos)) is not None:
-            moves.append(end_pos - np.asarray(prev.get(tuple(end_pos))))
-            end_pos = prev.get(tuple(end_pos))
-
-        moves.reverse()
-        return self.get_path_commands_from_moves(moves)
-
-    def process_node(self, bot_rel_pos: np.ndarray, bot_rel_dir: np.ndarray, pos_delta: np.ndarray) -> bool:
+    def process_node(self, bot_rel_pos: np.ndarray, bot_rel_dir: np.ndarray, pos_delta: np.ndarray,
+                     current_poss: Candidates = None) -> bool:
         """
+        Checks all possible positions at once. Views are compared by their signatures which are read in one gather.
         :param bot_rel_pos:
         :param bot_rel_dir:
         :param pos_delta:
+        :param current_poss: possible current positions, computed from bot_rel_pos and bot_rel_dir if not given
         :return: True if search should end and this node is final. False otherwise.
         """
-        visible_environments = set()
-
-        for pos_and_dir in self.possible_starting_poss:
-            # starting pos + relative delta rotated to expected direction + neighbour delta rotated to bot current abs bot dir
-            pos = pos_and_dir[0] + Utils.rotate_coords(bot_rel_pos, 'left', pos_and_dir[1]) + Utils.rotate_coords(
-                pos_delta, 'left', pos_and_dir[1] + Utils.dir_to_number(bot_rel_dir))
-
-            if 0 <= pos[0] < self.environment_map.shape[0] and 0 <= pos[1] < self.environment_map.shape[1]:
-                visible_environments.add(
-                    tuple(self.get_visible_environment(self.environment_map, pos, pos_and_dir[1], 1)))
+        self.stats.count('process_node_calls')
+        if current_poss is None:
+            current_poss = self.possible_current_poss(bot_rel_pos, bot_rel_dir)
 
-                if len(visible_environments) > 1:
-                    return True
+        # current pos + delta rotated to current direction. Views of all possible positions are rotated by same
+        # relative direction, so they can be compared in current directions
+        signatures = self.signature_index.get_many(current_poss.relative(pos_delta), current_poss.dirs)
+        signatures = signatures[signatures >= 0]
 
-        return len(visible_environments) > 1
+        return bool(np.any(signatures != signatures[:1]))
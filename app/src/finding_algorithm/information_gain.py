@@ -0,0 +1,126 @@
+"""
+Module with InformationGainPlanner class implementation of FindingAlgorithm abstract class
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.finding_algorithm.search_space import SearchSpace
+
+
+class InformationGainPlanner(FindingAlgorithm):
+    """
+    Implementation of abstract class FindingAlgorithm. For every reachable tile possible positions are partitioned by
+    view they would see there. This finding algorithm goes to the tile with the highest expected number of eliminated
+    possible positions per unit of travel cost, so it prefers tiles which split possible positions evenly.
+    """
+
+    # maximal number of tiles scored together in one gather, batches grow from one tile, so near tiles which are often
+    # good enough are scored without expanding many tiles
+    batch_size = 64
+    # partitions are estimated from evenly spread sample of possible positions when there are more of them
+    max_scored_positions = 256
+
+    def __init__(self, environment_map, placement_engine: str = None, incremental: bool = True):
+        super().__init__(environment_map, 'InformationGainPlanner', placement_engine, incremental)
+
+    def get_path(self, bot_rel_pos: np.ndarray, bot_rel_dir: np.ndarray) -> List[str]:
+        """
+        Calculates next part of path to the tile with the best score.
+        :param bot_rel_pos:
+        :param bot_rel_dir:
+        :return: next part of path
+        """
+        return self.search_path(bot_rel_pos, bot_rel_dir, self.best_target)
+
+    def best_target(self, search_space: SearchSpace, current_poss: Candidates,
+                    scored_poss: Candidates = None) -> Optional[Tuple[int, int, int]]:
+        """
+        Expands tiles in order of travel cost and scores them in batches. The search stops when even elimination of all
+        but one possible position would not be worth the cost.
+        :param search_space: search space to expand
+        :param current_poss: possible current positions
+        :param scored_poss: possible positions used for scoring. If None evenly spread sample of max_scored_positions
+        current positions is used.
+        :return: (row delta, column delta, direction as number) of the best tile, None if no tile eliminates anything
+        """
+        if scored_poss is None:
+            scored_poss = current_poss
+            if len(current_poss) > self.max_scored_positions:
+                scored_poss = current_poss[
+                    np.linspace(0, len(current_poss) - 1, self.max_scored_positions).astype(int)]
+
+        # highest possible expected elimination, all possible positions see different views
+        max_gain = len(current_poss) - 1
+        best_score, best = 0, None
+        batch, batch_size = [], 1
+
+        for cost, row, col, direction in search_space.expand():
+            if cost > 0 and max_gain / cost <= best_score:
+                break
+
+            self.stats.count('nodes_expanded')
+            batch.append((cost, row, col, direction))
+            if len(batch) == batch_size:
+                best_score, best = self.best_in_batch(np.array(batch), scored_poss, len(current_poss),
+                                                      (best_score, best))
+                batch, batch_size = [], min(2 * batch_size, self.batch_size)
+
+        if batch:
+            best_score, best = self.best_in_batch(np.array(batch), scored_poss, len(current_poss), (best_score, best))
+
+        if best is None and len(scored_poss) < len(current_poss) and not search_space.overflow:
+            # tiles which split only positions outside of the sample scored 0, so the search is repeated with all
+            # possible positions before giving up
+            self.stats.count('full_rescoring')
+            return self.best_target(SearchSpace(search_space.radius, search_space.is_passable, search_space.bounded),
+                                    current_poss, current_poss)
+
+        return best
+
+    def best_in_batch(self, batch: np.ndarray, sample: Candidates, count: int,
+                      best: Tuple[float, Optional[tuple]]) -> Tuple[float, Optional[tuple]]:
+        """
+        :param batch: (T, 4) expanded tiles [cost, row delta, column delta, direction as number] in order of cost
+        :param sample: possible current positions used for scoring
+        :param count: number of all possible current positions
+        :param best: (score, tile) of the best tile so far
+        :return: (score, tile) of the best tile so far including the batch
+        """
+        self.stats.count('tiles_scored', len(batch))
+        # view at the start tile is already known, so it is not a target
+        costs = batch[:, 0]
+        scores = np.where(costs > 0, self.expected_eliminations(batch[:, 1:3], sample) * count / len(sample), 0) / \
+            np.maximum(costs, 1)
+        index = int(np.argmax(scores))
+
+        if scores[index] > best[0]:
+            return float(scores[index]), tuple(int(value) for value in batch[index, 1:])
+        return best
+
+    def expected_eliminations(self, pos_deltas: np.ndarray, current_poss: Candidates) -> np.ndarray:
+        """
+        Partitions possible positions by signatures of their views at every delta, signatures are read in one gather.
+        If the bot is at any of N possible positions with same probability, seeing view of a part with n positions
+        eliminates N - n positions, so expected number of eliminated positions is N - sum(n^2) / N.
+        :param pos_deltas: (T, 2) deltas relative to the bot
+        :param current_poss: possible current positions
+        :return: (T, ) expected numbers of eliminated possible positions after seeing views at deltas
+        """
+        count, deltas = len(current_poss), len(pos_deltas)
+
+        # outside of the map is -1 signature, it is a part too, because such positions are eliminated as well
+        signatures = self.signature_index.get_many(current_poss.relative(pos_deltas).reshape(-1, 2),
+                                                   np.repeat(current_poss.dirs, deltas)).reshape(count, deltas)
+
+        # sizes of parts are lengths of runs of equal signatures in sorted columns
+        signatures = np.sort(signatures, axis=0)
+        starts = np.ones(signatures.shape, dtype=bool)
+        starts[1:] = signatures[1:] != signatures[:-1]
+        parts = np.cumsum(starts, axis=0) - 1 + np.arange(deltas) * count
+        sizes = np.bincount(parts.ravel(), minlength=count * deltas).reshape(deltas, count)
+
+        return count - np.sum(sizes * sizes, axis=1) / count
@@ -0,0 +1,366 @@
+"""
+Module with MatrixPlacement and PlacementIndex classes
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class MatrixPlacement:
+    """
+    Engines which find all top-left positions where matrix_to_find fits into matrix. Value -1 in matrix_to_find is
+    unknown tile and matches anything. All engines return np.ndarray with shape (N, 2) sorted by row and column.
+    Engines loop and strided compare any values, indexed engines work on PlacementIndex of matrix, so matrix must
+    consist of 0 (wall) and 1 (free) and matrix_to_find of -1, 0 and 1.
+    """
+    engines = ('loop', 'strided', 'bitpacked', 'pyramid')
+    indexed_engines = ('bitpacked', 'pyramid')
+    default_engine = 'bitpacked'
+    # maximal number of values gathered at once during verification
+    verify_chunk_size = 1 << 20
+    # gathering one tile for one window costs about as much as comparing this many windows in a whole grid pass
+    gather_cost = 32
+    # zero words after every row of packed map, enough to shift it by any column of matrix_to_find which fits the map
+    packed_slack = 2
+    # blocks of the coarsest level of pyramid engine have 2 ** pyramid_levels rows and columns
+    pyramid_levels = 4
+
+    @staticmethod
+    def loop(matrix: np.ndarray, matrix_to_find: np.ndarray) -> np.ndarray:
+        """
+        Reference engine. Compares matrix_to_find with every window of matrix one by one.
+        :param matrix: must be bigger than matrix_to_find
+        :param matrix_to_find: matrix to find locations of
+        :return: top-left positions from which values of matrix and matrix_to_find are same
+        """
+        rows_cnt, cols_cnt = matrix.shape
+        inner_rows_cnt, inner_cols_cnt = matrix_to_find.shape
+
+        matches = []
+
+        for i in range(rows_cnt - inner_rows_cnt + 1):
+            for j in range(cols_cnt - inner_cols_cnt + 1):
+                # positions where numbers differ
+                not_equal_positions = np.where(matrix_to_find != matrix[i:i + inner_rows_cnt, j:j + inner_cols_cnt])
+
+                # check if all numbers that differ are -1
+                if np.all(matrix_to_find[not_equal_positions] == -1):
+                    matches.append([i, j])
+
+        return np.array(matches, dtype=int).reshape(-1, 2)
+
+    @staticmethod
+    def strided(matrix: np.ndarray, matrix_to_find: np.ndarray) -> np.ndarray:
+        """
+        Vectorized engine. Known tiles of matrix_to_find are compared against strided window view of matrix for all
+        windows at once by check_tiles.
+        :param matrix: must be bigger than matrix_to_find
+        :param matrix_to_find: matrix to find locations of
+        :return: top-left positions from which values of matrix and matrix_to_find are same
+        """
+        inner_rows_cnt, inner_cols_cnt = matrix_to_find.shape
+        if inner_rows_cnt > matrix.shape[0] or inner_cols_cnt > matrix.shape[1]:
+            return np.empty((0, 2), dtype=int)
+
+        valid = np.ones((matrix.shape[0] - inner_rows_cnt + 1, matrix.shape[1] - inner_cols_cnt + 1), dtype=bool)
+        return MatrixPlacement.check_tiles(matrix, matrix_to_find, valid)
+
+    @staticmethod
+    def check_tiles(matrix: np.ndarray, matrix_to_find: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """
+        Checks known tiles of matrix_to_find for windows which are still valid. While many windows survive one known
+        tile is checked for whole window grid, once survivors are few remaining tiles are gathered only for surviving
+        windows.
+        :param matrix: matrix to search in
+        :param matrix_to_find: matrix to find locations of, must fit into matrix
+        :param valid: bool grid of top-left positions which are not ruled out yet, it is modified
+        :return: top-left positions from which values of matrix and matrix_to_find are same
+        """
+        rows, cols = np.nonzero(matrix_to_find != -1)
+        values = matrix_to_find[rows, cols]
+
+        # windows[i, j] is matrix[i:i + inner_rows_cnt, j:j + inner_cols_cnt] without copying
+        windows = sliding_window_view(matrix, matrix_to_find.shape)
+
+        checked = 0
+        # gathering is cheaper than another whole grid pass
+        while checked < len(values) and \
+                MatrixPlacement.gather_cost * np.count_nonzero(valid) * (len(values) - checked) > valid.size:
+            valid &= windows[:, :, rows[checked], cols[checked]] == values[checked]
+            checked += 1
+
+        matches = MatrixPlacement.positions(valid)
+        return matches[MatrixPlacement.verify(matrix, matches, rows[checked:], cols[checked:], values[checked:])]
+
+    @staticmethod
+    def bitpacked(matrix: np.ndarray, matrix_to_find: np.ndarray, index: 'PlacementIndex' = None) -> np.ndarray:
+        """
+        Bit-parallel engine over window offsets. Free tiles of matrix are packed to bitplane of 64 bit words, bit j of
+        a row is column j, so one word holds 64 neighbouring top-left columns. Every known tile (row, column) of
+        matrix_to_find shifts the bitplane by its column and ANDs its rows row:row + N (or their negation for wall) into
+        bitplane of valid windows, so one word operation checks one tile for 64 windows. Unknown tiles are skipped, so
+        no bitplane of known tiles is needed. Once survivors are few remaining tiles are gathered only for surviving
+        windows.
+        :param matrix: must be bigger than matrix_to_find, values must be 0 or 1
+        :param matrix_to_find: matrix to find locations of
+        :param index: placement index of matrix. If None it is built, which packs whole matrix.
+        :return: top-left positions from which values of matrix and matrix_to_find are same
+        """
+        windows_shape = np.asarray(matrix.shape) - matrix_to_find.shape + 1
+        if np.any(windows_shape < 1):
+            return np.empty((0, 2), dtype=int)
+
+        # bits of columns without window stay 0
+        valid = MatrixPlacement.pack(np.ones(windows_shape, dtype=bool))
+        # packed with slack words, so shifting by any column of matrix_to_find only slices the bitplane
+        free = (index or PlacementIndex(matrix)).packed
+
+        rows, cols = np.nonzero((matrix_to_find != -1).T)[::-1]
+        values = matrix_to_find[rows, cols]
+
+        checked = 0
+        while checked < len(values) and 64 * np.count_nonzero(valid) > valid.size:
+            # all known tiles of one column use the same shifted bitplane
+            column = cols[checked]
+            shifted = MatrixPlacement.shift_columns(free, column, valid.shape[1])
+            while checked < len(values) and cols[checked] == column:
+                window = shifted[rows[checked]:rows[checked] + windows_shape[0]]
+                valid &= window if values[checked] > 0 else ~window
+                checked += 1
+
+        matches = MatrixPlacement.unpack_positions(valid)
+        return matches[MatrixPlacement.verify(matrix, matches, rows[checked:], cols[checked:], values[checked:])]
+
+    @staticmethod
+    def pyramid(matrix: np.ndarray, matrix_to_find: np.ndarray, index: 'PlacementIndex' = None) -> np.ndarray:
+        """
+        Coarse-to-fine engine. Level l of pyramid holds number of free tiles of matrix in every block of 2 ** l rows and
+        columns. Fully known blocks of matrix_to_find are checked from the coarsest level, one comparison of block counts
+        rules out windows which differ anywhere in the block. Windows which survive all levels are verified tile by tile,
+        so the result is same as of the other engines.
+        :param matrix: must be bigger than matrix_to_find, values must be 0 or 1
+        :param matrix_to_find: matrix to find locations of
+        :param index: placement index of matrix. If None it is built, which builds all levels of the pyramid.
+        :return: top-left positions from which values of matrix and matrix_to_find are same
+        """
+        if np.any(np.asarray(matrix_to_find.shape) > matrix.shape):
+            return np.empty((0, 2), dtype=int)
+
+        counts = (index or PlacementIndex(matrix)).levels
+        levels = min(len(counts) - 1, int(np.log2(min(matrix_to_find.shape))))
+        blocks = MatrixPlacement.known_blocks(matrix_to_find, levels)
+        rows, cols = np.nonzero(matrix_to_find != -1)
+
+        valid = np.ones(np.asarray(matrix.shape) - matrix_to_find.shape + 1, dtype=bool)
+        for checked, (level, row, col, count) in enumerate(blocks, 1):
+            valid &= counts[level][row:row + valid.shape[0], col:col + valid.shape[1]] == count
+            # gathering is cheaper than another whole grid pass
+            if MatrixPlacement.gather_cost * np.count_nonzero(valid) * (len(blocks) - checked + len(rows)) <= valid.size:
+                break
+        else:
+            return MatrixPlacement.check_tiles(matrix, matrix_to_find, valid)
+
+        matches = MatrixPlacement.verify_blocks(counts, MatrixPlacement.positions(valid), blocks[checked:])
+        return matches[MatrixPlacement.verify(matrix, matches, rows, cols, matrix_to_find[rows, cols])]
+
+    @staticmethod
+    def verify_blocks(counts: list, offsets: np.ndarray, blocks: np.ndarray) -> np.ndarray:
+        """
+        Checks blocks for given top-left offsets only, one gather for every level.
+        :param counts: levels from block_counts
+        :param offsets: (N, 2) top-left positions to verify
+        :param blocks: blocks from known_blocks
+        :return: offsets for which all blocks match
+        """
+        for level in np.unique(blocks[:, 0])[::-1]:
+            of_level = blocks[blocks[:, 0] == level]
+            rows, cols, values = of_level[:, 1:].T
+            offsets = offsets[MatrixPlacement.verify(counts[level], offsets, rows, cols, values)]
+
+        return offsets
+
+    @staticmethod
+    def block_counts(plane: np.ndarray, levels: int) -> list:
+        """
+        :param plane: 2D bool array
+        :param levels: number of levels above the plane
+        :return: levels + 1 arrays, element (row, column) of array l is number of True values of block of plane with
+        top-left corner (row, column) and 2 ** l rows and columns
+        """
+        counts = [plane.astype(np.uint16)]
+        for level in range(1, levels + 1):
+            half = 1 << (level - 1)
+            previous = counts[-1]
+            counts.append(previous[:-half, :-half] + previous[half:, :-half] + previous[:-half, half:] +
+                          previous[half:, half:])
+
+        return counts
+
+    @staticmethod
+    def known_blocks(matrix_to_find: np.ndarray, levels: int) -> np.ndarray:
+        """
+        :param matrix_to_find: matrix with -1 for unknown tiles
+        :param levels: coarsest level of blocks
+        :return: (N, 4) blocks [level, row, column, number of free tiles] of matrix_to_find without unknown tiles, block
+        of level l has 2 ** l rows and columns and its corner is multiple of them. Blocks are ordered from the coarsest
+        level and in one level mixed blocks are first, as blocks of only walls or only free tiles are common in maps.
+        """
+        blocks = [np.empty((0, 4), dtype=int)]
+        for level in range(levels, 0, -1):
+            size = 1 << level
+            rows_cnt, cols_cnt = (np.asarray(matrix_to_find.shape) // size) * size
+            tiles = matrix_to_find[:rows_cnt, :cols_cnt].reshape(rows_cnt // size, size, cols_cnt // size, size)
+
+            block_rows, block_cols = np.nonzero(np.all(tiles != -1, axis=(1, 3)))
+            counts = np.count_nonzero(tiles > 0, axis=(1, 3))[block_rows, block_cols]
+            order = np.argsort(-np.minimum(counts, size * size - counts), kind='stable')
+            blocks.append(np.column_stack((np.full(len(counts), level), block_rows * size, block_cols * size,
+                                           counts))[order])
+
+        return np.concatenate(blocks)
+
+    @staticmethod
+    def pack(plane: np.ndarray, slack: int = 0) -> np.ndarray:
+        """
+        :param plane: 2D bool array
+        :param slack: number of zero words added after every row
+        :return: (rows, words) array of 64 bit words, bit j of word k of a row is column 64 * k + j of the plane
+        """
+        packed = np.packbits(plane, axis=1, bitorder='little')
+        words = np.zeros((plane.shape[0], 8 * (-(-packed.shape[1] // 8) + slack)), dtype=np.uint8)
+        words[:, :packed.shape[1]] = packed
+        return words.view('<u8')
+
+    @staticmethod
+    def positions(valid: np.ndarray) -> np.ndarray:
+        """
+        Same as np.argwhere, which walks whole grid once more for every axis, so it is slow for large grids even with few
+        True values.
+        :param valid: 2D bool array
+        :return: (N, 2) positions [row, column] of True values sorted by row and column
+        """
+        return np.column_stack(np.divmod(np.flatnonzero(valid), valid.shape[1]))
+
+    @staticmethod
+    def unpack_positions(packed: np.ndarray) -> np.ndarray:
+        """
+        :param packed: bitplane from pack
+        :return: (N, 2) positions [row, column] of set bits sorted by row and column, only nonzero words are unpacked
+        """
+        word_rows, word_cols = np.nonzero(packed)
+        bits = np.unpackbits(packed[word_rows, word_cols].view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+        words, positions = np.nonzero(bits)
+        return np.column_stack((word_rows[words], 64 * word_cols[words] + positions))
+
+    @staticmethod
+    def shift_columns(packed: np.ndarray, shift: int, words: int) -> np.ndarray:
+        """
+        :param packed: bitplane from pack with at least shift // 64 + words + 1 words in every row
+        :param shift: number of columns to shift by
+        :param words: number of words of every row of the result
+        :return: (rows, words) bitplane whose column j is column j + shift of packed
+        """
+        word_shift, bit_shift = divmod(int(shift), 64)
+        shifted = packed[:, word_shift:word_shift + words] >> np.uint64(bit_shift)
+        if bit_shift:
+            shifted |= packed[:, word_shift + 1:word_shift + words + 1] << np.uint64(64 - bit_shift)
+        return shifted
+
+    @staticmethod
+    def verify(matrix: np.ndarray, offsets: np.ndarray, rows: np.ndarray, cols: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        Checks known tiles for given top-left offsets only.
+        :param matrix: matrix to search in
+        :param offsets: (N, 2) top-left positions to verify
+        :param rows: rows of known tiles relative to top-left position
+        :param cols: columns of known tiles relative to top-left position
+        :param values: values of known tiles
+        :return: bool mask of offsets for which all known tiles match
+        """
+        mask = np.ones(len(offsets), dtype=bool)
+        if len(values) == 0 or len(offsets) == 0:
+            return mask
+
+        step = max(MatrixPlacement.verify_chunk_size // len(values), 1)
+        for start in range(0, len(offsets), step):
+            chunk = offsets[start:start + step]
+            gathered = matrix[chunk[:, :1] + rows, chunk[:, 1:] + cols]
+            mask[start:start + step] = np.all(gathered == values, axis=1)
+
+        return mask
+
+    @staticmethod
+    def find(matrix: np.ndarray, matrix_to_find: np.ndarray, engine: str = None,
+             index: 'PlacementIndex' = None) -> np.ndarray:
+        """
+        :param matrix: must be bigger than matrix_to_find
+        :param matrix_to_find: matrix to find locations of
+        :param engine: name of engine from MatrixPlacement.engines. If None default engine is used.
+        :param index: placement index of matrix used by indexed engines. If None indexed engines build it.
+        :return: (N, 2) top-left positions from which values of matrix and matrix_to_find are same
+        :raises ValueError: if the engine is unknown or values are not valid for indexed engine
+        """
+        engine = engine or MatrixPlacement.default_engine
+
+        if engine not in MatrixPlacement.engines:
+            raise ValueError(f'Unknown placement engine: {engine}')
+
+        if engine in MatrixPlacement.indexed_engines:
+            if np.any((matrix_to_find != -1) & (matrix_to_find != 0) & (matrix_to_find != 1)):
+                raise ValueError(f'Placement engine {engine} needs matrix to find of -1, 0 and 1 values')
+            return getattr(MatrixPlacement, engine)(matrix, matrix_to_find, index)
+
+        return getattr(MatrixPlacement, engine)(matrix, matrix_to_find)
+
+
+class PlacementIndex:
+    """
+    Structures of environment map used by indexed placement engines, built on first use, so they are built once per
+    map instead of on every search: free tiles packed to bitplane of 64 bit words for bitpacked engine and levels of
+    block counts for pyramid engine.
+    """
+
+    def __init__(self, environment_map: np.ndarray, packed: np.ndarray = None, levels: list = None):
+        """
+        :param environment_map: map of the environment, values must be 0 (wall) or 1 (free)
+        :param packed: bitplane computed earlier by PlacementIndex.packed, e.g. attached from MapStore
+        :param levels: levels computed earlier by MatrixPlacement.block_counts, e.g. attached from MapStore
+        """
+        self.environment_map = environment_map
+        self._packed = packed
+        self._levels = levels
+
+    @property
+    def packed(self) -> np.ndarray:
+        """
+        :return: free tiles of the map packed by MatrixPlacement.pack with MatrixPlacement.packed_slack zero words
+        """
+        if self._packed is None:
+            self._packed = MatrixPlacement.pack(self.free_tiles(), MatrixPlacement.packed_slack)
+        return self._packed
+
+    @property
+    def levels(self) -> list:
+        """
+        :return: MatrixPlacement.pyramid_levels + 1 levels of block counts of free tiles of the map
+        """
+        if self._levels is None:
+            self._levels = MatrixPlacement.block_counts(self.free_tiles(), MatrixPlacement.pyramid_levels)
+        return self._levels
+
+    def build(self) -> 'PlacementIndex':
+        """
+        Builds all structures now instead of on first use, e.g. before the index is shared by forks of an algorithm.
+        :return: this index
+        """
+        self._packed = self.packed
+        self._levels = self.levels
+        return self
+
+    def free_tiles(self) -> np.ndarray:
+        """
+        :return: bool array of free tiles of the map
+        :raises ValueError: if the map has other values than 0 and 1
+        """
+        if np.any((self.environment_map != 0) & (self.environment_map != 1)):
+            raise ValueError('Indexed placement engines need map of 0 (wall) and 1 (free) values')
+        return self.environment_map > 0
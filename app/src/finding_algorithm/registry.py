@@ -0,0 +1,50 @@
+"""
+Module with AlgorithmRegistry class
+"""
+from typing import List, Type
+
+import numpy as np
+
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.distributed_greedy_bfs import DistributedGreedyBFS
+from app.src.finding_algorithm.information_gain import InformationGainPlanner
+
+
+class AlgorithmRegistry:
+    """
+    Finding algorithms available by name. Name of algorithm is the name it passes to FindingAlgorithm constructor.
+    """
+    algorithms = {
+        'DistributedGreedyBFS': DistributedGreedyBFS,
+        'InformationGainPlanner': InformationGainPlanner,
+    }
+    default = 'DistributedGreedyBFS'
+
+    @staticmethod
+    def names() -> List[str]:
+        """
+        :return: names of registered algorithms, default first
+        """
+        return sorted(AlgorithmRegistry.algorithms, key=lambda name: (name != AlgorithmRegistry.default, name))
+
+    @staticmethod
+    def register(name: str, algorithm: Type[FindingAlgorithm]) -> None:
+        """
+        :param name: name of the algorithm
+        :param algorithm: class of the algorithm, constructed with environment map as the only required argument
+        """
+        AlgorithmRegistry.algorithms[name] = algorithm
+
+    @staticmethod
+    def create(environment_map: np.ndarray, name: str = None, **kwargs) -> FindingAlgorithm:
+        """
+        :param environment_map: map of the environment
+        :param name: name of registered algorithm. If None default algorithm is used.
+        :param kwargs: passed to constructor of the algorithm
+        :return: new instance of the algorithm
+        """
+        name = name or AlgorithmRegistry.default
+        if name not in AlgorithmRegistry.algorithms:
+            raise ValueError(f'Unknown finding algorithm {name}, available: {", ".join(AlgorithmRegistry.names())}')
+
+        return AlgorithmRegistry.algorithms[name](environment_map, **kwargs)
@@ -0,0 +1,139 @@
+"""
+Module with SearchSpace class
+"""
+import heapq
+from typing import Callable, Iterator, List, Tuple
+
+import numpy as np
+
+from app.src.direction_codec import DirectionCodec
+
+
+class SearchSpace:
+    """
+    Dijkstra search over states (row delta, column delta, direction) relative to the bot. Moving to neighbouring tile
+    costs 1 and every rotation needed before the move costs 1. States are encoded as integers and heap keys encode
+    cost, state and direction of previous state into one integer. Visited states are stored in flat preallocated byte
+    array covering box of deltas in given radius around the bot, moves from every direction are looked up in table
+    built once, so expansion does only integer operations.
+    """
+    turn_costs = (0, 1, 2, 1)
+    no_prev_dir = 4
+    not_visited = 255
+
+    def __init__(self, radius: int, is_passable: Callable[[int, int], bool], bounded: bool = False):
+        """
+        :param radius: radius of box of deltas covered by the search
+        :param is_passable: returns True if tile at (row delta, column delta) can be entered
+        :param bounded: True if no tile outside of the box is passable. Otherwise, search stops with overflow when it
+        reaches edge of the box.
+        """
+        self.radius = radius
+        self.is_passable = is_passable
+        self.bounded = bounded
+        self.overflow = False
+
+        # direction of previous state, no_prev_dir for the start state and not_visited for not visited states
+        self.prev_dirs = bytearray([self.not_visited]) * (self.side * self.side * 4)
+        # 0 - not checked yet, 1 - passable, 2 - not passable, 3 - passable and already yielded by expand
+        self.cells = bytearray(self.side * self.side)
+        # moves_table[d] are (row offset, column offset, state offset, cost) of moves from state with direction d
+        self.moves_table = tuple(
+            tuple((int(row), int(col), (int(row) * self.side + int(col)) * 4 + neighbour_dir - direction,
+                   1 + self.turn_costs[(neighbour_dir - direction) % 4])
+                  for neighbour_dir, (row, col) in enumerate(DirectionCodec.offsets))
+            for direction in range(4))
+
+    @property
+    def side(self) -> int:
+        """
+        :return: number of rows and columns of the box
+        """
+        return 2 * self.radius + 1
+
+    def encode(self, row: int, col: int, direction: int) -> int:
+        """
+        :return: state of given delta and direction as number
+        """
+        return ((row + self.radius) * self.side + col + self.radius) * 4 + direction
+
+    def decode(self, state: int) -> Tuple[int, int, int]:
+        """
+        :return: (row delta, column delta, direction as number) of given state
+        """
+        cell, direction = divmod(state, 4)
+        row, col = divmod(cell, self.side)
+        return row - self.radius, col - self.radius, direction
+
+    def expand(self, start_dir: int = 0) -> Iterator[Tuple[int, int, int, int]]:
+        """
+        Expands states in order of their cost. Every tile is yielded only when it is reached for the first time.
+        :param start_dir: direction of the bot as number
+        :return: generator of (cost, row delta, column delta, direction as number)
+        """
+        heap = [self.encode(0, 0, start_dir) * 5 + self.no_prev_dir]
+        key_base = len(self.prev_dirs) * 5
+        prev_dirs, cells = self.prev_dirs, self.cells
+
+        while heap:
+            cost, rest = divmod(heapq.heappop(heap), key_base)
+            state, prev_dir = divmod(rest, 5)
+
+            if prev_dirs[state] != self.not_visited:
+                continue
+            prev_dirs[state] = prev_dir
+
+            row, col, direction = self.decode(state)
+            if cells[state >> 2] != 3:
+                cells[state >> 2] = 3
+                yield cost, row, col, direction
+
+            if not self.push_neighbours(heap, cost, state, row, col):
+                self.overflow = True
+                return
+
+    def push_neighbours(self, heap: List[int], cost: int, state: int, row: int, col: int) -> bool:
+        """
+        Pushes not visited passable neighbours of the state to the heap.
+        :return: False if the search reached edge of not bounded box
+        """
+        direction = state & 3
+        for row_offset, col_offset, state_offset, move_cost in self.moves_table[direction]:
+            neighbour_row, neighbour_col = row + row_offset, col + col_offset
+
+            if not (-self.radius <= neighbour_row <= self.radius and -self.radius <= neighbour_col <= self.radius):
+                if not self.bounded:
+                    return False
+                continue
+
+            neighbour_state = state + state_offset
+            if self.prev_dirs[neighbour_state] == self.not_visited and \
+                    self.passable(neighbour_state >> 2, neighbour_row, neighbour_col):
+                heapq.heappush(heap, ((cost + move_cost) * len(self.prev_dirs) + neighbour_state) * 5 + direction)
+
+        return True
+
+    def passable(self, cell: int, row: int, col: int) -> bool:
+        """
+        :return: True if tile can be entered, uses cached result if tile was already checked
+        """
+        if self.cells[cell] == 0:
+            self.cells[cell] = 1 if self.is_passable(row, col) else 2
+
+        return self.cells[cell] != 2
+
+    def moves(self, row: int, col: int, direction: int) -> List[np.ndarray]:
+        """
+        :return: directions of moves leading from the start to visited state
+        """
+        moves = []
+        prev_dir = self.prev_dirs[self.encode(row, col, direction)]
+
+        while prev_dir != self.no_prev_dir:
+            moves.append(DirectionCodec.offsets[direction])
+            row, col = row - DirectionCodec.offsets[direction][0], col - DirectionCodec.offsets[direction][1]
+            direction = int(prev_dir)
+            prev_dir = self.prev_dirs[self.encode(row, col, direction)]
+
+        moves.reverse()
+        return moves
@@ -0,0 +1,99 @@
+"""
+Module with SignatureIndex class
+"""
+import numpy as np
+
+
+class SignatureIndex:
+    """
+    Precomputed signatures of 3x3 views of the environment map. View of tile (row, column) seen in direction d is
+    np.rot90(environment_map[row - 1:row + 2, column - 1:column + 2], k=-d).ravel(). Signature of the view has bit i set
+    if i-th tile of the view is free and bit 9 + i set if i-th tile of the view is inside the map.
+    """
+    view_size = 9
+    # order[d][i] is index of tile in not rotated 3x3 view which is i-th tile of view rotated to direction d
+    order = [np.rot90(np.arange(9).reshape(3, 3), k=-d).ravel() for d in range(4)]
+
+    def __init__(self, environment_map: np.ndarray, signatures: np.ndarray = None, entries: np.ndarray = None):
+        """
+        :param environment_map: map of the environment
+        :param signatures: signatures computed earlier by compute_signatures, e.g. attached from MapStore
+        :param entries: entries computed earlier by compute_entries from the signatures
+        """
+        self.signatures = self.compute_signatures(environment_map) if signatures is None else signatures
+        # entries of free tiles [row, column, direction] sorted by signature, direction, row and column
+        self.entries = self.compute_entries(environment_map, self.signatures) if entries is None else entries
+
+        keys = self.signatures[self.entries[:, 2], self.entries[:, 0], self.entries[:, 1]]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        ends = np.append(starts[1:], len(keys))
+        self.ranges = {int(key): (start, end) for key, start, end in zip(keys[starts], starts, ends)}
+
+    @staticmethod
+    def compute_entries(environment_map: np.ndarray, signatures: np.ndarray) -> np.ndarray:
+        """
+        :param environment_map: map of the environment
+        :param signatures: signatures of the map
+        :return: (N, 3) entries [row, column, direction] of free tiles sorted by signature, direction, row and column
+        """
+        rows, cols = np.nonzero(environment_map > 0)
+        keys = signatures[:, rows, cols].ravel()
+        order = np.argsort(keys, kind='stable')
+        return np.column_stack((np.tile(rows, 4), np.tile(cols, 4),
+                                np.repeat(np.arange(4), len(rows))))[order].astype(np.int32)
+
+    @staticmethod
+    def compute_signatures(environment_map: np.ndarray) -> np.ndarray:
+        """
+        :param environment_map: map of the environment
+        :return: (4, rows, columns) signatures of views from every tile in every direction
+        """
+        rows_cnt, cols_cnt = environment_map.shape
+        free = np.pad(environment_map > 0, 1).astype(np.int32)
+        inside = np.pad(np.ones(environment_map.shape, dtype=np.int32), 1)
+
+        signatures = np.zeros((4, rows_cnt, cols_cnt), dtype=np.int32)
+        for d in range(4):
+            for i, tile in enumerate(SignatureIndex.order[d]):
+                window = (slice(tile // 3, tile // 3 + rows_cnt), slice(tile % 3, tile % 3 + cols_cnt))
+                signatures[d] |= (free[window] << i) | (inside[window] << (SignatureIndex.view_size + i))
+
+        return signatures
+
+    @staticmethod
+    def encode(view: np.ndarray) -> int:
+        """
+        :param view: 3x3 view of environment already rotated to direction of view. All tiles must be known.
+        :return: signature of the view
+        """
+        free = np.asarray(view).ravel() > 0
+        return int(np.sum(free.astype(np.int64) << np.arange(SignatureIndex.view_size))) | (
+                (1 << SignatureIndex.view_size) - 1) << SignatureIndex.view_size
+
+    def get(self, pos: np.ndarray, direction: int) -> int:
+        """
+        :param pos: tile of environment map
+        :param direction: direction of the view as number
+        :return: signature of the view from the tile
+        """
+        return int(self.signatures[direction % 4, pos[0], pos[1]])
+
+    def get_many(self, positions: np.ndarray, directions: np.ndarray) -> np.ndarray:
+        """
+        Reads signatures of many views in one gather.
+        :param positions: (N, 2) tiles, may be outside the map
+        :param directions: (N, ) directions of views as numbers
+        :return: (N, ) signatures of the views, -1 for positions outside the map
+        """
+        shape = np.asarray(self.signatures.shape[1:])
+        inside = np.all((positions >= 0) & (positions < shape), axis=1)
+        clipped = np.clip(positions, 0, shape - 1)
+        return np.where(inside, self.signatures[np.asarray(directions) % 4, clipped[:, 0], clipped[:, 1]], -1)
+
+    def lookup(self, signature: int) -> np.ndarray:
+        """
+        :param signature: signature of a view
+        :return: (N, 3) array [row, column, direction] of free tiles and directions with given view
+        """
+        start, end = self.ranges.get(signature, (0, 0))
+        return self.entries[start:end]
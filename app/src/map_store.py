@@ -0,0 +1,112 @@
+"""
+Module with MapStore class
+"""
+import os
+import shutil
+import tempfile
+from typing import Dict
+
+import numpy as np
+
+from app.src.finding_algorithm.ambiguity_index import AmbiguityIndex
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.placement import MatrixPlacement, PlacementIndex
+from app.src.finding_algorithm.registry import AlgorithmRegistry
+from app.src.finding_algorithm.signature_index import SignatureIndex
+
+
+class MapStore:
+    """
+    Environment map and its precomputed structures (signatures, signature entries, ambiguity classes, packed free tiles
+    and levels of block counts for placement) saved once as .npy files and memory-mapped read-only by every process
+    attached to the store. Worker processes then share one copy of the arrays in page cache instead of loading the map
+    and building the structures each.
+    """
+    # directory of files in memory, if the system has one
+    shared_memory_dir = '/dev/shm'
+    names = ('map', 'signatures', 'entries', 'classes', 'packed') + tuple(
+        f'level_{level}' for level in range(MatrixPlacement.pyramid_levels + 1))
+
+    def __init__(self, directory: str, owner: bool = False):
+        """
+        Attaches to store published to the directory.
+        :param directory: directory of the store
+        :param owner: if True the directory is removed by close
+        """
+        self.directory = directory
+        self.owner = owner
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name in self.names:
+            file_name = os.path.join(directory, f'{name}.npy')
+            if os.path.exists(file_name):
+                self.arrays[name] = np.load(file_name, mmap_mode='r')
+
+    @staticmethod
+    def publish(environment_map: np.ndarray, directory: str = None) -> 'MapStore':
+        """
+        Builds precomputed structures of the map and saves them with the map. For large maps this takes seconds (about
+        10 s for 332.txt), so the store is meant to be published once and attached by many processes.
+        :param environment_map: map of the environment
+        :param directory: directory of the store. If None temporary directory is created and removed by close.
+        :return: store attached to the published directory
+        """
+        owner = directory is None
+        if owner:
+            directory = tempfile.mkdtemp(
+                prefix='map_store_', dir=MapStore.shared_memory_dir if os.path.isdir(MapStore.shared_memory_dir) else None)
+
+        try:
+            signature_index = SignatureIndex(environment_map)
+            placement_index = PlacementIndex(environment_map)
+            # publishing is done once, so ambiguity classes are built even for maps over
+            # FindingAlgorithm.ambiguity_max_poses
+            arrays = {'map': environment_map, 'signatures': signature_index.signatures,
+                      'entries': signature_index.entries,
+                      'classes': AmbiguityIndex.compute_classes(environment_map, signature_index),
+                      'packed': placement_index.packed}
+            arrays.update((f'level_{level}', counts) for level, counts in enumerate(placement_index.levels))
+
+            for name, array in arrays.items():
+                np.save(os.path.join(directory, f'{name}.npy'), np.ascontiguousarray(array))
+        except BaseException:
+            # partially written store in shared memory would never be removed
+            if owner:
+                shutil.rmtree(directory, ignore_errors=True)
+            raise
+
+        return MapStore(directory, owner)
+
+    @property
+    def map(self) -> np.ndarray:
+        """
+        :return: read-only map of the environment
+        """
+        return self.arrays['map']
+
+    def create_algorithm(self, name: str = None, **kwargs) -> FindingAlgorithm:
+        """
+        :param name: name of registered finding algorithm. If None default algorithm is used.
+        :param kwargs: passed to constructor of the algorithm
+        :return: finding algorithm using structures of the store instead of building its own
+        """
+        finding_algorithm = AlgorithmRegistry.create(self.map, name, **kwargs)
+        finding_algorithm.signature_index = SignatureIndex(self.map, self.arrays['signatures'], self.arrays['entries'])
+        levels = [self.arrays[name] for name in self.names if name.startswith('level_') and name in self.arrays]
+        finding_algorithm.placement_index = PlacementIndex(self.map, self.arrays.get('packed'), levels or None)
+        if 'classes' in self.arrays:
+            finding_algorithm.ambiguity_index = AmbiguityIndex(self.map, finding_algorithm.signature_index,
+                                                               self.arrays['classes'])
+
+        return finding_algorithm
+
+    def close(self) -> None:
+        """Forgets the arrays, the owner also removes the directory. Processes which attached the store keep it."""
+        self.arrays = {}
+        if self.owner:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> 'MapStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,133 @@
+"""
+Module with observers of Bot.find_itself
+"""
+import json
+import time
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from app.src.bot import Bot
+
+
+@dataclass
+class StepEvent:
+    """
+    Step of the search. Observers get the bot itself, so anything expensive is computed only if observer needs it.
+    Observers must not modify the bot or the path.
+    """
+    bot: 'Bot'
+    # action done in this step, None for the state before first step
+    action: Optional[str]
+    # remaining planned actions
+    path: List[str]
+
+    @property
+    def steps(self) -> int:
+        """Number of steps done so far"""
+        return self.bot.finding_algorithm.steps
+
+    @property
+    def relative_pos(self) -> np.ndarray:
+        """Position of the bot relative to its starting position"""
+        return self.bot.relative_pos
+
+    @property
+    def relative_dir(self) -> np.ndarray:
+        """Direction of the bot relative to its starting direction"""
+        return self.bot.relative_dir
+
+
+class BotObserver:
+    """
+    Base class for observers of Bot.find_itself. Default implementation ignores all events.
+    """
+
+    def on_step(self, event: StepEvent) -> None:
+        """
+        Called after the first path is calculated and after every step.
+        :param event: state of the search
+        """
+
+    def on_finish(self, event: StepEvent) -> None:
+        """
+        Called when the search is finished.
+        :param event: final state of the search
+        """
+
+
+class TerminalObserver(BotObserver):
+    """
+    Prints map, bot stats and result of the search to the terminal.
+    """
+    # stats of every step show only this many possible current positions, the rest is only counted
+    shown_positions = 10
+
+    def __init__(self, print_map: bool = True, wait_time: float = 0, redraw: bool = False):
+        """
+        :param print_map: If True prints map. For large maps recommended using False.
+        :param wait_time: Time to wait between individual steps. Used for better readability.
+        :param redraw: If True map stays at the top of the screen and only its changed tiles are printed every step
+        """
+        self.print_map = print_map
+        self.wait_time = wait_time
+        self.redraw = redraw
+
+    def on_step(self, event: StepEvent) -> None:
+        bot = event.bot
+        current_poss = bot.finding_algorithm.possible_current_poss(bot.relative_pos, bot.relative_dir)
+        if self.print_map:
+            bot.environment.print_map(current_poss, self.redraw)
+        bot.environment.print_bot_stats(event.path, event.steps, current_poss.to_str(self.shown_positions),
+                                        bot.get_discovered_tiles_count())
+        time.sleep(self.wait_time)
+
+    def on_finish(self, event: StepEvent) -> None:
+        bot = event.bot
+        if self.print_map and self.redraw:
+            bot.environment.print_map(bot.finding_algorithm.possible_current_poss(bot.relative_pos, bot.relative_dir),
+                                      True)
+            bot.print_search_result(False)
+        else:
+            bot.print_search_result(self.print_map)
+
+
+class TraceObserver(BotObserver):
+    """
+    Writes every step of the search as one line of JSON (JSON Lines). Counters and times are cumulative since the start
+    of the search, so cost of a step is difference of two consecutive lines.
+    """
+
+    def __init__(self, file: IO[str]):
+        """
+        :param file: text file opened for writing, it is not closed by the observer
+        """
+        self.file = file
+
+    def on_step(self, event: StepEvent) -> None:
+        self.write(event, False)
+
+    def on_finish(self, event: StepEvent) -> None:
+        self.write(event, True)
+
+    def write(self, event: StepEvent, finished: bool) -> None:
+        """
+        :param event: state of the search
+        :param finished: If True the line describes the end of the search
+        """
+        finding_algorithm = event.bot.finding_algorithm
+        stats = finding_algorithm.stats
+        self.file.write(json.dumps({
+            'algorithm': finding_algorithm.name,
+            'step': event.steps,
+            'action': event.action,
+            'relative_pos': [int(value) for value in event.relative_pos],
+            'relative_dir': [int(value) for value in event.relative_dir],
+            'path_length': len(event.path),
+            'candidates': len(finding_algorithm.possible_starting_poss),
+            'finished': finished,
+            'counters': stats.counters,
+            'times': stats.times,
+        }) + '\n')
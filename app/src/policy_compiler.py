@@ -0,0 +1,43 @@
+"""
+Module with PolicyCompiler class
+"""
+from typing import List
+
+import numpy as np
+
+from app.src.bot import Bot
+from app.src.environment import Environment
+from app.src.evaluation import Evaluation, worker_context
+from app.src.finding_algorithm.compiled_policy import PolicyTree
+from app.src.session import SessionRecord, SessionRecorder
+from app.src.utils import Utils
+
+
+class PolicyCompiler(Evaluation):
+    """
+    Compiles finding algorithm of a map to PolicyTree. The finding algorithm is run from every start pose in worker
+    processes same as in evaluation and recorded searches are merged to one decision tree.
+    """
+
+    def compile(self) -> PolicyTree:
+        """
+        :return: decision tree of the finding algorithm for all start poses
+        """
+        chunks = self.map_chunks(self.record_chunk, self.poses())
+        return PolicyTree.build([record for chunk in chunks for record in chunk])
+
+    @staticmethod
+    def record_chunk(poses: np.ndarray) -> List[SessionRecord]:
+        """
+        :param poses: (N, 3) start poses [row, column, direction as number]
+        :return: recorded searches from the start poses
+        """
+        records = []
+        for pose in poses:
+            environment = Environment(worker_context['map'], pose[:2], Utils.number_to_dir(pose[2]))
+            recorder = SessionRecorder()
+            Bot(environment, worker_context['sight_range'], worker_context['finding_algorithm']).find_itself(
+                headless=True, observers=[recorder])
+            records.append(recorder.record)
+
+        return records
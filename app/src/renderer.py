@@ -0,0 +1,217 @@
+"""
+Module with MapRenderer class
+"""
+import shutil
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from app.src.utils import Utils
+
+
+class MapRenderer:
+    """
+    Renders environment map to terminal. Every tile of the map is encoded once as index of its glyph, every frame only
+    picks colored glyphs from small palette by the indices and boolean mask of highlighted tiles, adds the bot and is
+    returned as one string. In redraw mode only tiles changed since previous frame are written using ANSI cursor
+    positioning. With viewport only window around the bot is rendered and optional minimap shows the whole map
+    downsampled, so cost of a frame does not depend on size of the map.
+    """
+    cursor_home = '\033[H'
+    clear_screen = '\033[2J'
+    clear_below = '\033[J'
+    # glyph index of free tile, indices 0 - 15 are walls by their neighbouring walls
+    free = 16
+    # minimap glyphs by share of walls in the block
+    shades = (' ', '░', '▒', '▓', '█')
+
+    def __init__(self, environment_map: np.ndarray, viewport: Optional[Tuple[int, int]] = None,
+                 minimap: Optional[int] = None):
+        """
+        :param environment_map: map to render, 0 is wall
+        :param viewport: (rows, columns) of window around the bot to render. If None whole map is rendered.
+        :param minimap: maximal number of rows and columns of minimap. If None minimap is not rendered.
+        """
+        self.shape = environment_map.shape
+
+        walls = environment_map == 0
+        self.glyphs = np.where(walls, self.wall_masks(walls), self.free).astype(np.uint8)
+
+        palette = list(Utils.walls.values()) + [' ']
+        self.palette = np.array([[self.colored(glyph), self.colored(glyph, bg_color='yellow')] for glyph in palette],
+                                dtype=object)
+
+        self.viewport = None if viewport is None else np.minimum(viewport, self.shape)
+        self.minimap_scale, self.minimap = None, None
+        if minimap is not None:
+            self.minimap_scale, self.minimap = self.downsample(walls, minimap)
+
+        # tiles of previously rendered frame in redraw mode, None if nothing is on the screen yet
+        self.previous = None
+
+    @staticmethod
+    def wall_masks(walls: np.ndarray) -> np.ndarray:
+        """
+        :param walls: bool mask of walls
+        :return: sum of powers of two for neighbouring walls of every tile (up - 2^0, down - 2^1, left - 2^2, right - 2^3)
+        """
+        padded = np.pad(walls, 1)
+        return (padded[:-2, 1:-1] * 1 + padded[2:, 1:-1] * 2 + padded[1:-1, :-2] * 4 + padded[1:-1, 2:] * 8).astype(int)
+
+    @staticmethod
+    def downsample(walls: np.ndarray, size: int) -> Tuple[int, np.ndarray]:
+        """
+        :param walls: bool mask of walls
+        :param size: maximal number of rows and columns of the result
+        :return: (number of tiles in side of one block, 2D array of shade indices of blocks)
+        """
+        scale = max(1, -(-max(walls.shape) // max(1, size)))
+        rows, cols = -(-walls.shape[0] // scale), -(-walls.shape[1] // scale)
+
+        # tiles outside of the map are counted as walls
+        padded = np.pad(walls, ((0, rows * scale - walls.shape[0]), (0, cols * scale - walls.shape[1])),
+                        constant_values=True)
+        share = padded.reshape((rows, scale, cols, scale)).mean(axis=(1, 3))
+        return scale, np.rint(share * (len(MapRenderer.shades) - 1)).astype(int)
+
+    @staticmethod
+    def terminal_viewport(reserved_rows: int = 12) -> Tuple[int, int]:
+        """
+        :param reserved_rows: rows of the terminal left for legend and bot stats
+        :return: (rows, columns) of viewport filling the terminal
+        """
+        columns, rows = shutil.get_terminal_size()
+        return max(1, rows - reserved_rows), max(1, columns)
+
+    @staticmethod
+    def colored(string: str, fg_color: str = None, bg_color: str = None) -> str:
+        """
+        :return: string with specified fg and bg color same as printed by Utils.print_colored
+        """
+        fg_color_num = 30 + Utils.color_name_to_num(fg_color) if fg_color is not None else 0
+        bg_color_num = 40 + Utils.color_name_to_num(bg_color) if bg_color is not None else 0
+
+        return f'\033[{fg_color_num};{bg_color_num}m{string}\033[0m'
+
+    @staticmethod
+    def positions(possible_current_poss: Iterable[tuple]) -> np.ndarray:
+        """
+        :param possible_current_poss: Candidates or list of (pos, dir as number)
+        :return: (N, 2) positions
+        """
+        positions = getattr(possible_current_poss, 'positions', None)
+        if positions is None:
+            positions = np.array([pos for pos, _ in possible_current_poss], dtype=int).reshape(-1, 2)
+        return positions
+
+    def highlight_mask(self, possible_current_poss: Iterable[tuple], top_left: np.ndarray = (0, 0),
+                       shape: Tuple[int, int] = None) -> np.ndarray:
+        """
+        :param possible_current_poss: Candidates or list of (pos, dir as number)
+        :param top_left: top-left corner of the window
+        :param shape: shape of the window, whole map if None
+        :return: bool mask of tiles in the window with at least one possible position
+        """
+        shape = self.shape if shape is None else shape
+        positions = self.positions(possible_current_poss) - np.asarray(top_left)
+
+        positions = positions[np.all((positions >= 0) & (positions < shape), axis=1)]
+        mask = np.zeros(shape, dtype=bool)
+        mask[positions[:, 0], positions[:, 1]] = True
+        return mask
+
+    def window(self, bot_pos: np.ndarray) -> np.ndarray:
+        """
+        :param bot_pos: position of the bot
+        :return: top-left corner of rendered window, the bot is in its center unless the window reaches edge of the map
+        """
+        if self.viewport is None:
+            return np.zeros(2, dtype=int)
+
+        return np.clip(np.asarray(bot_pos) - self.viewport // 2, 0, np.asarray(self.shape) - self.viewport)
+
+    def frame_tiles(self, bot_pos: np.ndarray, bot_dir: np.ndarray, possible_current_poss: Iterable[tuple]) -> np.ndarray:
+        """
+        :return: 2D array of colored tiles of the frame
+        """
+        top_left = self.window(bot_pos)
+        shape = self.shape if self.viewport is None else tuple(self.viewport)
+
+        mask = self.highlight_mask(possible_current_poss, top_left, shape)
+        tiles = self.palette[self.glyphs[top_left[0]:top_left[0] + shape[0], top_left[1]:top_left[1] + shape[1]],
+                             mask.astype(int)]
+
+        bot = np.asarray(bot_pos) - top_left
+        tiles[bot[0], bot[1]] = self.colored(Utils.dir_to_unicode_arrow(bot_dir), fg_color='black',
+                                             bg_color='yellow' if mask[bot[0], bot[1]] else None)
+        return tiles
+
+    def minimap_lines(self, bot_pos: np.ndarray, bot_dir: np.ndarray, possible_current_poss: Iterable[tuple]) -> list:
+        """
+        :return: rows of minimap, blocks with possible positions are yellow and block with the bot shows the bot
+        """
+        blocks = np.unique(self.positions(possible_current_poss) // self.minimap_scale, axis=0)
+        blocks = blocks[np.all((blocks >= 0) & (blocks < self.minimap.shape), axis=1)]
+        highlighted = np.zeros(self.minimap.shape, dtype=bool)
+        highlighted[blocks[:, 0], blocks[:, 1]] = True
+
+        tiles = np.array(self.shades, dtype=object)[self.minimap]
+        tiles[highlighted] = [self.colored(shade, bg_color='yellow') for shade in tiles[highlighted]]
+
+        bot = np.asarray(bot_pos) // self.minimap_scale
+        tiles[bot[0], bot[1]] = self.colored(Utils.dir_to_unicode_arrow(bot_dir), fg_color='black',
+                                             bg_color='yellow' if highlighted[bot[0], bot[1]] else None)
+        return [''.join(row) for row in tiles]
+
+    def legend(self, bot_pos: np.ndarray, bot_dir: np.ndarray) -> str:
+        """
+        :return: legend of the map
+        """
+        legend = (f'Legend:\n{MapRenderer.colored(Utils.dir_to_unicode_arrow(bot_dir), "black", "yellow")} - bot\n'
+                  f'{MapRenderer.colored(" ", "black", "yellow")} - possible bot position\n')
+
+        if self.viewport is not None:
+            top_left = self.window(bot_pos)
+            legend += (f'Viewport: rows {top_left[0]}-{top_left[0] + self.viewport[0] - 1}, '
+                       f'columns {top_left[1]}-{top_left[1] + self.viewport[1] - 1} of {self.shape[0]}x{self.shape[1]}\n')
+        if self.minimap is not None:
+            legend += f'Minimap: one tile is {self.minimap_scale}x{self.minimap_scale} block of the map\n'
+
+        return legend
+
+    def render(self, bot_pos: np.ndarray, bot_dir: np.ndarray, possible_current_poss: Iterable[tuple],
+               redraw: bool = False) -> str:
+        """
+        :param bot_pos: position of the bot
+        :param bot_dir: direction of the bot
+        :param possible_current_poss: positions printed with yellow background
+        :param redraw: If True the map is drawn at the top of the screen and only changed tiles are written after the
+        first frame. Otherwise, whole map is returned.
+        :return: frame with legend as one string
+        """
+        tiles = self.frame_tiles(bot_pos, bot_dir, possible_current_poss)
+        minimap = [] if self.minimap is None else self.minimap_lines(bot_pos, bot_dir, possible_current_poss)
+
+        if not redraw:
+            self.previous = None
+            minimap = ''.join(f'{line}\n' for line in [''] + minimap) if minimap else ''
+            return ''.join(''.join(row) + '\n' for row in tiles) + minimap + self.legend(bot_pos, bot_dir)
+
+        changes = self.changes(tiles, self.previous)
+        self.previous = tiles
+        minimap = ''.join(f'\033[{len(tiles) + 2 + row};1H{line}' for row, line in enumerate(minimap))
+        below = len(tiles) + 1 + (len(self.minimap) + 1 if self.minimap is not None else 0)
+        return changes + minimap + f'\033[{below};1H{self.clear_below}' + self.legend(bot_pos, bot_dir)
+
+    def changes(self, tiles: np.ndarray, previous: Optional[np.ndarray]) -> str:
+        """
+        :param tiles: tiles of the new frame
+        :param previous: tiles on the screen, None if the screen should be cleared and whole frame drawn
+        :return: ANSI sequence that turns previous frame into the new one
+        """
+        if previous is None:
+            return self.cursor_home + self.clear_screen + ''.join(
+                f'\033[{row + 1};1H' + ''.join(tiles[row]) for row in range(len(tiles)))
+
+        rows, cols = np.nonzero(tiles != previous)
+        return ''.join(f'\033[{row + 1};{col + 1}H{tiles[row, col]}' for row, col in zip(rows, cols))
@@ -0,0 +1,360 @@
+"""
+Module with RemoteEnvironment, LocalizationSession and LocalizationService classes
+"""
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.src.bot import Bot
+from app.src.direction_codec import DirectionCodec
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.registry import AlgorithmRegistry
+from app.src.utils import Utils
+
+
+class RemoteEnvironment:
+    """
+    Environment of a bot which runs elsewhere. Instead of the position of the bot it knows the last view sent by the
+    bot, the view is square around the bot rotated so that the bot looks in Utils.initial_dir.
+    """
+    # values of view characters, '?' is unknown tile
+    view_values = {'X': 0, ' ': 1, '?': -1}
+
+    def __init__(self, environment_map: np.ndarray):
+        """
+        :param environment_map: map of the environment, shared by all sessions on the map
+        """
+        self.map = environment_map
+        # direction of the bot relative to its starting direction as number
+        self.rotation = 0
+        self.view = None
+        # result of the next move, the bot can move if the tile in front of it is free
+        self.can_move = False
+
+    @staticmethod
+    def parse_view(rows: List[str], sight_range: int) -> np.ndarray:
+        """
+        :param rows: rows of the view as strings of view_values characters
+        :param sight_range: sight range of the bot
+        :return: 2D array of tile values
+        :raises ValueError: if the view has wrong size or characters
+        """
+        size = 2 * sight_range + 1
+        if len(rows) != size or any(len(row) != size for row in rows):
+            raise ValueError(f'View must have {size} rows of {size} characters')
+        if any(char not in RemoteEnvironment.view_values for row in rows for char in row):
+            raise ValueError(f'View may contain only {"".join(RemoteEnvironment.view_values)} characters')
+
+        return np.array([[RemoteEnvironment.view_values[char] for char in row] for row in rows], dtype=np.int8)
+
+    def rotate(self, direction: str) -> None:
+        """
+        :param direction: left/right. Direction the bot rotated in
+        """
+        self.rotation = DirectionCodec.rotate_number(self.rotation, direction)
+
+    def move(self) -> bool:
+        """
+        :return: True if the bot moved forward
+        """
+        return self.can_move
+
+    def get_nearby_environment(self, bot_map: np.ndarray, bot_map_coords: np.ndarray, sight_range: int):
+        """
+        Writes known tiles of the last view rotated to the starting direction of the bot to bot's map.
+        :param bot_map: bot's map to write into
+        :param bot_map_coords: coords of the bot in bot's map
+        :param sight_range: radius of the square around the bot
+        """
+        window = np.rot90(self.view, k=self.rotation)
+        block = (slice(bot_map_coords[0] - sight_range, bot_map_coords[0] + sight_range + 1),
+                 slice(bot_map_coords[1] - sight_range, bot_map_coords[1] + sight_range + 1))
+        bot_map[block] = np.where(window >= 0, window, bot_map[block])
+
+
+class LocalizationSession:
+    """
+    Search of one remote bot. Every step gets view after the previous action and returns the next action, steps are
+    same as steps of Bot.find_itself.
+    """
+
+    def __init__(self, environment_map: np.ndarray, finding_algorithm: FindingAlgorithm, sight_range: int = 1):
+        """
+        :param environment_map: map of the environment
+        :param finding_algorithm: finding algorithm used only by this session
+        :param sight_range: sight range of the bot
+        """
+        self.environment = RemoteEnvironment(environment_map)
+        self.bot = Bot(self.environment, sight_range, finding_algorithm)
+        # remaining planned actions, None before the first view
+        self.path: Optional[List[str]] = None
+        self.action: Optional[str] = None
+
+    def step(self, view: List[str]) -> Optional[str]:
+        """
+        :param view: rows of the view after the previous action, or at the start
+        :return: next action (move, left or right), None if the search is finished
+        """
+        self.environment.view = RemoteEnvironment.parse_view(view, self.bot.sight_range)
+
+        if self.path is None:
+            self.bot.add_environment_to_map()
+            self.path = self.bot.get_path()
+        elif self.action is not None:
+            self.bot.finding_algorithm.steps += 1
+            if self.action == 'move':
+                self.environment.can_move = self.bot.bot_map.get(self.bot.relative_pos + self.bot.relative_dir) > 0
+                self.bot.move()
+            else:
+                self.bot.rotate(self.action)
+
+        if len(self.path) == 0:
+            self.path = self.bot.get_path()
+
+        self.action = self.path.pop(0) if self.path else None
+        return self.action
+
+    def result(self) -> dict:
+        """
+        :return: state of the search as JSON serializable dict
+        """
+        finding_algorithm = self.bot.finding_algorithm
+        result = {'action': self.action, 'steps': finding_algorithm.steps,
+                  'candidates': len(finding_algorithm.possible_starting_poss)}
+        if self.action is None:
+            result['found'] = finding_algorithm.is_bot_found
+            result['starting_positions'] = finding_algorithm.possible_starting_poss.array.tolist()
+
+        return result
+
+
+class LocalizationService:
+    """
+    Asyncio service finding many remote bots at once. Requests and responses are JSON objects, one per line, every
+    response has id of its request. Requests of different sessions on one connection are handled concurrently, so
+    their responses may come in different order. Requests of one session are handled in order they were sent and after
+    open requests sent before them, so a client may pipeline open and steps without waiting for responses. Maps and finding algorithms with their precomputed structures are loaded once and shared by all
+    sessions on the map. Loading and planning run in a thread pool, so the event loop keeps serving other sessions.
+
+    Requests:
+    {"id": 1, "op": "open", "map": "maps/zum/26.txt", "sight_range": 1, "algorithm": "DistributedGreedyBFS"}
+        -> {"id": 1, "session": "1"}
+    {"id": 2, "op": "step", "session": "1", "view": ["XXX", "X  ", "X X"]}
+        -> {"id": 2, "action": "move", "steps": 0, "candidates": 12}, action is null when the search is finished and
+        then found and starting_positions [row, column, direction as number] are added
+    {"id": 3, "op": "close", "session": "1"} -> {"id": 3, "closed": true}
+    Errors are returned as {"id": 4, "error": "message"}, any exception of a request is returned as its error.
+    """
+
+    def __init__(self, workers: int = None):
+        """
+        :param workers: number of threads for loading and planning. If None default of ThreadPoolExecutor is used.
+        """
+        self.executor = ThreadPoolExecutor(workers)
+        # finding algorithms by (map file, algorithm name), sessions get forks of them
+        self.algorithms: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.sessions: Dict[str, Tuple[LocalizationSession, asyncio.Lock]] = {}
+        self.next_session = 1
+
+    @staticmethod
+    def load_algorithm(file_name: str, algorithm: str) -> FindingAlgorithm:
+        """
+        :param file_name: file with environment map
+        :param algorithm: name of registered finding algorithm
+        :return: finding algorithm with precomputed structures of the map
+        """
+        finding_algorithm = AlgorithmRegistry.create(Utils.load(file_name), algorithm)
+        # built before sessions fork the algorithm, so that all of them share the structures
+        finding_algorithm.get_ambiguity_index()
+        finding_algorithm.placement_index.build()
+        return finding_algorithm
+
+    async def get_algorithm(self, file_name: str, algorithm: str = None) -> FindingAlgorithm:
+        """
+        :param file_name: file with environment map
+        :param algorithm: name of registered finding algorithm. If None default algorithm is used.
+        :return: shared finding algorithm of the map, loaded only once even if requested by many sessions at once
+        """
+        key = (os.path.realpath(file_name), algorithm or AlgorithmRegistry.default)
+        if key not in self.algorithms:
+            self.algorithms[key] = asyncio.get_running_loop().run_in_executor(self.executor, self.load_algorithm, *key)
+
+        try:
+            return await self.algorithms[key]
+        except Exception:
+            # failed load is not cached, so the map can be fixed and requested again
+            self.algorithms.pop(key, None)
+            raise
+
+    async def handle_request(self, request: dict) -> dict:
+        """
+        :param request: request as dict
+        :return: response without id
+        :raises ValueError, KeyError, OSError: if the request is not valid
+        """
+        operation = request.get('op')
+
+        if operation == 'open':
+            sight_range = request.get('sight_range', 1)
+            # bool is int in Python, but true is not a sight range
+            if not isinstance(sight_range, int) or isinstance(sight_range, bool) or sight_range < 0:
+                raise ValueError(f'Sight range must be non-negative integer, not {json.dumps(sight_range)}')
+
+            finding_algorithm = await self.get_algorithm(request['map'], request.get('algorithm'))
+            session_id = str(self.next_session)
+            self.next_session += 1
+            self.sessions[session_id] = (
+                LocalizationSession(finding_algorithm.environment_map, finding_algorithm.fork(), sight_range),
+                asyncio.Lock())
+            return {'session': session_id}
+
+        if operation == 'step':
+            session, lock = self.get_session(request)
+            # steps of one session must not overlap
+            async with lock:
+                await asyncio.get_running_loop().run_in_executor(self.executor, session.step, request['view'])
+                return session.result()
+
+        if operation == 'close':
+            self.get_session(request)
+            del self.sessions[str(request['session'])]
+            return {'closed': True}
+
+        raise ValueError(f'Unknown operation {operation}')
+
+    def get_session(self, request: dict) -> Tuple[LocalizationSession, asyncio.Lock]:
+        """
+        :param request: request with session id
+        :return: (session, lock of the session)
+        :raises KeyError: if there is no such session
+        """
+        session_id = str(request.get('session'))
+        if session_id not in self.sessions:
+            raise KeyError(f'Unknown session {session_id}')
+        return self.sessions[session_id]
+
+    @staticmethod
+    def order_key(line: bytes) -> Optional[str]:
+        """
+        :param line: request as JSON
+        :return: key of requests handled in order of one connection: 'open' for open requests, session for requests
+        with session, None for other requests
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(request, dict):
+            return None
+
+        if request.get('op') == 'open':
+            return 'open'
+        return f'session {request["session"]}' if 'session' in request else None
+
+    async def respond(self, line: bytes, writer: asyncio.StreamWriter, after: List[asyncio.Future] = ()) -> None:
+        """
+        Handles one request line and writes its response line.
+        :param line: request as JSON
+        :param writer: stream for the response
+        :param after: requests handled before this one
+        """
+        if after:
+            await asyncio.wait(after)
+
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('Request must be JSON object')
+            request_id = request.get('id')
+            response = await self.handle_request(request)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            # failure of one request is its error response, the connection and other sessions are served further.
+            # Message of KeyError is its argument, str of KeyError would add quotes
+            response = {'error': str(error.args[0]) if isinstance(error, KeyError) and error.args else str(error)}
+
+        writer.write((json.dumps({'id': request_id, **response}) + '\n').encode())
+        await writer.drain()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves requests of one connection until it is closed.
+        :param reader: stream of request lines
+        :param writer: stream for response lines
+        """
+        tasks = set()
+        # last request of every order key, request waits for the last open request and last request of its session
+        last_tasks: Dict[str, asyncio.Future] = {}
+
+        def forget(task: asyncio.Future, key: str) -> None:
+            tasks.discard(task)
+            if last_tasks.get(key) is task:
+                del last_tasks[key]
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    key = self.order_key(line)
+                    task = asyncio.ensure_future(
+                        self.respond(line, writer, [last_tasks[name] for name in ('open', key) if name in last_tasks]))
+                    tasks.add(task)
+                    if key is not None:
+                        last_tasks[key] = task
+                    task.add_done_callback(lambda done, key=key: forget(done, key))
+
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def serve_unix(self, path: str) -> None:
+        """
+        Serves connections on Unix socket forever.
+        :param path: path of the socket
+        """
+        server = await asyncio.start_unix_server(self.handle_connection, path)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self) -> None:
+        """Serves requests from standard input until it is closed, responses are written to standard output."""
+        stream = StdioStream()
+        await self.handle_connection(stream, stream)
+
+
+class StdioStream:
+    """
+    Standard input and output with the methods of asyncio streams used by LocalizationService. Lines are read in
+    a thread, so unlike pipe transports of asyncio it works with regular files as well.
+    """
+
+    def __init__(self):
+        self.input = sys.stdin.buffer
+        self.output = sys.stdout.buffer
+
+    async def readline(self) -> bytes:
+        """
+        :return: next line of standard input, empty at the end of the input
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.input.readline)
+
+    def write(self, data: bytes) -> None:
+        """
+        :param data: data written to standard output
+        """
+        self.output.write(data)
+        self.output.flush()
+
+    async def drain(self) -> None:
+        """Data are written immediately, so there is nothing to wait for."""
+
+    def close(self) -> None:
+        """Standard output stays open."""
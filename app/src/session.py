@@ -0,0 +1,149 @@
+"""
+Module with SessionRecord, SessionRecorder and SessionReplay classes
+"""
+import json
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.src.bot import Bot
+from app.src.direction_codec import DirectionCodec
+from app.src.environment import Environment
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.observers import BotObserver, StepEvent
+from app.src.utils import Utils
+
+
+@dataclass
+class SessionRecord:
+    """
+    Recorded search. Actions are stored as one string of their first letters, observations as rows of the square the
+    bot saw after every step in the same characters as map files ('X' wall, ' ' free) and '?' for unknown tile.
+    """
+    # hash of the environment map, see Utils.map_hash
+    map_hash: str
+    # [row, column, direction as number] of the start pose
+    start: List[int]
+    sight_range: int
+    algorithm: str
+    actions: str = ''
+    # observation before the first step and after every step
+    observations: List[List[str]] = field(default_factory=list)
+    # [row, column, direction as number] of possible starting positions found by the search
+    result: List[List[int]] = field(default_factory=list)
+
+    actions_codes = {'move': 'm', 'left': 'l', 'right': 'r'}
+
+    @staticmethod
+    def observation(bot: Bot) -> List[str]:
+        """
+        :param bot: bot after sensing its surroundings
+        :return: rows of the square around the bot in its bot map
+        """
+        return bot.bot_map.observation(bot.relative_pos, bot.sight_range)
+
+    @property
+    def action_names(self) -> List[str]:
+        """Recorded actions as move, left and right"""
+        names = {code: name for name, code in self.actions_codes.items()}
+        return [names[code] for code in self.actions]
+
+    def save(self, file_name: str) -> None:
+        """
+        :param file_name: JSON file to save the record to
+        """
+        with open(file_name, 'w', encoding='utf-8') as file:
+            json.dump(asdict(self), file)
+            file.write('\n')
+
+    @staticmethod
+    def load(file_name: str) -> 'SessionRecord':
+        """
+        :param file_name: JSON file saved by save
+        :return: loaded record
+        """
+        with open(file_name, encoding='utf-8') as file:
+            return SessionRecord(**json.load(file))
+
+
+class SessionRecorder(BotObserver):
+    """
+    Records start pose, actions and observations of Bot.find_itself, so the search can be replayed without planning.
+    """
+
+    def __init__(self):
+        self.record: Optional[SessionRecord] = None
+
+    def on_step(self, event: StepEvent) -> None:
+        bot = event.bot
+        if event.action is None:
+            environment = bot.environment
+            self.record = SessionRecord(
+                Utils.map_hash(environment.map),
+                [int(value) for value in environment.initial_bot_pos] +
+                [DirectionCodec.to_number(environment.initial_bot_dir)],
+                bot.sight_range, bot.finding_algorithm.name)
+        else:
+            self.record.actions += SessionRecord.actions_codes[event.action]
+
+        self.record.observations.append(SessionRecord.observation(bot))
+
+    def on_finish(self, event: StepEvent) -> None:
+        self.record.result = event.bot.finding_algorithm.possible_starting_poss.array.tolist()
+
+
+class SessionReplay:
+    """
+    Executes recorded actions against environment without finding algorithm planning the path. Every observation is
+    compared with the recorded one, so replay fails as soon as environment or sensing behaves differently.
+    """
+
+    @staticmethod
+    def replay(record: SessionRecord, environment_map: np.ndarray,
+               finding_algorithm: FindingAlgorithm = None) -> Tuple[Candidates, int]:
+        """
+        :param record: recorded search
+        :param environment_map: map of the environment, it must be the recorded one
+        :param finding_algorithm: finding algorithm used only to find possible starting positions at the end. If None
+        recorded algorithm is created.
+        :return: (possible starting positions, steps) same as returned by Bot.find_itself
+        """
+        if Utils.map_hash(environment_map) != record.map_hash:
+            raise ValueError('Environment map differs from the recorded one')
+
+        environment = Environment(environment_map, np.array(record.start[:2]), DirectionCodec.to_dir(record.start[2]))
+        bot = Bot(environment, record.sight_range, finding_algorithm, record.algorithm)
+
+        bot.add_environment_to_map()
+        SessionReplay.check(record, bot, 0)
+        for step, action in enumerate(record.action_names, 1):
+            if action == 'move':
+                bot.move()
+            else:
+                bot.rotate(action)
+            bot.finding_algorithm.steps += 1
+            SessionReplay.check(record, bot, step)
+
+        return bot.finding_algorithm.find_all_possible_positions(environment.map, bot.bot_map), bot.finding_algorithm.steps
+
+    @staticmethod
+    def check(record: SessionRecord, bot: Bot, step: int) -> None:
+        """
+        :param record: recorded search
+        :param bot: replaying bot
+        :param step: number of steps done so far
+        """
+        observation = SessionRecord.observation(bot)
+        if step >= len(record.observations) or observation != record.observations[step]:
+            raise ValueError(f'Observation after step {step} differs from the recording: {observation}')
+
+    @staticmethod
+    def matches(record: SessionRecord, possible_starting_poss: Candidates) -> bool:
+        """
+        :param record: recorded search
+        :param possible_starting_poss: possible starting positions found by replay
+        :return: True if replay found same possible starting positions as the recorded search
+        """
+        return sorted(map(tuple, possible_starting_poss.array.tolist())) == sorted(map(tuple, record.result))
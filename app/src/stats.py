@@ -0,0 +1,61 @@
+"""
+Module with SearchStats class
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+class SearchStats:
+    """
+    Counters and timers of one search. Counters count work like expanded nodes or tested placements, timers sum time
+    spent in phases like placement, planning or sensing. Number of possible positions is recorded after every replan.
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.times: Dict[str, float] = {}
+        # number of possible starting positions after every replan
+        self.candidates: List[int] = []
+
+    def reset(self) -> None:
+        """Forgets everything recorded so far."""
+        self.counters = {}
+        self.times = {}
+        self.candidates = []
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        :param name: name of the counter
+        :param value: value added to the counter
+        """
+        self.counters[name] = self.counters.get(name, 0) + int(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Adds time spent in the with block to the timer.
+        :param name: name of the timer
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - start
+
+    def to_dict(self) -> dict:
+        """
+        :return: counters, times and candidates per replan as JSON serializable dict
+        """
+        return {'counters': dict(self.counters), 'times': dict(self.times), 'candidates': list(self.candidates)}
+
+    def report(self) -> str:
+        """
+        :return: stats in readable format
+        """
+        lines = ['Stats:']
+        lines += [f'  {name}: {value}' for name, value in sorted(self.counters.items())]
+        lines += [f'  {name} time: {value * 1000:.3f} ms' for name, value in sorted(self.times.items())]
+        lines.append(f'  candidates per replan: {self.candidates}')
+
+        return '\n'.join(lines)
@@ -1,10 +1,13 @@
 """
 Module with Utils class
 """
+import hashlib
 from typing import Union
 
 import numpy as np
 
+from app.src.direction_codec import DirectionCodec
+
 
 class Utils:
     """
@@ -28,21 +31,7 @@ class Utils:
         if not isinstance(coords, np.ndarray) or coords.shape != (2,):
             raise ValueError('Cords must be np.ndarray with shape (2, )')
 
-        if count == 0:
-            return coords
-
-        count %= 4
-        if count > 2:
-            count = 4 - count
-            direction = 'left' if direction == 'right' else 'right'
-
-        for _ in range(count):
-            if direction == 'left':
-                coords = coords @ np.array([[0, 1], [-1, 0]])
-            elif direction == 'right':
-                coords = coords @ np.array([[0, -1], [1, 0]])
-
-        return np.squeeze(np.asarray(coords))
+        return DirectionCodec.rotate(coords, DirectionCodec.turns[direction] * count)
 
     @staticmethod
     def dir_to_number(dir_coords: np.ndarray) -> int:
@@ -50,21 +39,14 @@ class Utils:
         :param dir_coords: coordinates of direction - 2D np.ndarray
         :return: number of direction (0 - down, 1 - left, 2 - up, 3 - right)
         """
-        if np.linalg.norm(dir_coords) == 0:
+        if not np.any(dir_coords):
             raise ValueError('norm is 0')
 
-        dir_coords = dir_coords / np.linalg.norm(dir_coords)
-
-        if np.array_equal(np.array([1, 0]), dir_coords):
-            return 0
-        if np.array_equal(np.array([0, 1]), dir_coords):
-            return 1
-        if np.array_equal(np.array([-1, 0]), dir_coords):
-            return 2
-        if np.array_equal(np.array([0, -1]), dir_coords):
-            return 3
+        dir_number = DirectionCodec.to_number(dir_coords)
+        if dir_number < 0:
+            raise ValueError('dir_cords are not coords of any direction')
 
-        raise ValueError('dir_cords are not coords of any direction')
+        return dir_number
 
     @staticmethod
     def number_to_dir(dir_number: int):
@@ -72,19 +54,10 @@ class Utils:
         :param dir_number: number of direction (0 - down, 1 - left, 2 - up, 3 - right)
         :return: coordinates of direction - 2D np.ndarray with norm of one
         """
+        if dir_number != int(dir_number):
+            raise ValueError('Unknown direction')
 
-        dir_number %= 4
-
-        if dir_number == 0:
-            return np.array([1, 0])
-        if dir_number == 1:
-            return np.array([0, 1])
-        if dir_number == 2:
-            return np.array([-1, 0])
-        if dir_number == 3:
-            return np.array([0, -1])
-
-        raise ValueError('Unknown direction')
+        return DirectionCodec.to_dir(int(dir_number))
 
     walls = {
         0: '\u00b7',
@@ -122,15 +95,60 @@ class Utils:
     @staticmethod
     def load(file_name: str) -> np.ndarray:
         """
-        Loads file with 'X' and ' ' to np.array
+        Loads file with 'X' and ' ' to np.array. Lines may end with LF or CRLF, last line does not need to end with newline.
         :param file_name: file to load
-        :return: 2D np.array with loaded file where 'X' is 0 and ' ' is 1.
-        """
-        with open(file_name, 'r', encoding='ascii') as file:
-            lines = file.readlines()
-            environment_map = [[0 if char == 'X' else 1 for char in line[: -1]] for line in lines]
+        :return: 2D np.array of uint8 with loaded file where 'X' is 0 and ' ' is 1.
+        :raises ValueError: if the map is not rectangular, contains other characters or its border is not a wall
+        """
+        with open(file_name, 'rb') as file:
+            data = np.frombuffer(file.read(), dtype=np.uint8)
+
+        carriage_returns = np.flatnonzero(data == ord('\r'))
+        if len(carriage_returns) > 0:
+            if carriage_returns[-1] + 1 >= len(data) or np.any(data[carriage_returns + 1] != ord('\n')):
+                raise ValueError(f'{file_name}: carriage return not followed by newline')
+            data = np.delete(data, carriage_returns)
+
+        if len(data) == 0:
+            raise ValueError(f'{file_name}: map is empty')
+        if data[-1] != ord('\n'):
+            data = np.append(data, np.uint8(ord('\n')))
+
+        line_ends = np.flatnonzero(data == ord('\n'))
+        widths = np.diff(line_ends, prepend=-1) - 1
+        wrong_lines = np.flatnonzero(widths != widths[0])
+        if len(wrong_lines) > 0:
+            raise ValueError(f'{file_name}: map is not rectangular, line {wrong_lines[0] + 1} has {widths[wrong_lines[0]]} '
+                             f'characters, line 1 has {widths[0]}')
+        if widths[0] == 0:
+            raise ValueError(f'{file_name}: map is empty')
+
+        grid = data.reshape(len(line_ends), widths[0] + 1)[:, :-1]
+
+        invalid = np.argwhere((grid != ord('X')) & (grid != ord(' ')))
+        if len(invalid) > 0:
+            row, col = invalid[0]
+            raise ValueError(f'{file_name}: invalid character {bytes([grid[row, col]])!r} on line {row + 1}, column {col + 1}')
+
+        environment_map = (grid == ord(' ')).astype(np.uint8)
+
+        border = np.ones(environment_map.shape, dtype=bool)
+        border[1:-1, 1:-1] = False
+        free_border = np.argwhere(border & (environment_map == 1))
+        if len(free_border) > 0:
+            row, col = free_border[0]
+            raise ValueError(f'{file_name}: border of the map must be wall, line {row + 1}, column {col + 1} is free')
+
+        return environment_map
 
-            return np.array(environment_map, int)
+    @staticmethod
+    def map_hash(environment_map: np.ndarray) -> str:
+        """
+        :param environment_map: map of the environment
+        :return: SHA-256 of shape and walls of the map, same for every dtype of the map
+        """
+        walls = np.ascontiguousarray(environment_map != 0, dtype=np.uint8)
+        return hashlib.sha256(np.asarray(walls.shape, dtype=np.int64).tobytes() + walls.tobytes()).hexdigest()
 
     @staticmethod
     def dir_to_unicode_arrow(direction: Union[int, np.ndarray]):
@@ -0,0 +1,38 @@
+import glob
+import os
+import sys
+from argparse import ArgumentParser
+
+from app.src.benchmark import Benchmark
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark hot paths on maps and compare them with baseline")
+    parser.add_argument("files", help="Files with environment maps. All maps in maps/zum by default.", nargs="*")
+    parser.add_argument("--baseline", help="JSON file with baseline", default=os.path.join(root_dir, 'benchmarks', 'baseline.json'))
+    parser.add_argument("--margin", help="Allowed relative increase of time and memory over baseline", default=0.5, type=float)
+    parser.add_argument("--repeat", help="Number of timed runs of every case", default=5, type=int)
+    parser.add_argument("--update", help="Save results as new baseline instead of comparing", action="store_true")
+
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(root_dir, 'maps', 'zum', '*.txt')))
+    results = Benchmark(files, args.repeat).run(verbose=True)
+
+    if args.update:
+        Benchmark.save(args.baseline, results)
+        print(f'Baseline saved to {args.baseline}')
+        return
+
+    regressions = Benchmark.compare(results, Benchmark.load(args.baseline), args.margin)
+    for regression in regressions:
+        print(f'Regression: {regression}')
+    print(f'{len(regressions)} regressions in {len(results)} cases')
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import asyncio
+from argparse import ArgumentParser
+
+from app.src.service import LocalizationService
+
+
+def main():
+    parser = ArgumentParser(description="Find many remote bots at once. Requests and responses are JSON lines, see LocalizationService.")
+    parser.add_argument("--socket", help="Serve on this Unix socket instead of standard input and output", default=None)
+    parser.add_argument("--workers", help="Number of threads for loading maps and planning", default=None, type=int)
+
+    args = parser.parse_args()
+
+    service = LocalizationService(args.workers)
+    try:
+        asyncio.run(service.serve_unix(args.socket) if args.socket else service.serve_stdio())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.src.bot import Bot
+from app.src.direction_codec import DirectionCodec
+from app.src.environment import Environment
+from app.src.finding_algorithm.ambiguity_index import AmbiguityIndex
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.finding_algorithm.distributed_greedy_bfs import DistributedGreedyBFS
+from app.src.finding_algorithm.signature_index import SignatureIndex
+from app.src.utils import Utils
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def naive_classes(environment_map):
+    """Moore refinement by all three actions of every pose simulated by Environment"""
+    signature_index = SignatureIndex(environment_map)
+    poses = [(int(row), int(col), d) for row, col in np.argwhere(environment_map > 0) for d in range(4)]
+
+    successors = {}
+    for row, col, d in poses:
+        environment = Environment(environment_map, np.array([row, col]), DirectionCodec.to_dir(d))
+        environment.move()
+        successors[(row, col, d)] = [(row, col, (d + 1) % 4), (row, col, (d - 1) % 4),
+                                     (int(environment.bot_pos[0]), int(environment.bot_pos[1]), d)]
+
+    classes = {pose: signature_index.get(pose[:2], pose[2]) for pose in poses}
+    while True:
+        keys = {pose: (classes[pose],) + tuple(classes[successor] for successor in successors[pose]) for pose in poses}
+        numbers = {key: number for number, key in enumerate(sorted(set(keys.values())))}
+        refined = {pose: numbers[keys[pose]] for pose in poses}
+        if len(set(refined.values())) == len(set(classes.values())):
+            return refined
+        classes = refined
+
+
+@pytest.mark.parametrize(
+    'environment_map',
+    [
+        Utils.load(os.path.join(root_dir, 'maps/zum/0.txt')),
+        Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')),
+        Utils.load(os.path.join(root_dir, 'maps/zum/36.txt')),
+        Utils.load(os.path.join(root_dir, 'maps/zum/42.txt')),
+    ]
+)
+def test_classes_match_naive_refinement(environment_map):
+    ambiguity_index = AmbiguityIndex(environment_map, SignatureIndex(environment_map))
+    expected = naive_classes(environment_map)
+
+    poses = sorted(expected)
+    classes = ambiguity_index.get_many(Candidates(np.array(poses)))
+    for i, pose in enumerate(poses):
+        for j, other in enumerate(poses):
+            assert (classes[i] == classes[j]) == (expected[pose] == expected[other])
+
+    assert np.all(ambiguity_index.classes[:, environment_map == 0] == -1)
+
+
+@pytest.mark.parametrize(
+    'file_name, bot_pos, bot_dir, expected_ambiguous',
+    [
+        ('maps/zum/42.txt', np.array([1, 1]), np.array([0, 1]), True),
+        ('maps/zum/0.txt', np.array([1, 1]), np.array([0, 1]), True),
+        ('maps/zum/26.txt', np.array([1, 1]), np.array([1, 0]), False),
+        ('maps/zum/72.txt', np.array([13, 27]), np.array([-1, 0]), False),
+    ]
+)
+def test_search_stops_on_equivalent_positions(file_name, bot_pos, bot_dir, expected_ambiguous):
+    environment_map = Utils.load(os.path.join(root_dir, file_name))
+    finding_algorithm = DistributedGreedyBFS(environment_map)
+
+    possible_starting_poss, steps = Bot(Environment(environment_map, bot_pos, bot_dir), 1,
+                                        finding_algorithm).find_itself(headless=True)
+    assert finding_algorithm.is_ambiguous == expected_ambiguous
+    assert finding_algorithm.is_bot_found != expected_ambiguous
+    if expected_ambiguous:
+        assert finding_algorithm.ambiguity_index.are_equivalent(possible_starting_poss)
+    else:
+        # index is built only when planner finds no path
+        assert finding_algorithm.ambiguity_index is None
+
+    # without the index the planner gives up after searching everything, with the same result
+    finding_algorithm = DistributedGreedyBFS(environment_map)
+    finding_algorithm.ambiguity_max_poses = 0
+    expected_poss, expected_steps = Bot(Environment(environment_map, bot_pos, bot_dir), 1,
+                                        finding_algorithm).find_itself(headless=True)
+    assert finding_algorithm.ambiguity_index is None and not finding_algorithm.is_ambiguous
+    assert steps == expected_steps
+    assert np.array_equal(possible_starting_poss.array, expected_poss.array)
+
+
+def test_prebuilt_index_stops_search():
+    environment_map = Utils.load(os.path.join(root_dir, 'maps/zum/42.txt'))
+    finding_algorithm = DistributedGreedyBFS(environment_map)
+    ambiguity_index = finding_algorithm.get_ambiguity_index()
+
+    possible_starting_poss, _ = Bot(Environment(environment_map, np.array([1, 1]), np.array([0, 1])), 1,
+                                    finding_algorithm).find_itself(headless=True)
+    assert finding_algorithm.is_ambiguous and finding_algorithm.ambiguity_index is ambiguity_index
+    assert ambiguity_index.are_equivalent(possible_starting_poss)
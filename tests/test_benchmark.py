@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from app.src.benchmark import Benchmark
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_run():
+    results = Benchmark([os.path.join(root_dir, 'maps/zum/4.txt')], repeat=1).run()
+
+    assert sorted(results) == sorted(f'{case}/4' for case in ('load', 'find_all_possible_positions', 'find_matrix_placements',
+                                                                'get_path', 'process_node', 'find_itself',
+                                                                *(f'find_matrix_placements/{engine}'
+                                                                  for engine in Benchmark.placement_engines)))
+    assert all(result['time'] > 0 and result['memory'] > 0 for result in results.values())
+
+
+@pytest.mark.parametrize(
+    'results, baseline, margin, expected',
+    [
+        ({'a': {'time': 1.0, 'memory': 1e6}}, {'a': {'time': 1.0, 'memory': 1e6}}, 0.5, []),
+        ({'a': {'time': 1.4, 'memory': 1e6}}, {'a': {'time': 1.0, 'memory': 1e6}}, 0.5, []),
+        ({'a': {'time': 1.6, 'memory': 1e6}}, {'a': {'time': 1.0, 'memory': 1e6}}, 0.5, ['a time']),
+        ({'a': {'time': 1.6, 'memory': 3e6}}, {'a': {'time': 1.0, 'memory': 1e6}}, 1.0, ['a memory']),
+        ({'a': {'time': 0.0009, 'memory': 1000}}, {'a': {'time': 0.0001, 'memory': 10}}, 0.5, []),
+        ({'b': {'time': 5.0, 'memory': 1e6}}, {'a': {'time': 1.0, 'memory': 1e6}}, 0.5, []),
+    ]
+)
+def test_compare(results, baseline, margin, expected):
+    regressions = Benchmark.compare(results, baseline, margin)
+    assert [' '.join(regression.split()[:2]).rstrip(':') for regression in regressions] == expected
+
+
+def test_save_load(tmp_path):
+    results = {'load/4': {'time': 0.5, 'memory': 1024}}
+    Benchmark.save(str(tmp_path / 'baseline.json'), results)
+
+    assert Benchmark.load(str(tmp_path / 'baseline.json')) == results
+
+
+def test_baseline_covers_maps():
+    baseline = Benchmark.load(os.path.join(root_dir, 'benchmarks', 'baseline.json'))
+    maps = [os.path.splitext(file_name)[0] for file_name in os.listdir(os.path.join(root_dir, 'maps/zum'))]
+
+    assert all(f'find_itself/{map_name}' in baseline for map_name in maps)
@@ -1,3 +1,5 @@
+import io
+import json
 import os
 
 import numpy as np
@@ -5,6 +7,7 @@ import pytest
 
 from app.src.bot import Bot
 from app.src.environment import Environment
+from app.src.observers import BotObserver, TraceObserver
 from app.src.utils import Utils
 
 
@@ -91,3 +94,104 @@ def test_get_discovered_tiles_count(environment_map, bot_pos, bot_dir, expected)
     assert bot.get_discovered_tiles_count() == 0
     bot.find_itself()
     assert bot.get_discovered_tiles_count() == 9
+
+
+@pytest.mark.parametrize(
+    'environment_map, bot_pos, bot_dir',
+    [
+        (Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')), np.array([1, 1]), np.array([1, 0])),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/72.txt')), np.array([5, 9]), np.array([0, -1])),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/72.txt')), np.array([13, 27]), np.array([-1, 0])),
+    ]
+)
+def test_find_itself_incremental(environment_map, bot_pos, bot_dir):
+    results = []
+    for incremental in (True, False):
+        environment = Environment(environment_map, bot_pos, bot_dir)
+        bot = Bot(environment)
+        bot.finding_algorithm.incremental = incremental
+
+        positions, steps = bot.find_itself(False)
+        results.append(([(tuple(pos), d) for pos, d in positions], steps))
+
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize(
+    'environment_map, bot_pos, bot_dir, expected',
+    [
+        (Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')), np.array([1, 1]), np.array([1, 0]),
+         [[-1, -1, 0], [-1, 0, 0], [-1, 1, 0], [0, -1, 0], [0, 0, 1], [0, 1, 1], [1, -1, 0], [1, 0, 1], [1, 1, 1],
+          [2, -1, 0], [2, 0, 1], [2, 1, 0]]),
+    ]
+)
+def test_pop_new_tiles(environment_map, bot_pos, bot_dir, expected):
+    environment = Environment(environment_map, bot_pos, bot_dir)
+    bot = Bot(environment)
+
+    bot.add_environment_to_map()
+    bot.move()
+    assert sorted(bot.pop_new_tiles().tolist()) == expected
+    assert len(bot.pop_new_tiles()) == 0
+
+
+class RecordingObserver(BotObserver):
+    def __init__(self):
+        self.actions = []
+        self.finished = 0
+
+    def on_step(self, event):
+        self.actions.append(event.action)
+
+    def on_finish(self, event):
+        self.finished += 1
+
+
+@pytest.mark.parametrize(
+    'environment_map, bot_pos, bot_dir',
+    [
+        (Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')), np.array([1, 1]), np.array([1, 0])),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/72.txt')), np.array([13, 27]), np.array([-1, 0])),
+    ]
+)
+def test_find_itself_headless(capfd, environment_map, bot_pos, bot_dir):
+    environment = Environment(environment_map, bot_pos, bot_dir)
+    bot = Bot(environment)
+    observer = RecordingObserver()
+
+    _, steps = bot.find_itself(headless=True, observers=[observer])
+    out, err = capfd.readouterr()
+
+    assert out == '' and err == ''
+    assert observer.actions[0] is None and len(observer.actions) == steps + 1
+    assert all(action in ('move', 'left', 'right') for action in observer.actions[1:])
+    assert observer.finished == 1
+
+
+@pytest.mark.parametrize(
+    'environment_map, bot_pos, bot_dir, algorithm',
+    [
+        (Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')), np.array([1, 1]), np.array([1, 0]), None),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/72.txt')), np.array([13, 27]), np.array([-1, 0]), None),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/72.txt')), np.array([13, 27]), np.array([-1, 0]),
+         'InformationGainPlanner'),
+    ]
+)
+def test_find_itself_stats_and_trace(environment_map, bot_pos, bot_dir, algorithm):
+    bot = Bot(Environment(environment_map, bot_pos, bot_dir), algorithm=algorithm)
+    file = io.StringIO()
+
+    possible_starting_poss, steps = bot.find_itself(headless=True, observers=[TraceObserver(file)])
+    lines = [json.loads(line) for line in file.getvalue().splitlines()]
+
+    stats = bot.stats
+    assert stats.counters['replans'] == len(stats.candidates)
+    assert stats.candidates[-1] == len(possible_starting_poss)
+    assert stats.candidates == sorted(stats.candidates, reverse=True)
+    assert stats.counters['nodes_expanded'] > 0
+    assert {'sensing', 'placement', 'planning', 'observers'} <= set(stats.times)
+
+    assert [line['step'] for line in lines] == list(range(steps + 1)) + [steps]
+    assert [line['finished'] for line in lines] == [False] * (steps + 1) + [True]
+    assert lines[-1]['candidates'] == len(possible_starting_poss)
+    assert lines[-1]['counters'] == stats.counters
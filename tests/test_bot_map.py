@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from app.src.bot_map import BotMap
+
+
+def fill_ones(array, coords, radius):
+    array[coords[0] - radius:coords[0] + radius + 1, coords[1] - radius:coords[1] + radius + 1] = 1
+
+
+@pytest.mark.parametrize(
+    'centers, radius, expected_bounds, expected_count',
+    [
+        ([[0, 0]], 0, [0, 0, 0, 0], 1),
+        ([[0, 0]], 1, [-1, -1, 1, 1], 9),
+        ([[0, 0], [1, 0]], 1, [-1, -1, 2, 1], 12),
+        ([[0, 0], [0, 0]], 1, [-1, -1, 1, 1], 9),
+        ([[0, 0], [-20, 35]], 2, [-22, -2, 2, 37], 50),
+    ]
+)
+def test_sense(centers, radius, expected_bounds, expected_count):
+    bot_map = BotMap(3)
+
+    for center in centers:
+        bot_map.sense(np.array(center), radius, fill_ones)
+
+    assert bot_map.bounds.tolist() == expected_bounds
+    assert bot_map.discovered_count == expected_count
+    assert bot_map.array.dtype == np.int8
+    assert np.count_nonzero(bot_map.array != BotMap.unknown) == expected_count
+
+    discovered, top_left = bot_map.discovered()
+    assert top_left.tolist() == expected_bounds[:2]
+    assert discovered.shape == (expected_bounds[2] - expected_bounds[0] + 1, expected_bounds[3] - expected_bounds[1] + 1)
+    assert np.count_nonzero(discovered == 1) == expected_count
+
+
+def test_sense_new_tiles():
+    bot_map = BotMap(3)
+
+    assert sorted(bot_map.sense(np.array([0, 0]), 1, fill_ones).tolist()) == [[r, c, 1] for r in (-1, 0, 1) for c in (-1, 0, 1)]
+    assert sorted(bot_map.sense(np.array([0, 1]), 1, fill_ones).tolist()) == [[-1, 2, 1], [0, 2, 1], [1, 2, 1]]
+
+
+def test_get():
+    bot_map = BotMap(4)
+    bot_map.sense(np.array([10, -10]), 0, fill_ones)
+
+    assert bot_map.get(np.array([10, -10])) == 1
+    assert bot_map.get(np.array([0, 0])) == BotMap.unknown
+    assert bot_map.get(np.array([1000, 0])) == BotMap.unknown
+    assert len(BotMap().discovered()[0]) == 0
+
+
+def test_window():
+    bot_map = BotMap(3)
+    bot_map.sense(np.array([0, 0]), 1, fill_ones)
+
+    assert bot_map.window(np.array([0, 0]), 1).tolist() == [[1, 1, 1]] * 3
+    assert bot_map.window(np.array([1, 1]), 1).tolist() == [[1, 1, -1], [1, 1, -1], [-1, -1, -1]]
+    assert bot_map.window(np.array([30, 0]), 0).tolist() == [[BotMap.unknown]]
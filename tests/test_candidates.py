@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.utils import Utils
+
+
+@pytest.mark.parametrize(
+    'array, bot_rel_pos, bot_rel_dir',
+    [
+        ([[1, 1, 0], [5, 3, 1], [2, 7, 2], [4, 4, 3]], np.array([2, -1]), np.array([1, 0])),
+        ([[1, 1, 0], [5, 3, 1], [2, 7, 2], [4, 4, 3]], np.array([0, 3]), np.array([0, -1])),
+        ([[10, 2, 3]], np.array([-4, 0]), np.array([-1, 0])),
+    ]
+)
+def test_current(array, bot_rel_pos, bot_rel_dir):
+    current = Candidates(array).current(bot_rel_pos, Utils.dir_to_number(bot_rel_dir))
+
+    expected = [(np.array(row[:2]) + Utils.rotate_coords(bot_rel_pos, 'left', row[2]),
+                 (row[2] + Utils.dir_to_number(bot_rel_dir)) % 4) for row in array]
+    assert [(pos.tolist(), d) for pos, d in current] == [(pos.tolist(), d) for pos, d in expected]
+
+
+@pytest.mark.parametrize(
+    'coords, counts',
+    [
+        (np.array([2, 1]), np.array([0, 1, 2, 3, 4, -1])),
+        (np.array([[2, 1], [0, -3]]), np.array([0, 1, 2, 3])),
+    ]
+)
+def test_rotate(coords, counts):
+    rotated = Candidates.rotate(coords, counts)
+    for i, count in enumerate(counts):
+        expected = np.array([Utils.rotate_coords(c, 'left', count) for c in coords.reshape(-1, 2)]).reshape(coords.shape)
+        assert np.array_equal(rotated[i], expected)
+
+
+def test_values():
+    environment_map = np.array([[0, 0, 0], [0, 1, 0], [0, 0, 0]])
+    positions = np.array([[1, 1], [0, 0], [-1, 1], [1, 3]])
+
+    assert Candidates.inside(positions, environment_map.shape).tolist() == [True, True, False, False]
+    assert Candidates.values(environment_map, positions).tolist() == [1, 0, -1, -1]
+    assert Candidates.values(environment_map, positions, 0).tolist() == [1, 0, 0, 0]
+
+
+def test_container():
+    candidates = Candidates.concatenate([Candidates.from_positions([[1, 2], [3, 4]], 1),
+                                         Candidates.from_positions([[5, 6]], 6)])
+
+    assert len(candidates) == 3
+    assert candidates.array.dtype == np.int32
+    assert candidates[2][0].tolist() == [5, 6] and candidates[2][1] == 2
+    assert candidates.filter(candidates.dirs == 1).positions.tolist() == [[1, 2], [3, 4]]
+    assert candidates[1:].to_str() == f'([3 4] {Utils.dir_to_unicode_arrow(1)}); ([5 6] {Utils.dir_to_unicode_arrow(2)})'
+    assert len(Candidates()) == 0 and len(Candidates.concatenate([])) == 0
+
+
+@pytest.mark.parametrize('limit, expected_parts', [(None, 3), (3, 3), (1, 2), (0, 1)])
+def test_to_str_limit(limit, expected_parts):
+    candidates = Candidates.from_positions([[1, 2], [3, 4], [5, 6]], 1)
+    string = candidates.to_str(limit)
+
+    assert len(string.split('; ')) == expected_parts
+    assert string.endswith('(3 in total)') == (limit is not None and limit < 3)
+
+
+def test_values_unsigned_map():
+    environment_map = np.array([[0, 1]], dtype=np.uint8)
+    assert Candidates.values(environment_map, np.array([[0, 1], [0, 2]])).tolist() == [1, -1]
@@ -4,10 +4,29 @@ import pytest
 from pylint.lint import Run
 from pylint.reporters import CollectingReporter
 
+from app.src.benchmark import Benchmark
 from app.src.bot import Bot
+from app.src.bot_map import BotMap
+from app.src.direction_codec import DirectionCodec
 from app.src.environment import Environment
+from app.src.evaluation import Evaluation
+from app.src.finding_algorithm.ambiguity_index import AmbiguityIndex
 from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.finding_algorithm.compiled_policy import CompiledPolicy
 from app.src.finding_algorithm.distributed_greedy_bfs import DistributedGreedyBFS
+from app.src.finding_algorithm.information_gain import InformationGainPlanner
+from app.src.finding_algorithm.placement import MatrixPlacement
+from app.src.finding_algorithm.registry import AlgorithmRegistry
+from app.src.finding_algorithm.search_space import SearchSpace
+from app.src.finding_algorithm.signature_index import SignatureIndex
+from app.src.map_store import MapStore
+from app.src.observers import BotObserver
+from app.src.policy_compiler import PolicyCompiler
+from app.src.renderer import MapRenderer
+from app.src.service import LocalizationService
+from app.src.session import SessionRecord
+from app.src.stats import SearchStats
 from app.src.utils import Utils
 
 
@@ -16,19 +35,28 @@ from app.src.utils import Utils
 def linter_and_score():
     """ Test codestyle for src file of render_tree fucntion. """
     src_files = [inspect.getfile(Bot), inspect.getfile(Environment), inspect.getfile(Utils),
-                 inspect.getfile(FindingAlgorithm), inspect.getfile(DistributedGreedyBFS)]
+                 inspect.getfile(FindingAlgorithm), inspect.getfile(DistributedGreedyBFS), inspect.getfile(MatrixPlacement),
+                 inspect.getfile(SignatureIndex), inspect.getfile(Candidates),
+                 inspect.getfile(SearchSpace), inspect.getfile(Evaluation),
+                 inspect.getfile(BotObserver), inspect.getfile(BotMap),
+                 inspect.getfile(DirectionCodec), inspect.getfile(MapRenderer),
+                 inspect.getfile(InformationGainPlanner), inspect.getfile(AlgorithmRegistry),
+                 inspect.getfile(Benchmark), inspect.getfile(SearchStats),
+                 inspect.getfile(SessionRecord), inspect.getfile(AmbiguityIndex),
+                 inspect.getfile(CompiledPolicy), inspect.getfile(PolicyCompiler),
+                 inspect.getfile(LocalizationService), inspect.getfile(MapStore)]
 
     rep = CollectingReporter()
     # disabled warnings:
     # 0301 line too long
     # 0103 variables name (does not like shorter than 2 chars)
     r = None
-    score = 0
+    notes = []
     for file in src_files:
         r = Run(['--disable=C0301,C0103 ', '-sn', file], reporter=rep, exit=False)
-        score += r.linter.stats.global_note / len(src_files)
+        notes.append(r.linter.stats.global_note)
 
-    return r.linter, score
+    return r.linter, sum(notes) / len(src_files)
 
 
 @pytest.mark.parametrize("limit", range(0, 11))
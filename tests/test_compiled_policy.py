@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.src.bot import Bot
+from app.src.environment import Environment
+from app.src.finding_algorithm.compiled_policy import CompiledPolicy, PolicyTree
+from app.src.finding_algorithm.registry import AlgorithmRegistry
+from app.src.policy_compiler import PolicyCompiler
+from app.src.session import SessionRecord
+from app.src.utils import Utils
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize(
+    'file_name, sight_range, algorithm',
+    [
+        ('maps/zum/4.txt', 1, None),
+        ('maps/zum/36.txt', 1, None),
+        ('maps/zum/36.txt', 2, None),
+        ('maps/zum/4.txt', 1, 'InformationGainPlanner'),
+    ]
+)
+def test_policy_matches_algorithm(tmp_path, file_name, sight_range, algorithm):
+    file_name = os.path.join(root_dir, file_name)
+    environment_map = Utils.load(file_name)
+
+    PolicyCompiler(file_name, sight_range, 1, algorithm).compile().save(str(tmp_path / 'policy.json'))
+    policy = PolicyTree.load(str(tmp_path / 'policy.json'))
+    assert len(policy.poses) == 4 * np.count_nonzero(environment_map) and len(policy.ranges) == len(policy.actions)
+
+    compiled = CompiledPolicy(environment_map, policy, sight_range)
+    finding_algorithm = AlgorithmRegistry.create(environment_map, algorithm)
+    for pose in policy.poses:
+        expected_poss, expected_steps = Bot(Environment(environment_map, pose[:2], Utils.number_to_dir(pose[2])),
+                                            sight_range, finding_algorithm).find_itself(headless=True)
+        possible_starting_poss, steps = Bot(Environment(environment_map, pose[:2], Utils.number_to_dir(pose[2])),
+                                            sight_range, compiled).find_itself(headless=True)
+
+        assert steps == expected_steps
+        assert sorted(map(tuple, possible_starting_poss.array.tolist())) == \
+            sorted(map(tuple, expected_poss.array.tolist()))
+        assert compiled.is_bot_found == finding_algorithm.is_bot_found
+        assert compiled.stats.counters['replans'] == steps + 1
+
+
+def test_policy_for_different_map():
+    policy = PolicyCompiler(os.path.join(root_dir, 'maps/zum/4.txt'), workers=1).compile()
+
+    with pytest.raises(ValueError, match='different map'):
+        CompiledPolicy(Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')), policy)
+
+
+def test_policy_for_different_sight_range():
+    file_name = os.path.join(root_dir, 'maps/zum/4.txt')
+    policy = PolicyCompiler(file_name, 1, workers=1).compile()
+
+    with pytest.raises(ValueError, match='sight range 1, not 2'):
+        CompiledPolicy(Utils.load(file_name), policy, 2)
+
+
+def test_build_conflicting_records():
+    records = [SessionRecord('hash', [1, 1, 0], 1, 'DistributedGreedyBFS', 'm', [['   '] * 3, ['XXX'] * 3], [[1, 1, 0]]),
+               SessionRecord('hash', [2, 2, 0], 1, 'DistributedGreedyBFS', 'l', [['   '] * 3, ['XXX'] * 3], [[2, 2, 0]])]
+
+    with pytest.raises(ValueError, match='different action'):
+        PolicyTree.build(records)
+
+    # same observations lead to the same leaf, so both poses must be in the result
+    records[1].actions = 'm'
+    with pytest.raises(ValueError, match='not its result'):
+        PolicyTree.build(records)
+
+    records[0].result = records[1].result = [[1, 1, 0], [2, 2, 0]]
+    policy = PolicyTree.build(records)
+    assert policy.actions == '-m-'
+    assert len(policy.candidates(0)) == 2
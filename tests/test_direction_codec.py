@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from app.src.direction_codec import DirectionCodec
+
+
+def rotate_left(coords, count):
+    for _ in range(count % 4):
+        coords = coords @ np.array([[0, 1], [-1, 0]])
+    return coords
+
+
+@pytest.mark.parametrize(
+    'coords, expected',
+    [
+        (np.array([1, 0]), 0),
+        (np.array([0, 1]), 1),
+        (np.array([-1, 0]), 2),
+        (np.array([0, -1]), 3),
+        (np.array([0, -5]), 3),
+        (np.array([0, 0]), -1),
+        (np.array([1, 1]), -1),
+        (np.array([-1.5, 0.5]), -1),
+    ]
+)
+def test_to_number(coords, expected):
+    assert DirectionCodec.to_number(coords) == expected
+    assert DirectionCodec.to_numbers(coords[None, None, :]).tolist() == [[expected]]
+
+
+@pytest.mark.parametrize('dir_number', range(-4, 8))
+@pytest.mark.parametrize('direction', ['left', 'right'])
+@pytest.mark.parametrize('count', range(-2, 6))
+def test_rotate_dir(dir_number, direction, count):
+    dir_coords = DirectionCodec.to_dir(dir_number)
+    assert np.array_equal(dir_coords, rotate_left(np.array([1, 0]), dir_number))
+
+    rotated = rotate_left(dir_coords, count if direction == 'left' else -count)
+    assert np.array_equal(DirectionCodec.rotate_dir(dir_coords, direction, count), rotated)
+    assert DirectionCodec.rotate_number(dir_number, direction, count) == DirectionCodec.to_number(
+        DirectionCodec.rotate_dir(dir_coords, direction, count))
+
+
+def test_to_dir_read_only():
+    with pytest.raises(ValueError):
+        DirectionCodec.to_dir(1)[0] = 5
+
+
+def test_rotate():
+    rng = np.random.default_rng(0)
+    coords = rng.integers(-20, 20, (30, 2))
+    counts = rng.integers(-8, 8, 30)
+
+    assert np.array_equal(DirectionCodec.rotate_rows(coords, counts),
+                          np.array([rotate_left(c, count) for c, count in zip(coords, counts)]))
+    assert np.array_equal(DirectionCodec.rotate(coords, counts),
+                          np.array([[rotate_left(c, count) for c in coords] for count in counts]))
+    assert np.array_equal(DirectionCodec.rotate(coords[0], counts[0]), rotate_left(coords[0], counts[0]))
@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.finding_algorithm.distributed_greedy_bfs import DistributedGreedyBFS
+from app.src.utils import Utils
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def process_node_reference(finding_algorithm, bot_rel_pos, bot_rel_dir, pos_delta):
+    visible_environments = set()
+    for pos, d in finding_algorithm.possible_starting_poss:
+        pos = pos + Utils.rotate_coords(bot_rel_pos, 'left', d) + Utils.rotate_coords(
+            pos_delta, 'left', d + Utils.dir_to_number(bot_rel_dir))
+
+        if 0 <= pos[0] < finding_algorithm.environment_map.shape[0] and 0 <= pos[1] < finding_algorithm.environment_map.shape[1]:
+            visible_environments.add(tuple(finding_algorithm.get_visible_environment(finding_algorithm.environment_map, pos, d, 1)))
+
+    return len(visible_environments) > 1
+
+
+@pytest.mark.parametrize(
+    'environment_map, seed',
+    [
+        (Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')), 0),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/72.txt')), 1),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/6.txt')), 2),
+    ]
+)
+def test_process_node(environment_map, seed):
+    rng = np.random.default_rng(seed)
+    finding_algorithm = DistributedGreedyBFS(environment_map)
+    free = np.argwhere(environment_map > 0)
+
+    for _ in range(20):
+        chosen = free[rng.choice(len(free), size=rng.integers(1, 6), replace=False)]
+        finding_algorithm.possible_starting_poss = Candidates.from_positions(chosen, rng.integers(0, 4, len(chosen)))
+        bot_rel_pos = rng.integers(-3, 4, 2)
+        bot_rel_dir = Utils.number_to_dir(rng.integers(0, 4))
+        pos_delta = rng.integers(-3, 4, 2)
+
+        assert finding_algorithm.process_node(bot_rel_pos, bot_rel_dir, pos_delta) == \
+               process_node_reference(finding_algorithm, bot_rel_pos, bot_rel_dir, pos_delta)
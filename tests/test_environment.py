@@ -3,7 +3,6 @@ import os
 import numpy as np
 import pytest
 
-from app.src.bot import Bot
 from app.src.environment import Environment
 from app.src.utils import Utils
 
@@ -104,10 +103,32 @@ def test_environment_move(environment_map, bot_pos, bot_dir, new_bot_pos, ret):
 )
 def test_get_nearby_environment(environment_map, bot_pos, bot_dir, sight_range, expected_bot_map):
     environment = Environment(environment_map, bot_pos, bot_dir)
-    bot = Bot(environment, sight_range)
+    bot_map = np.ones(expected_bot_map.shape) * -1
 
-    environment.get_nearby_environment(bot.bot_map, bot.relative_pos + np.asarray(bot.bot_map.shape) // 2, sight_range)
-    assert np.array_equal(bot.bot_map, expected_bot_map)
+    environment.get_nearby_environment(bot_map, np.asarray(bot_map.shape) // 2, sight_range)
+    assert np.array_equal(bot_map, expected_bot_map)
+
+
+@pytest.mark.parametrize('bot_pos', [np.array([1, 1]), np.array([1, 31]), np.array([19, 21]), np.array([37, 1])])
+@pytest.mark.parametrize('bot_dir', [np.array([1, 0]), np.array([0, 1]), np.array([-1, 0]), np.array([0, -1])])
+@pytest.mark.parametrize('sight_range', [0, 1, 3, 15])
+def test_get_nearby_environment_clipped(bot_pos, bot_dir, sight_range):
+    environment_map = Utils.load(os.path.join(root_dir, 'maps/zum/26.txt'))
+    environment = Environment(environment_map, bot_pos, bot_dir)
+    bot_map = np.ones((4 * sight_range + 3, 4 * sight_range + 3)) * -1
+    center = np.asarray(bot_map.shape) // 2
+
+    expected_bot_map = bot_map.copy()
+    rotation_diff = (Utils.dir_to_number(bot_dir) - Utils.dir_to_number(Utils.initial_dir)) % 4
+    for dx in range(-sight_range, sight_range + 1):
+        for dy in range(-sight_range, sight_range + 1):
+            env_coords = bot_pos + np.array([dx, dy])
+            if np.all(env_coords >= 0) and np.all(env_coords < environment_map.shape):
+                coords = center + Utils.rotate_coords(np.array([dx, dy]), 'right', rotation_diff)
+                expected_bot_map[tuple(coords)] = environment_map[tuple(env_coords)]
+
+    environment.get_nearby_environment(bot_map, center, sight_range)
+    assert np.array_equal(bot_map, expected_bot_map)
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,34 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.src.evaluation import Evaluation
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize(
+    'file_name, sample, expected_runs',
+    [
+        (os.path.join(root_dir, 'maps/zum/0.txt'), None, 4),
+        (os.path.join(root_dir, 'maps/zum/4.txt'), None, 32),
+        (os.path.join(root_dir, 'maps/zum/26.txt'), 20, 20),
+    ]
+)
+def test_run(file_name, sample, expected_runs):
+    results = Evaluation(file_name, workers=1).run(sample)
+    summary = Evaluation.summary(results)
+
+    assert results.shape == (expected_runs, len(Evaluation.fields))
+    assert summary['runs'] == expected_runs
+    assert summary['found_correct'] + summary['ambiguous_with_start'] == expected_runs and summary['wrong'] == 0
+    assert 'Runs: ' in Evaluation.report(summary)
+
+
+def test_poses():
+    poses = Evaluation(os.path.join(root_dir, 'maps/zum/4.txt')).poses()
+
+    assert len(poses) == 32
+    assert np.array_equal(poses[:5], [[1, 1, 0], [1, 1, 1], [1, 1, 2], [1, 1, 3], [1, 2, 0]])
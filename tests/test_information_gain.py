@@ -0,0 +1,98 @@
+import os
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app.src.bot import Bot
+from app.src.environment import Environment
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.finding_algorithm.information_gain import InformationGainPlanner
+from app.src.utils import Utils
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def expected_elimination_reference(finding_algorithm, current_poss, pos_delta):
+    views = Counter()
+    for pos, d in current_poss:
+        pos = pos + Utils.rotate_coords(pos_delta, 'left', d)
+        if 0 <= pos[0] < finding_algorithm.environment_map.shape[0] and 0 <= pos[1] < finding_algorithm.environment_map.shape[1]:
+            views[tuple(finding_algorithm.get_visible_environment(finding_algorithm.environment_map, pos, d, 1))] += 1
+        else:
+            views[None] += 1
+
+    return len(current_poss) - sum(count * count for count in views.values()) / len(current_poss)
+
+
+@pytest.mark.parametrize(
+    'environment_map, seed',
+    [
+        (Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')), 0),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/72.txt')), 1),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/6.txt')), 2),
+    ]
+)
+def test_expected_eliminations(environment_map, seed):
+    rng = np.random.default_rng(seed)
+    finding_algorithm = InformationGainPlanner(environment_map)
+    free = np.argwhere(environment_map > 0)
+
+    for _ in range(10):
+        chosen = free[rng.choice(len(free), size=rng.integers(1, 30), replace=False)]
+        current_poss = Candidates.from_positions(chosen, rng.integers(0, 4, len(chosen)))
+        pos_deltas = rng.integers(-5, 6, (8, 2))
+
+        assert np.allclose(finding_algorithm.expected_eliminations(pos_deltas, current_poss),
+                           [expected_elimination_reference(finding_algorithm, current_poss, delta) for delta in pos_deltas])
+
+
+@pytest.mark.parametrize(
+    'file_name, seed',
+    [
+        ('maps/zum/26.txt', 0),
+        ('maps/zum/72.txt', 1),
+        ('maps/zum/114.txt', 2),
+    ]
+)
+def test_find_itself(file_name, seed):
+    environment_map = Utils.load(os.path.join(root_dir, file_name))
+    finding_algorithm = InformationGainPlanner(environment_map)
+    rng = np.random.default_rng(seed)
+    free = np.argwhere(environment_map > 0)
+
+    for _ in range(5):
+        environment = Environment(environment_map, free[rng.integers(len(free))], Utils.number_to_dir(rng.integers(0, 4)))
+        candidates, _ = Bot(environment, 1, finding_algorithm).find_itself(headless=True)
+
+        assert finding_algorithm.is_bot_found and environment.check_position(candidates[0])
+
+
+def test_get_path_prefers_even_split():
+    environment_map = Utils.load(os.path.join(root_dir, 'maps/zum/26.txt'))
+    finding_algorithm = InformationGainPlanner(environment_map)
+    free = np.argwhere(environment_map > 0)
+    finding_algorithm.possible_starting_poss = Candidates.from_positions(free[::5], 0)
+
+    path = finding_algorithm.get_path(np.array([0, 0]), np.array([1, 0]))
+    assert len(path) > 0 and set(path) <= {'move', 'left', 'right'}
+
+
+def test_get_path_rescores_all_positions_when_sample_eliminates_nothing(monkeypatch):
+    environment_map = Utils.load(os.path.join(root_dir, 'maps/zum/26.txt'))
+    free = np.argwhere(environment_map > 0)
+    current_poss = Candidates.from_positions(free[::5], 0)
+
+    finding_algorithm = InformationGainPlanner(environment_map)
+    finding_algorithm.possible_starting_poss = current_poss
+    expected = finding_algorithm.get_path(np.array([0, 0]), np.array([1, 0]))
+
+    # one sampled position sees one view everywhere, so no tile eliminates anything in the sample
+    monkeypatch.setattr(InformationGainPlanner, 'max_scored_positions', 1)
+    finding_algorithm = InformationGainPlanner(environment_map)
+    finding_algorithm.possible_starting_poss = current_poss
+    path = finding_algorithm.get_path(np.array([0, 0]), np.array([1, 0]))
+
+    assert len(path) > 0 and path == expected
+    assert finding_algorithm.stats.counters['full_rescoring'] == 1
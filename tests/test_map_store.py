@@ -0,0 +1,105 @@
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from app.src.bot import Bot
+from app.src.environment import Environment
+from app.src.finding_algorithm.ambiguity_index import AmbiguityIndex
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.placement import MatrixPlacement, PlacementIndex
+from app.src.finding_algorithm.signature_index import SignatureIndex
+from app.src.map_store import MapStore
+from app.src.utils import Utils
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize(
+    'file_name',
+    [
+        os.path.join(root_dir, 'maps/zum/4.txt'),
+        os.path.join(root_dir, 'maps/zum/26.txt'),
+    ]
+)
+def test_publish_and_attach(file_name):
+    environment_map = Utils.load(file_name)
+    signature_index = SignatureIndex(environment_map)
+
+    with MapStore.publish(environment_map) as store:
+        attached = MapStore(store.directory)
+        assert isinstance(attached.map, np.memmap) and not attached.map.flags.writeable
+        assert np.array_equal(attached.map, environment_map)
+
+        finding_algorithm = attached.create_algorithm()
+        assert np.array_equal(finding_algorithm.signature_index.entries, signature_index.entries)
+        assert finding_algorithm.signature_index.ranges == signature_index.ranges
+        assert np.array_equal(finding_algorithm.ambiguity_index.classes,
+                              AmbiguityIndex(environment_map, signature_index).classes)
+        assert np.array_equal(finding_algorithm.placement_index.packed, PlacementIndex(environment_map).packed)
+        assert len(finding_algorithm.placement_index.levels) == MatrixPlacement.pyramid_levels + 1
+        for level, counts in zip(finding_algorithm.placement_index.levels, PlacementIndex(environment_map).levels):
+            assert isinstance(level, np.memmap) and np.array_equal(level, counts)
+        directory = store.directory
+
+    assert not os.path.exists(directory)
+
+
+@pytest.mark.parametrize(
+    'bot_pos, bot_dir',
+    [
+        (np.array([1, 1]), np.array([1, 0])),
+        (np.array([5, 9]), np.array([0, -1])),
+    ]
+)
+def test_find_itself_with_store(bot_pos, bot_dir):
+    environment_map = Utils.load(os.path.join(root_dir, 'maps/zum/72.txt'))
+    expected = Bot(Environment(environment_map, bot_pos, bot_dir)).find_itself(headless=True)
+
+    with MapStore.publish(environment_map) as store:
+        finding_algorithm = store.create_algorithm()
+        candidates, steps = Bot(Environment(store.map, bot_pos, bot_dir), 1, finding_algorithm).find_itself(
+            headless=True)
+
+    assert steps == expected[1]
+    assert sorted((tuple(pos), d) for pos, d in candidates) == sorted((tuple(pos), d) for pos, d in expected[0])
+
+
+def test_ambiguity_index_ignores_limit(monkeypatch):
+    monkeypatch.setattr(FindingAlgorithm, 'ambiguity_max_poses', 10)
+
+    with MapStore.publish(Utils.load(os.path.join(root_dir, 'maps/zum/26.txt'))) as store:
+        assert 'classes' in store.arrays
+        assert store.create_algorithm().get_ambiguity_index() is not None
+
+
+def test_given_directory_is_kept(tmp_path):
+    with MapStore.publish(Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')), str(tmp_path)) as store:
+        assert not store.owner
+
+    assert os.path.exists(os.path.join(tmp_path, 'map.npy'))
+
+
+@pytest.mark.parametrize('error', [MemoryError, KeyboardInterrupt])
+def test_failed_publish_removes_directory(monkeypatch, tmp_path, error):
+    directories = []
+
+    def mkdtemp(**kwargs):
+        directories.append(str(tmp_path / f'store_{len(directories)}'))
+        os.mkdir(directories[-1])
+        return directories[-1]
+
+    def save(file_name, _array):
+        if not file_name.endswith('map.npy'):
+            raise error()
+        with open(file_name, 'wb'):
+            pass
+
+    monkeypatch.setattr(tempfile, 'mkdtemp', mkdtemp)
+    monkeypatch.setattr(np, 'save', save)
+    with pytest.raises(error):
+        MapStore.publish(Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')))
+
+    assert len(directories) == 1 and not os.path.exists(directories[0])
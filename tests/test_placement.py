@@ -0,0 +1,155 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.placement import MatrixPlacement, PlacementIndex
+from app.src.utils import Utils
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize(
+    'matrix, matrix_to_find, expected',
+    [
+        (Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')), np.array([[0, 0], [0, 1]]), [[0, 0]]),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')), np.array([[1, -1], [1, -1]]), [[1, 1], [1, 2], [1, 3], [2, 1], [2, 3]]),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')), np.array([[-1, -1], [-1, -1]]), [[i, j] for i in range(4) for j in range(4)]),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')), np.array([[1, 1, 1, 1]]), []),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/0.txt')), np.ones((4, 1)), []),
+    ]
+)
+@pytest.mark.parametrize('engine', MatrixPlacement.engines)
+def test_find_matrix_placements(matrix, matrix_to_find, expected, engine):
+    placements = FindingAlgorithm.find_matrix_placements(matrix, matrix_to_find, engine)
+    assert np.array_equal(np.array(placements).reshape(-1, 2), np.array(expected).reshape(-1, 2))
+
+
+@pytest.mark.parametrize(
+    'environment_map, shape, seed',
+    [
+        (Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')), (3, 3), 0),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')), (5, 7), 1),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/72.txt')), (4, 4), 2),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/72.txt')), (9, 3), 3),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/72.txt')), (16, 20), 4),
+    ]
+)
+@pytest.mark.parametrize('engine', MatrixPlacement.engines)
+def test_engines_match_loop(environment_map, shape, seed, engine):
+    rng = np.random.default_rng(seed)
+    row = rng.integers(0, environment_map.shape[0] - shape[0] + 1)
+    col = rng.integers(0, environment_map.shape[1] - shape[1] + 1)
+    matrix_to_find = environment_map[row:row + shape[0], col:col + shape[1]].astype(int)
+    matrix_to_find[rng.random(shape) < 0.3] = -1
+
+    expected = MatrixPlacement.loop(environment_map, matrix_to_find)
+    assert np.array_equal(MatrixPlacement.find(environment_map, matrix_to_find, engine), expected)
+    assert [row, col] in expected.tolist()
+
+
+def test_unpack_positions():
+    plane = np.random.default_rng(0).random((5, 150)) < 0.1
+
+    assert np.array_equal(MatrixPlacement.unpack_positions(MatrixPlacement.pack(plane)), np.argwhere(plane))
+
+
+@pytest.mark.parametrize('ratio', [0.0, 0.1, 1.0])
+def test_positions(ratio):
+    plane = np.random.default_rng(0).random((5, 150)) < ratio
+
+    assert np.array_equal(MatrixPlacement.positions(plane), np.argwhere(plane))
+
+
+def test_block_counts():
+    plane = np.random.default_rng(0).random((20, 30)) < 0.5
+    counts = MatrixPlacement.block_counts(plane, 3)
+
+    assert len(counts) == 4
+    for level, level_counts in enumerate(counts):
+        size = 1 << level
+        assert level_counts.shape == (21 - size, 31 - size)
+        assert level_counts[3, 5] == np.count_nonzero(plane[3:3 + size, 5:5 + size])
+
+
+def test_known_blocks():
+    matrix_to_find = np.array([[1, 1, 0, 0, 1],
+                               [1, 0, 0, -1, 1],
+                               [0, 0, 1, 1, 1]])
+
+    assert MatrixPlacement.known_blocks(matrix_to_find, 1).tolist() == [[1, 0, 0, 3]]
+    assert MatrixPlacement.known_blocks(matrix_to_find, 0).tolist() == []
+
+
+def test_verify_blocks():
+    plane = np.random.default_rng(0).random((20, 30)) < 0.5
+    counts = MatrixPlacement.block_counts(plane, 2)
+    matrix_to_find = plane[3:11, 5:13].astype(int)
+    matrix_to_find[4:, :4] = -1
+    offsets = np.array([[3, 5], [0, 0], [12, 22]])
+
+    blocks = MatrixPlacement.known_blocks(matrix_to_find, 2)
+    assert MatrixPlacement.verify_blocks(counts, offsets, blocks).tolist()[0] == [3, 5]
+    assert MatrixPlacement.verify_blocks(counts, offsets, blocks[:0]).tolist() == offsets.tolist()
+
+
+@pytest.mark.parametrize('engine', MatrixPlacement.indexed_engines)
+def test_indexed_engine_uses_index(engine):
+    environment_map = Utils.load(os.path.join(root_dir, 'maps/zum/72.txt'))
+    matrix_to_find = environment_map[5:12, 9:14].astype(int)
+    matrix_to_find[::2, 1] = -1
+    index = PlacementIndex(environment_map)
+
+    expected = MatrixPlacement.loop(environment_map, matrix_to_find)
+    assert np.array_equal(MatrixPlacement.find(environment_map, matrix_to_find, engine, index), expected)
+    packed, levels = index.packed, index.levels
+    # structures are built only once
+    assert np.array_equal(MatrixPlacement.find(environment_map, matrix_to_find, engine, index), expected)
+    assert index.packed is packed and index.levels is levels
+
+
+@pytest.mark.parametrize('cols', [1, 63, 64, 65, 128, 130])
+def test_bitpacked_does_not_copy_index(monkeypatch, cols):
+    environment_map = (np.random.default_rng(cols).random((6, cols)) < 0.8).astype(np.int8)
+    index = PlacementIndex(environment_map)
+    assert index.packed.shape[1] == -(-cols // 64) + MatrixPlacement.packed_slack
+
+    def pad(*_args, **_kwargs):
+        raise AssertionError('packed map is copied')
+
+    monkeypatch.setattr(np, 'pad', pad)
+    for width in sorted({1, cols // 2 + 1, cols}):
+        matrix_to_find = environment_map[1:5, cols - width:].astype(int)
+        matrix_to_find[::2, ::3] = -1
+        assert np.array_equal(MatrixPlacement.find(environment_map, matrix_to_find, 'bitpacked', index),
+                              MatrixPlacement.loop(environment_map, matrix_to_find))
+
+
+@pytest.mark.parametrize('engine', MatrixPlacement.indexed_engines)
+def test_indexed_engine_rejects_other_values(engine):
+    with pytest.raises(ValueError, match='map of 0'):
+        MatrixPlacement.find(np.full((4, 4), 2), np.ones((2, 2)), engine)
+    with pytest.raises(ValueError, match='-1, 0 and 1'):
+        MatrixPlacement.find(np.ones((4, 4)), np.full((2, 2), 2), engine)
+
+    # other engines compare any values
+    assert MatrixPlacement.find(np.full((4, 4), 2), np.full((2, 2), 2), 'strided').tolist() == \
+        [[i, j] for i in range(3) for j in range(3)]
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        MatrixPlacement.find(np.zeros((3, 3)), np.zeros((1, 1)), 'unknown')
+
+
+@pytest.mark.parametrize('shift', [0, 1, 63, 64, 65, 130])
+def test_shift_columns(shift):
+    plane = np.random.default_rng(shift).random((3, 150)) < 0.5
+    shifted = MatrixPlacement.shift_columns(MatrixPlacement.pack(plane, 3), shift, 3)
+
+    unpacked = np.unpackbits(shifted.view(np.uint8), axis=1, bitorder='little')
+    expected = np.zeros((3, 192), dtype=bool)
+    expected[:, :150 - shift] = plane[:, shift:]
+    assert np.array_equal(unpacked, expected)
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from app.src.bot import Bot
+from app.src.environment import Environment
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.distributed_greedy_bfs import DistributedGreedyBFS
+from app.src.finding_algorithm.information_gain import InformationGainPlanner
+from app.src.finding_algorithm.registry import AlgorithmRegistry
+from app.src.utils import Utils
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_names():
+    names = AlgorithmRegistry.names()
+    assert names[0] == AlgorithmRegistry.default and set(names) == {'DistributedGreedyBFS', 'InformationGainPlanner'}
+
+
+@pytest.mark.parametrize(
+    'name, expected',
+    [
+        (None, DistributedGreedyBFS),
+        ('DistributedGreedyBFS', DistributedGreedyBFS),
+        ('InformationGainPlanner', InformationGainPlanner),
+    ]
+)
+def test_create(name, expected):
+    finding_algorithm = AlgorithmRegistry.create(Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')), name)
+    assert type(finding_algorithm) is expected and finding_algorithm.name == expected.__name__
+
+
+def test_create_unknown():
+    with pytest.raises(ValueError, match='Unknown finding algorithm'):
+        AlgorithmRegistry.create(Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')), 'Unknown')
+
+
+def test_register():
+    class Renamed(DistributedGreedyBFS):
+        pass
+
+    AlgorithmRegistry.register('Renamed', Renamed)
+    try:
+        assert 'Renamed' in AlgorithmRegistry.names()
+        assert isinstance(AlgorithmRegistry.create(Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')), 'Renamed'), Renamed)
+    finally:
+        del AlgorithmRegistry.algorithms['Renamed']
+
+
+@pytest.mark.parametrize('algorithm', AlgorithmRegistry.names())
+def test_bot_algorithm(algorithm):
+    environment = Environment(Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')), None, None)
+    bot = Bot(environment, algorithm=algorithm)
+
+    candidates, _ = bot.find_itself(headless=True)
+    assert isinstance(bot.finding_algorithm, FindingAlgorithm) and bot.finding_algorithm.name == algorithm
+    assert any(environment.check_position(candidate) for candidate in candidates)
@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.src.finding_algorithm.candidates import Candidates
+from app.src.renderer import MapRenderer
+from app.src.utils import Utils
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wall_masks_loop(environment_map):
+    masks = np.zeros(environment_map.shape, dtype=int)
+    for row in range(environment_map.shape[0]):
+        for col in range(environment_map.shape[1]):
+            if row > 0 and environment_map[row - 1, col] == 0:
+                masks[row, col] += 1
+            if row < environment_map.shape[0] - 1 and environment_map[row + 1, col] == 0:
+                masks[row, col] += 2
+            if col > 0 and environment_map[row, col - 1] == 0:
+                masks[row, col] += 4
+            if col < environment_map.shape[1] - 1 and environment_map[row, col + 1] == 0:
+                masks[row, col] += 8
+    return masks
+
+
+@pytest.mark.parametrize('file_name', ['maps/zum/0.txt', 'maps/zum/4.txt', 'maps/zum/26.txt'])
+def test_wall_masks(file_name):
+    environment_map = Utils.load(os.path.join(root_dir, file_name))
+    walls = environment_map == 0
+
+    assert np.array_equal(MapRenderer.wall_masks(walls)[walls], wall_masks_loop(environment_map)[walls])
+
+
+@pytest.mark.parametrize(
+    'possible_current_poss, expected',
+    [
+        ([], []),
+        ([((1, 1), 0), ((1, 1), 3), ((2, 3), 1)], [(1, 1), (2, 3)]),
+        ([((-1, 1), 0), ((1, 100), 3), ((3, 3), 2)], [(3, 3)]),
+        (Candidates([[1, 2, 0], [3, 4, 1]]), [(1, 2), (3, 4)]),
+    ]
+)
+def test_highlight_mask(possible_current_poss, expected):
+    renderer = MapRenderer(Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')))
+
+    mask = renderer.highlight_mask(possible_current_poss)
+    assert sorted(map(tuple, np.argwhere(mask).tolist())) == expected
+
+
+def test_render_redraw():
+    renderer = MapRenderer(Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')))
+
+    first = renderer.render(np.array([1, 1]), np.array([1, 0]), [((1, 2), 0)], True)
+    assert first.startswith(MapRenderer.cursor_home + MapRenderer.clear_screen)
+
+    second = renderer.render(np.array([2, 1]), np.array([1, 0]), [((1, 2), 0)], True)
+    changes = second[:second.index('Legend:')]
+    assert changes.count('\033[2;2H') == 1 and changes.count('\033[3;2H') == 1 and changes.count('H\033[') == 3
+
+    full = renderer.render(np.array([2, 1]), np.array([1, 0]), [((1, 2), 0)])
+    assert renderer.previous is None and 'H' not in full and full.count('\n') == 5 + 3
+
+
+@pytest.mark.parametrize('bot_pos', [np.array([1, 1]), np.array([19, 21]), np.array([37, 31])])
+@pytest.mark.parametrize('viewport', [(5, 7), (10, 100), (200, 200)])
+def test_viewport(bot_pos, viewport):
+    environment_map = Utils.load(os.path.join(root_dir, 'maps/zum/26.txt'))
+    possible_current_poss = [(pos, 0) for pos in np.argwhere(environment_map > 0)[::7]]
+    full = MapRenderer(environment_map).frame_tiles(bot_pos, np.array([0, 1]), possible_current_poss)
+
+    renderer = MapRenderer(environment_map, viewport)
+    tiles = renderer.frame_tiles(bot_pos, np.array([0, 1]), possible_current_poss)
+    top_left = renderer.window(bot_pos)
+
+    assert tiles.shape == tuple(np.minimum(viewport, environment_map.shape))
+    assert np.array_equal(tiles, full[top_left[0]:top_left[0] + tiles.shape[0], top_left[1]:top_left[1] + tiles.shape[1]])
+    assert np.any(tiles == full[bot_pos[0], bot_pos[1]])
+
+
+@pytest.mark.parametrize(
+    'walls, size, expected_scale, expected',
+    [
+        (np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]], dtype=bool), 3, 1, np.array([[4, 4, 4], [4, 0, 4], [4, 4, 4]])),
+        (np.array([[1, 1, 1, 1], [1, 0, 0, 1], [1, 0, 0, 1], [1, 1, 1, 1]], dtype=bool), 2, 2,
+         np.array([[3, 3], [3, 3]])),
+        (np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]], dtype=bool), 2, 2, np.array([[3, 4], [4, 4]])),
+    ]
+)
+def test_downsample(walls, size, expected_scale, expected):
+    scale, minimap = MapRenderer.downsample(walls, size)
+    assert scale == expected_scale and np.array_equal(minimap, expected)
+
+
+def test_minimap():
+    renderer = MapRenderer(Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')), (5, 5), 10)
+    frame = renderer.render(np.array([19, 21]), np.array([1, 0]), [((1, 1), 0)])
+
+    lines = frame.split('\n')
+    assert renderer.minimap_scale == 4 and renderer.minimap.shape == (10, 9)
+    assert lines[5] == '' and MapRenderer.colored('↓', 'black') in lines[6 + 19 // 4]
+    assert lines[6].startswith(MapRenderer.colored(MapRenderer.shades[renderer.minimap[0, 0]], bg_color='yellow'))
+    assert 'Viewport: rows 17-21, columns 19-23 of 39x33' in frame
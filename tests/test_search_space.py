@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.search_space import SearchSpace
+
+
+# free tiles of the grid are passable, (row, column) delta is relative to grid position (1, 1)
+grid = np.array([[0, 0, 0, 0, 0, 0],
+                 [0, 1, 1, 1, 1, 0],
+                 [0, 1, 0, 0, 1, 0],
+                 [0, 1, 1, 0, 1, 0],
+                 [0, 0, 0, 0, 0, 0]])
+
+
+def is_passable(row, col):
+    return 0 <= row + 1 < grid.shape[0] and 0 <= col + 1 < grid.shape[1] and grid[row + 1, col + 1] == 1
+
+
+@pytest.mark.parametrize(
+    'target, expected_cost, expected_commands',
+    [
+        ((0, 0), 0, []),
+        ((1, 0), 1, ['move']),
+        ((2, 1), 4, ['move', 'move', 'left', 'move']),
+        ((0, 3), 4, ['left', 'move', 'move', 'move']),
+        ((2, 3), 7, ['left', 'move', 'move', 'move', 'right', 'move', 'move']),
+    ]
+)
+def test_expand(target, expected_cost, expected_commands):
+    search_space = SearchSpace(8, is_passable, True)
+
+    for cost, row, col, direction in search_space.expand():
+        if (row, col) == target:
+            assert cost == expected_cost
+            assert FindingAlgorithm.get_path_commands_from_moves(search_space.moves(row, col, direction)) == expected_commands
+            break
+    else:
+        pytest.fail('target not reached')
+
+
+def test_expand_yields_every_tile_once():
+    search_space = SearchSpace(8, is_passable, True)
+    tiles = [(row, col) for _, row, col, _ in search_space.expand()]
+
+    assert sorted(tiles) == sorted((row - 1, col - 1) for row, col in np.argwhere(grid == 1))
+    assert not search_space.overflow
+
+
+def test_expand_overflow():
+    search_space = SearchSpace(2, is_passable)
+    list(search_space.expand())
+
+    assert search_space.overflow
+
+
+@pytest.mark.parametrize('state', [(0, 0, 0), (-3, 2, 1), (3, -3, 3)])
+def test_encode_decode(state):
+    search_space = SearchSpace(3, is_passable)
+    assert search_space.decode(search_space.encode(*state)) == state
+
+
+@pytest.mark.parametrize('direction', range(4))
+def test_moves_table(direction):
+    search_space = SearchSpace(3, is_passable)
+    state = search_space.encode(0, 0, direction)
+
+    for neighbour_dir, (row, col, state_offset, cost) in enumerate(search_space.moves_table[direction]):
+        assert search_space.decode(state + state_offset) == (row, col, neighbour_dir)
+        assert cost == 1 + SearchSpace.turn_costs[(neighbour_dir - direction) % 4]
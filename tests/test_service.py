@@ -0,0 +1,246 @@
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+
+from app.src.bot import Bot
+from app.src.direction_codec import DirectionCodec
+from app.src.environment import Environment
+from app.src.finding_algorithm.distributed_greedy_bfs import DistributedGreedyBFS
+from app.src.service import LocalizationService, LocalizationSession, RemoteEnvironment
+from app.src.utils import Utils
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def view(environment, sight_range):
+    """Square around the bot rotated so that the bot looks down, as a remote bot would send it"""
+    padded = np.pad(environment.map.astype(int), sight_range, constant_values=-1)
+    window = padded[environment.bot_pos[0]:environment.bot_pos[0] + 2 * sight_range + 1,
+                    environment.bot_pos[1]:environment.bot_pos[1] + 2 * sight_range + 1]
+    window = np.rot90(window, k=-DirectionCodec.to_number(environment.bot_dir))
+    return [''.join('?X '[value + 1] for value in row) for row in window]
+
+
+def act(environment, action):
+    if action == 'move':
+        environment.move()
+    else:
+        environment.rotate(action)
+
+
+@pytest.mark.parametrize(
+    'file_name, bot_pos, bot_dir, sight_range',
+    [
+        ('maps/zum/26.txt', np.array([1, 1]), np.array([1, 0]), 1),
+        ('maps/zum/72.txt', np.array([13, 27]), np.array([-1, 0]), 1),
+        ('maps/zum/72.txt', np.array([1, 1]), np.array([0, 1]), 2),
+        ('maps/zum/42.txt', np.array([1, 1]), np.array([0, 1]), 1),
+    ]
+)
+def test_session_matches_bot(file_name, bot_pos, bot_dir, sight_range):
+    environment_map = Utils.load(os.path.join(root_dir, file_name))
+    finding_algorithm = DistributedGreedyBFS(environment_map)
+    expected_poss, expected_steps = Bot(Environment(environment_map, bot_pos, bot_dir), sight_range,
+                                        finding_algorithm).find_itself(headless=True)
+
+    session = LocalizationSession(environment_map, finding_algorithm.fork(), sight_range)
+    environment = Environment(environment_map, bot_pos, bot_dir)
+    while (action := session.step(view(environment, sight_range))) is not None:
+        act(environment, action)
+
+    result = session.result()
+    assert result['steps'] == expected_steps
+    assert result['found'] == finding_algorithm.is_bot_found
+    assert sorted(map(tuple, result['starting_positions'])) == sorted(map(tuple, expected_poss.array.tolist()))
+
+
+def test_parse_view():
+    assert RemoteEnvironment.parse_view(['X?X', '   ', 'XXX'], 1).tolist() == [[0, -1, 0], [1, 1, 1], [0, 0, 0]]
+
+    with pytest.raises(ValueError, match='3 rows'):
+        RemoteEnvironment.parse_view(['X X', '   '], 1)
+    with pytest.raises(ValueError, match='only'):
+        RemoteEnvironment.parse_view(['XoX', '   ', 'XXX'], 1)
+
+
+async def run_clients(socket_path, file_name, poses):
+    """Every client opens its own connection and session and they all step at the same time"""
+    async def client(bot_pos, bot_dir):
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+
+        async def call(request):
+            writer.write((json.dumps(request) + '\n').encode())
+            return json.loads(await reader.readline())
+
+        session = (await call({'id': 1, 'op': 'open', 'map': file_name}))['session']
+        environment = Environment(Utils.load(file_name), bot_pos, bot_dir)
+        while True:
+            response = await call({'id': 2, 'op': 'step', 'session': session, 'view': view(environment, 1)})
+            if response['action'] is None:
+                break
+            act(environment, response['action'])
+
+        errors = [await call({'id': 3, 'op': 'step', 'session': '0', 'view': []}),
+                  await call({'id': 4, 'op': 'step', 'session': session, 'view': ['XX']}),
+                  await call({'id': 5, 'op': 'jump'})]
+        assert (await call({'id': 6, 'op': 'close', 'session': session}))['closed']
+        writer.close()
+        return response, errors
+
+    return await asyncio.gather(*(client(bot_pos, bot_dir) for bot_pos, bot_dir in poses))
+
+
+def test_service_shares_maps(tmp_path):
+    file_name = os.path.join(root_dir, 'maps/zum/72.txt')
+    poses = [(np.array([13, 27]), np.array([-1, 0])), (np.array([1, 1]), np.array([0, 1])),
+             (np.array([45, 53]), np.array([0, -1])), (np.array([13, 27]), np.array([1, 0]))]
+    service = LocalizationService(2)
+
+    async def main():
+        server = await asyncio.start_unix_server(service.handle_connection, str(tmp_path / 'service.sock'))
+        async with server:
+            return await run_clients(str(tmp_path / 'service.sock'), file_name, poses)
+
+    results = asyncio.run(main())
+
+    environment_map = Utils.load(file_name)
+    for (bot_pos, bot_dir), (response, errors) in zip(poses, results):
+        expected_poss, expected_steps = Bot(Environment(environment_map, bot_pos, bot_dir)).find_itself(headless=True)
+        assert response['steps'] == expected_steps
+        assert sorted(map(tuple, response['starting_positions'])) == sorted(map(tuple, expected_poss.array.tolist()))
+        assert [error['id'] for error in errors] == [3, 4, 5]
+        assert [error['error'] for error in errors] == ['Unknown session 0', 'View must have 3 rows of 3 characters',
+                                                        'Unknown operation jump']
+
+    assert len(service.algorithms) == 1 and len(service.sessions) == 0
+
+
+def test_sessions_share_structures():
+    service = LocalizationService(1)
+
+    async def main():
+        request = {'op': 'open', 'map': os.path.join(root_dir, 'maps/zum/26.txt')}
+        return [(await service.handle_request(request))['session'] for _ in range(2)]
+
+    algorithms = [service.sessions[session][0].bot.finding_algorithm for session in asyncio.run(main())]
+    assert algorithms[0] is not algorithms[1]
+    assert algorithms[0].placement_index is algorithms[1].placement_index
+    assert algorithms[0].placement_index.packed is algorithms[1].placement_index.packed
+    assert algorithms[0].placement_index.levels is algorithms[1].placement_index.levels
+    assert algorithms[0].ambiguity_index is algorithms[1].ambiguity_index is not None
+
+
+@pytest.mark.parametrize('sight_range', [-1, 'two', 1.5, True, None])
+def test_open_rejects_sight_range(sight_range):
+    service = LocalizationService(1)
+    request = {'op': 'open', 'map': os.path.join(root_dir, 'maps/zum/26.txt'), 'sight_range': sight_range}
+
+    with pytest.raises(ValueError, match='Sight range must be non-negative integer'):
+        asyncio.run(service.handle_request(request))
+    assert len(service.sessions) == 0
+
+
+def test_service_missing_map():
+    service = LocalizationService(1)
+
+    with pytest.raises(OSError):
+        asyncio.run(service.handle_request({'op': 'open', 'map': os.path.join(root_dir, 'maps/missing.txt')}))
+    assert len(service.algorithms) == 0
+
+
+class BufferStream:
+    """Reader of given request lines and writer collecting response lines"""
+
+    def __init__(self, requests):
+        self.lines = [(json.dumps(request) + '\n').encode() for request in requests]
+        self.responses = []
+        self.closed = False
+
+    async def readline(self):
+        return self.lines.pop(0) if self.lines else b''
+
+    def write(self, data):
+        self.responses.append(json.loads(data))
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_pipelined_requests():
+    file_name = os.path.join(root_dir, 'maps/zum/72.txt')
+    environment = Environment(Utils.load(file_name), np.array([13, 27]), np.array([-1, 0]))
+    service = LocalizationService(2)
+    # nothing waits for responses, requests of a session are still handled in order
+    stream = BufferStream([{'id': 1, 'op': 'open', 'map': file_name},
+                           {'id': 2, 'op': 'step', 'session': '1', 'view': view(environment, 1)},
+                           {'id': 3, 'op': 'open', 'map': file_name},
+                           {'id': 4, 'op': 'step', 'session': '2', 'view': view(environment, 1)},
+                           {'id': 5, 'op': 'close', 'session': '1'},
+                           {'id': 6, 'op': 'step', 'session': '1', 'view': view(environment, 1)}])
+
+    asyncio.run(service.handle_connection(stream, stream))
+
+    responses = {response['id']: response for response in stream.responses}
+    assert responses[1] == {'id': 1, 'session': '1'} and responses[3] == {'id': 3, 'session': '2'}
+    assert 'error' not in responses[2] and responses[2]['action'] == responses[4]['action']
+    assert responses[5] == {'id': 5, 'closed': True}
+    assert responses[6] == {'id': 6, 'error': 'Unknown session 1'}
+    assert list(service.sessions) == ['2']
+
+
+def test_unexpected_error_is_response(monkeypatch):
+    def fail(_session, _view):
+        raise IndexError('index 5 is out of bounds')
+
+    monkeypatch.setattr(LocalizationSession, 'step', fail)
+    service = LocalizationService(1)
+    stream = BufferStream([{'id': 2, 'op': 'step', 'session': '1', 'view': ['XXX', 'X  ', 'X X']},
+                           {'id': 3, 'op': 'close', 'session': '1'}])
+
+    async def main():
+        await service.handle_request({'op': 'open', 'map': os.path.join(root_dir, 'maps/zum/26.txt')})
+        await service.handle_connection(stream, stream)
+
+    asyncio.run(main())
+
+    assert stream.closed
+    assert sorted(stream.responses, key=lambda response: response['id']) == [
+        {'id': 2, 'error': 'index 5 is out of bounds'}, {'id': 3, 'closed': True}]
+
+
+def test_event_loop_responsive_while_planning(tmp_path):
+    """Planning runs in worker threads, so the event loop keeps running while many bots plan at once"""
+    file_name = os.path.join(root_dir, 'maps/zum/02_71_51_1552235384.txt')
+    free = np.argwhere(Utils.load(file_name) > 0)
+    rng = np.random.default_rng(0)
+    poses = [(free[rng.integers(len(free))], Utils.number_to_dir(rng.integers(0, 4))) for _ in range(6)]
+    service = LocalizationService(4)
+
+    async def main():
+        gaps, done = [], asyncio.Event()
+
+        async def ticker():
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.001)
+                gaps.append(time.perf_counter() - last)
+                last = time.perf_counter()
+
+        server = await asyncio.start_unix_server(service.handle_connection, str(tmp_path / 'service.sock'))
+        async with server:
+            ticks = asyncio.ensure_future(ticker())
+            await run_clients(str(tmp_path / 'service.sock'), file_name, poses)
+            done.set()
+            await ticks
+        return gaps
+
+    gaps = asyncio.run(main())
+    assert len(gaps) > 10 and max(gaps) < 0.5
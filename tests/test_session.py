@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.src.bot import Bot
+from app.src.environment import Environment
+from app.src.session import SessionRecord, SessionRecorder, SessionReplay
+from app.src.utils import Utils
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def record_session(environment_map, bot_pos, bot_dir, sight_range=1, algorithm=None):
+    bot = Bot(Environment(environment_map, bot_pos, bot_dir), sight_range, algorithm=algorithm)
+    recorder = SessionRecorder()
+    possible_starting_poss, steps = bot.find_itself(headless=True, observers=[recorder])
+    return recorder.record, possible_starting_poss, steps
+
+
+@pytest.mark.parametrize(
+    'file_name, bot_pos, bot_dir, sight_range, algorithm',
+    [
+        ('maps/zum/26.txt', np.array([1, 1]), np.array([1, 0]), 1, None),
+        ('maps/zum/72.txt', np.array([13, 27]), np.array([-1, 0]), 1, None),
+        ('maps/zum/72.txt', np.array([13, 27]), np.array([-1, 0]), 2, None),
+        ('maps/zum/72.txt', np.array([13, 27]), np.array([-1, 0]), 1, 'InformationGainPlanner'),
+    ]
+)
+def test_record_and_replay(tmp_path, file_name, bot_pos, bot_dir, sight_range, algorithm):
+    environment_map = Utils.load(os.path.join(root_dir, file_name))
+    record, possible_starting_poss, steps = record_session(environment_map, bot_pos, bot_dir, sight_range, algorithm)
+
+    assert len(record.actions) == steps and len(record.observations) == steps + 1
+    assert all(len(row) == 2 * sight_range + 1 for observation in record.observations for row in observation)
+
+    record.save(str(tmp_path / 'session.json'))
+    loaded = SessionRecord.load(str(tmp_path / 'session.json'))
+    assert loaded == record
+
+    replayed, replayed_steps = SessionReplay.replay(loaded, environment_map)
+    assert replayed_steps == steps
+    assert SessionReplay.matches(loaded, replayed)
+    assert SessionReplay.matches(loaded, possible_starting_poss)
+
+
+def test_replay_detects_differences():
+    environment_map = Utils.load(os.path.join(root_dir, 'maps/zum/72.txt'))
+    record, _, _ = record_session(environment_map, np.array([13, 27]), np.array([-1, 0]))
+
+    with pytest.raises(ValueError, match='Environment map differs'):
+        SessionReplay.replay(record, Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')))
+
+    record.observations[-1] = ['???'] * 3
+    with pytest.raises(ValueError, match='Observation after step'):
+        SessionReplay.replay(record, environment_map)
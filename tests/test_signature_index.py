@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.src.finding_algorithm.base import FindingAlgorithm
+from app.src.finding_algorithm.signature_index import SignatureIndex
+from app.src.utils import Utils
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize(
+    'environment_map',
+    [
+        Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')),
+        Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')),
+    ]
+)
+def test_signatures_match_visible_environment(environment_map):
+    signature_index = SignatureIndex(environment_map)
+
+    for row, col in np.argwhere(environment_map > 0):
+        for d in range(4):
+            view = FindingAlgorithm.get_visible_environment(environment_map, np.array([row, col]), d, 1)
+            assert signature_index.get(np.array([row, col]), d) == SignatureIndex.encode(view)
+
+
+@pytest.mark.parametrize(
+    'environment_map, pos, d',
+    [
+        (Utils.load(os.path.join(root_dir, 'maps/zum/4.txt')), np.array([1, 1]), 0),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/26.txt')), np.array([1, 1]), 1),
+        (Utils.load(os.path.join(root_dir, 'maps/zum/72.txt')), np.array([5, 9]), 3),
+    ]
+)
+def test_lookup_matches_placements(environment_map, pos, d):
+    view = np.rot90(environment_map[pos[0] - 1:pos[0] + 2, pos[1] - 1:pos[1] + 2], k=-d)
+    entries = SignatureIndex(environment_map).lookup(SignatureIndex.encode(view))
+
+    expected = [[row + 1, col + 1, rotation] for rotation in range(4) for row, col in
+                FindingAlgorithm.find_matrix_placements(environment_map, np.rot90(view, k=rotation))]
+    assert entries.tolist() == expected
+    assert [pos[0], pos[1], d] in expected
+
+
+def test_lookup_unknown_signature():
+    assert len(SignatureIndex(Utils.load(os.path.join(root_dir, 'maps/zum/0.txt'))).lookup(0)) == 0
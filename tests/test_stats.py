@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+from app.src.stats import SearchStats
+
+
+@pytest.mark.parametrize(
+    'counts, expected',
+    [
+        ([], {}),
+        ([('nodes', 1)], {'nodes': 1}),
+        ([('nodes', 1), ('nodes', 3), ('placements', 10)], {'nodes': 4, 'placements': 10}),
+    ]
+)
+def test_count(counts, expected):
+    stats = SearchStats()
+    for name, value in counts:
+        stats.count(name, value)
+
+    assert stats.counters == expected
+
+
+def test_timer():
+    stats = SearchStats()
+    for _ in range(2):
+        with stats.timer('planning'):
+            time.sleep(0.01)
+
+    with pytest.raises(ValueError):
+        with stats.timer('sensing'):
+            raise ValueError()
+
+    assert stats.times['planning'] >= 0.02
+    assert 'sensing' in stats.times
+
+
+def test_reset_and_report():
+    stats = SearchStats()
+    stats.count('nodes')
+    with stats.timer('planning'):
+        pass
+    stats.candidates.append(5)
+
+    assert stats.to_dict() == {'counters': {'nodes': 1}, 'times': {'planning': stats.times['planning']},
+                               'candidates': [5]}
+    assert 'nodes: 1' in stats.report() and 'planning time' in stats.report() and '[5]' in stats.report()
+
+    stats.reset()
+    assert stats.to_dict() == {'counters': {}, 'times': {}, 'candidates': []}
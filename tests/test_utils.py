@@ -174,3 +174,29 @@ def test_print_colored(capfd, string, fg_color, bg_color, end, expected, excepti
 def test_color_name_to_num(color, expected, exception):
     with exception:
         assert Utils.color_name_to_num(color) == expected
+
+
+@pytest.mark.parametrize(
+    'content, expected, exception',
+    [
+        (b'XXX\nX X\nXXX\n', np.array([[0, 0, 0], [0, 1, 0], [0, 0, 0]]), does_not_raise()),
+        (b'XXX\r\nX X\r\nXXX\r\n', np.array([[0, 0, 0], [0, 1, 0], [0, 0, 0]]), does_not_raise()),
+        (b'XXX\nX X\nXXX', np.array([[0, 0, 0], [0, 1, 0], [0, 0, 0]]), does_not_raise()),
+        (b'XXX\r\nX X\r\nXXX', np.array([[0, 0, 0], [0, 1, 0], [0, 0, 0]]), does_not_raise()),
+
+        (b'', None, pytest.raises(ValueError, match='empty')),
+        (b'\n', None, pytest.raises(ValueError, match='empty')),
+        (b'XXX\nX X\nXX\n', None, pytest.raises(ValueError, match='line 3 has 2 characters')),
+        (b'XXX\nX X\nXXX\n\n', None, pytest.raises(ValueError, match='line 4 has 0 characters')),
+        (b'XXX\nXoX\nXXX\n', None, pytest.raises(ValueError, match="invalid character b'o' on line 2, column 2")),
+        (b'XXX\nX X\rXXX\n', None, pytest.raises(ValueError, match='carriage return')),
+        (b'XXX\nX  \nXXX\n', None, pytest.raises(ValueError, match='line 2, column 3 is free')),
+    ]
+)
+def test_load_format(tmp_path, content, expected, exception):
+    file_name = tmp_path / 'map.txt'
+    file_name.write_bytes(content)
+
+    with exception:
+        environment_map = Utils.load(str(file_name))
+        assert environment_map.dtype == np.uint8 and np.array_equal(environment_map, expected)